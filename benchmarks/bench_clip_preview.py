@@ -0,0 +1,169 @@
+# coding=utf-8
+"""
+Benchmark the clip preview count, "clip_fit.count_clipped", against a budget.
+
+The scene is synthetic: boxes scattered over a 10 km square, and cameras
+at eye height looking across it, so about half of the boxes are in front
+of each camera and many clusters straddle a frustum or clip plane. That
+is a worse case than most production sets, where geometry is clumped.
+
+Each sample clusters the boxes and counts the clipped boxes of every
+camera, as "preview_clip_values" does. The counts of a few cameras are
+checked against "clip_fit.clip_masks", which evaluates every box. The run
+exits with 1 when a count is wrong or the median exceeds "--budget-ms".
+
+Needs "numpy", not Maya. Example:
+
+    python benchmarks/bench_clip_preview.py --cameras 500 --boxes 200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(HERE)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import clip_fit  # noqa: E402
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+# Largest median time of a preview of "--cameras" x "--boxes"
+DEFAULT_BUDGET_MS = 750.0
+
+# Cameras checked against the per-box evaluation
+CHECKED_CAMERAS = 10
+
+
+def look_at_inverse(np, position, target):
+    """
+    Return the world inverse matrix of a camera at "position" looking at "target".
+    """
+    forward = target - position
+    forward /= np.linalg.norm(forward)
+    z_axis = -forward
+    x_axis = np.cross([0.0, 1.0, 0.0], z_axis)
+    x_axis /= np.linalg.norm(x_axis)
+    y_axis = np.cross(z_axis, x_axis)
+
+    matrix = np.eye(4)
+    matrix[0, :3] = x_axis
+    matrix[1, :3] = y_axis
+    matrix[2, :3] = z_axis
+    matrix[3, :3] = position
+    return np.linalg.inv(matrix)
+
+
+def build_scene(camera_count, box_count, seed=1):
+    """
+    :return: Dict of the "count_clipped" arguments.
+    """
+    np = clip_fit.require_numpy()
+    rng = np.random.RandomState(seed)
+
+    centers = rng.uniform(-5000.0, 5000.0, (box_count, 3))
+    centers[:, 1] = rng.uniform(0.0, 200.0, box_count)
+    half_sizes = rng.uniform(0.5, 20.0, (box_count, 3))
+
+    ends = rng.uniform(-5000.0, 5000.0, (camera_count, 4))
+    world_inverse = np.array([
+        look_at_inverse(np, np.array([x, 50.0, z]), np.array([target_x, 20.0, target_z]))
+        for x, z, target_x, target_z in ends
+    ])
+
+    # 54 degrees horizontal field of view, 3:2
+    half_width = np.full(camera_count, np.tan(np.radians(27.0)))
+    return {
+        "world_inverse": world_inverse,
+        "orthographic": np.zeros(camera_count, dtype=bool),
+        "half_width": half_width,
+        "half_height": half_width / 1.5,
+        "bounds_min": centers - half_sizes,
+        "bounds_max": centers + half_sizes,
+        "near": rng.uniform(0.1, 50.0, camera_count),
+        "far": rng.uniform(500.0, 8000.0, camera_count),
+    }
+
+
+def preview(scene):
+    """
+    Cluster the boxes and count the clipped boxes, as a preview does.
+    """
+    boxes = clip_fit.BoxClusters(scene["bounds_min"], scene["bounds_max"])
+    return clip_fit.count_clipped(
+        scene["world_inverse"], scene["orthographic"], scene["half_width"], scene["half_height"],
+        boxes, None, scene["near"], scene["far"])
+
+
+def check_counts(scene, clipped, partial):
+    """
+    :return: If the counts of the first cameras match a per-box evaluation.
+    """
+    rows = slice(0, CHECKED_CAMERAS)
+    clipped_mask, partial_mask = clip_fit.clip_masks(
+        scene["world_inverse"][rows], scene["orthographic"][rows], scene["half_width"][rows],
+        scene["half_height"][rows], scene["bounds_min"], scene["bounds_max"],
+        scene["near"][rows], scene["far"][rows])
+    return (clipped_mask.sum(axis=1) == clipped[rows]).all() and (partial_mask.sum(axis=1) == partial[rows]).all()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cameras", type=int, default=500)
+    parser.add_argument("--boxes", type=int, default=200000)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args(argv)
+
+    try:
+        scene = build_scene(args.cameras, args.boxes)
+    except ImportError as err:
+        print(err)
+        return 1
+
+    timings = []
+    for _ in range(args.samples):
+        start = timer()
+        clipped, partial = preview(scene)
+        timings.append(timer() - start)
+    timings.sort()
+
+    result = {
+        "cameras": args.cameras,
+        "boxes": args.boxes,
+        "samples": args.samples,
+        "min_ms": timings[0] * 1000.0,
+        "median_ms": timings[len(timings) // 2] * 1000.0,
+        "max_ms": timings[-1] * 1000.0,
+        "clipped": int(clipped.sum()),
+        "partial": int(partial.sum()),
+        "counts_match": bool(check_counts(scene, clipped, partial)),
+    }
+    print("%(cameras)d cameras x %(boxes)d boxes  min %(min_ms)8.2f ms  median %(median_ms)8.2f ms  "
+          "max %(max_ms)8.2f ms" % result)
+    print("clipped %(clipped)d  partial %(partial)d  counts match: %(counts_match)s" % result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failed = False
+    if not result["counts_match"]:
+        print("FAIL: counts differ from the per-box evaluation")
+        failed = True
+    if result["median_ms"] > args.budget_ms:
+        print("FAIL: median over the %.0f ms budget" % args.budget_ms)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
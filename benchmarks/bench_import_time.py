@@ -0,0 +1,180 @@
+# coding=utf-8
+"""
+Benchmark the first-import cost of the tool's camera backend.
+
+Every sample imports the module in a fresh interpreter, so the timing is a
+cold import, the same as the first launch of the tool in a Maya session.
+
+The modules of "HEADLESS_MODULES" must not pull in any Qt or Maya UI module,
+and must import within a median of "--budget-ms". The run exits with 1 when
+either check fails, or when a module given to time is not importable.
+
+By default the stand-in "maya" package from "benchmarks/stubs" is used, so
+this runs without Maya. Pass "--no-stub" to run it with "mayapy" against a
+real Maya install. There, "pymel.core" is timed as well for comparison.
+
+Example:
+
+    python benchmarks/bench_import_time.py --samples 20
+    python benchmarks/bench_import_time.py --budget-ms 100
+    mayapy benchmarks/bench_import_time.py --no-stub
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(HERE)
+STUBS_DIR = os.path.join(HERE, "stubs")
+
+DEFAULT_MODULES = ["maya_cameras", "reset_camera_clip_planes_core"]
+
+# Modules usable without a UI, checked against the budget and for UI modules
+HEADLESS_MODULES = ("maya_cameras", "reset_camera_clip_planes_core")
+
+# Largest median cold import time of a headless module. NumPy alone takes
+# longer, so it must stay imported on first use.
+DEFAULT_BUDGET_MS = 150.0
+
+# Prefixes of the modules a headless import must not load
+UI_MODULE_PREFIXES = ("PySide2", "shiboken2", "maya.OpenMayaUI", "maya.app.general.mayaMixin")
+
+# Executed in the child interpreter. Prints the import time in seconds, and
+# which pymel and UI modules got pulled in as a side effect.
+_CHILD_SCRIPT = """
+import json, sys, time
+start = time.time()
+__import__(%(module)r)
+elapsed = time.time() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "pymel_loaded": any(m.startswith("pymel") for m in sys.modules),
+    "ui_modules": sorted(m for m in sys.modules if m.startswith(%(ui_prefixes)r)),
+}))
+"""
+
+
+def _child_env(use_stub):
+    env = dict(os.environ)
+    paths = [REPO_ROOT]
+    if use_stub:
+        paths.insert(0, STUBS_DIR)
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    return env
+
+
+def time_import(module, samples, use_stub):
+    """
+    Import "module" in "samples" fresh interpreters.
+
+    :param module: Dotted name of the module to import.
+    :param samples: Number of fresh interpreters to time.
+    :param use_stub: Put the stand-in "maya" package first on the path.
+
+    :return: Dict of the timing summary, or None if the module is not importable.
+
+    """
+    env = _child_env(use_stub)
+    script = _CHILD_SCRIPT % {"module": module, "ui_prefixes": UI_MODULE_PREFIXES}
+    timings = []
+    pymel_loaded = False
+    ui_modules = set()
+    for _ in range(samples):
+        proc = subprocess.Popen(
+            [sys.executable, "-c", script],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env,
+        )
+        out, _err = proc.communicate()
+        if proc.returncode:
+            return None
+        result = json.loads(out.decode("utf-8").strip().splitlines()[-1])
+        timings.append(result["seconds"])
+        pymel_loaded = pymel_loaded or result["pymel_loaded"]
+        ui_modules.update(result["ui_modules"])
+
+    timings.sort()
+    return {
+        "module": module,
+        "samples": samples,
+        "min_ms": timings[0] * 1000.0,
+        "median_ms": timings[len(timings) // 2] * 1000.0,
+        "max_ms": timings[-1] * 1000.0,
+        "pymel_loaded": pymel_loaded,
+        "ui_modules": sorted(ui_modules),
+    }
+
+
+def check_headless(result, budget_ms=None):
+    """
+    Return the reasons a headless module fails its import checks.
+
+    :param result: Timing summary, as returned by "time_import".
+    :param budget_ms: Largest median import time allowed, 0 or None for no limit.
+
+    :return: Messages, empty if the module passes.
+
+    """
+    failures = []
+    if result["ui_modules"]:
+        failures.append("%s imports UI modules: %s" % (result["module"], ", ".join(result["ui_modules"])))
+    if budget_ms and result["median_ms"] > budget_ms:
+        failures.append("%s median import %.2f ms exceeds the %.2f ms budget" % (
+            result["module"], result["median_ms"], budget_ms))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--no-stub", action="store_true",
+                        help="Import against the real Maya install.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Fail when a headless module's median import time exceeds this. "
+                             "0 to not check it.")
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args(argv)
+
+    modules = list(args.modules)
+    # Timed for comparison only, it may not be installed
+    optional = set()
+    if args.no_stub and "pymel.core" not in modules:
+        modules.append("pymel.core")
+        optional.add("pymel.core")
+
+    results = []
+    failures = []
+    for module in modules:
+        result = time_import(module, args.samples, use_stub=not args.no_stub)
+        if result is None:
+            if module in optional:
+                print("%-30s not importable, skipped" % module)
+            else:
+                print("%-30s not importable" % module)
+                failures.append("%s is not importable" % module)
+            continue
+        results.append(result)
+        print("%(module)-30s min %(min_ms)8.2f ms  median %(median_ms)8.2f ms  "
+              "max %(max_ms)8.2f ms  pymel loaded: %(pymel_loaded)s" % result)
+
+        if module in HEADLESS_MODULES:
+            failures.extend(check_headless(result, args.budget_ms))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    for failure in failures:
+        print("FAIL: " + failure)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# coding=utf-8
+"""
+Benchmark how camera resolution from the selection grows with selection size.
+
+Compares the per-node "resolve_cameras" with "resolve_cameras_bulk", using
+the stand-in "maya" package from "benchmarks/stubs". Reports wall time and
+the number of Maya commands each one issues. The stand-in commands are much
+cheaper than Maya's, so the command count is the figure to compare.
+
+Example:
+
+    python benchmarks/bench_resolve_cameras.py --sizes 10 100 1000 10000
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, "stubs"), os.path.dirname(HERE)]
+
+from maya import _stub  # noqa: E402
+import maya_cameras  # noqa: E402
+
+
+RESOLVERS = [
+    ("resolve_cameras", lambda sel: list(maya_cameras.resolve_cameras(sel))),
+    ("resolve_cameras_bulk", maya_cameras.resolve_cameras_bulk),
+]
+
+
+def bench_size(size, repeat):
+    """
+    Time each resolver on a selection of "size" camera transforms.
+
+    :return: List of result dicts, one per resolver.
+    """
+    selection = _stub.build_camera_scene(size)
+
+    results = []
+    for name, resolver in RESOLVERS:
+        _stub.scene.calls.clear()
+        cameras = resolver(selection)
+        calls = sum(_stub.scene.calls.values())
+        assert len(cameras) == size
+
+        seconds = min(timeit.repeat(lambda: resolver(selection), number=1, repeat=repeat))
+        results.append({
+            "resolver": name,
+            "selection": size,
+            "ms": seconds * 1000.0,
+            "commands": calls,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        for result in bench_size(size, args.repeat):
+            results.append(result)
+            print("%(resolver)-22s selection %(selection)7d  %(ms)10.2f ms  "
+                  "%(commands)7d commands" % result)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+# coding=utf-8
+"""
+Benchmark the tool's hot paths against scenes of 10, 1k and 100k cameras.
+
+Runs against the stand-in "maya" package from "benchmarks/stubs", so it needs
+no Maya. Each case reports wall time and the number of Maya commands it
+issues. The stand-in commands are much cheaper than Maya's, so command
+counts are exact regression signals while times are relative ones.
+
+Results are written as JSON. Given a previous results file with
+"--baseline", the run fails when a case issues more commands than before,
+or gets slower by more than "--tolerance".
+
+Example:
+
+    python benchmarks/bench_suite.py --json results.json
+    python benchmarks/bench_suite.py --baseline results.json --tolerance 0.5
+"""
+
+from collections import namedtuple
+from collections import OrderedDict
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(HERE, "stubs"), os.path.dirname(HERE)]
+
+from maya import _stub  # noqa: E402
+import maya.cmds as mc  # noqa: E402
+import maya.utils  # noqa: E402
+import camera_browser  # noqa: E402
+import camera_set  # noqa: E402
+import camera_filter  # noqa: E402
+import clip_rules  # noqa: E402
+import maya_cameras  # noqa: E402
+import reset_camera_clip_planes_core  # noqa: E402
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+
+DEFAULT_SIZES = [10, 1000, 100000]
+
+# A benchmarked code path.
+#   setup: Called with the camera transforms of a fresh scene, returns the
+#       callable to time, called with no arguments.
+Case = namedtuple("Case", "name setup")
+
+
+def _setup_resolve(resolver):
+    def setup(transforms):
+        return lambda: list(resolver(transforms))
+    return setup
+
+
+def _setup_set_clip_plane(transforms):
+    cameras = maya_cameras.get_all_cameras()
+    return lambda: maya_cameras.set_cameras_clip_plane(cameras, 1.0, 50000.0)
+
+
+def _setup_manip_toggle(transforms):
+    cameras = maya_cameras.get_all_cameras()
+    return lambda: maya_cameras.camera_manip_clipping_toggle(cameras, enable=True)
+
+
+def _setup_filter(text, regex=False):
+    def setup(transforms):
+        names = [camera_browser.camera_name(path) for path in maya_cameras.get_all_cameras()]
+
+        def run():
+            # A fresh index each run, so substring filters are not narrowed
+            camera_filter.CameraNameIndex(names).match(text, regex)
+        return run
+    return setup
+
+
+def _setup_selection_watcher(transforms):
+    # Selection gestures adding and removing one camera to a large selection
+    selections = [transforms, transforms[:-1]]
+    watcher = maya_cameras.SelectionWatcher()
+    mc.select(transforms)
+    watcher.start()
+
+    def run():
+        selections.reverse()
+        mc.select(selections[0])
+        mc.select(selections[0])
+        maya.utils.processIdleEvents()
+    return run
+
+
+def _setup_manip_state(transforms):
+    cameras = maya_cameras.get_all_cameras()
+    state = maya_cameras.CameraManipState()
+    return lambda: state.set_clipping(cameras, enable=True)
+
+
+def _setup_incoming_cameras(transforms):
+    # Imports bringing in a tenth of the scene's cameras, reset as one batch
+    actions = reset_camera_clip_planes_core.MayaResetCameraClipPlanes()
+    incoming = maya_cameras.IncomingCameras(actions.enforce_clip_values)
+    incoming.start()
+    count = max(len(transforms) // 10, 1)
+    imports = iter(range(len(transforms)))
+
+    def run():
+        scene = _stub.scene
+        group = scene.add_node("|import{}".format(next(imports)), "transform")
+        scene.send_event("kBeforeImport")
+        for ii in range(count):
+            shape = scene.add_camera("camera{}".format(ii), parent=group)
+            scene.send_event("nodeAdded", maya_cameras.om.MObject(scene.index[shape]))
+        scene.send_event("kAfterImport")
+        maya.utils.processIdleEvents()
+    return run
+
+
+def _setup_camera_set(transforms):
+    # The cameras not selected whose clip values differ, read in bulk
+    mc.select(transforms[::2])
+    target = reset_camera_clip_planes_core.ClipPair(1.0, 50000.0)
+
+    def run():
+        cameras = camera_set.CameraSet.all() - camera_set.CameraSet.selected()
+        cameras.read_clip_values()
+        cameras.compress(cameras.changed(target))
+    return run
+
+
+def _setup_snapshot(transforms):
+    # Reset every camera, then revert it from the snapshot taken before the write
+    actions = reset_camera_clip_planes_core.MayaResetCameraClipPlanes()
+    actions.mode = "all"
+
+    def run():
+        actions.reset_cameras()
+        actions.restore_snapshot()
+    return run
+
+
+# Rules typical of a production preset, excluding one camera in ten
+RULES = clip_rules.ClipRuleSet.from_dict({"rules": [
+    {"label": "Startup cameras", "name": "^(persp|top|front|side)$", "exclude": True},
+    {"label": "Game cameras", "attribute": "isGameCamera", "exclude": True},
+    {"label": "Previs", "namespace": "^previs", "near": 0.1, "far": 100000},
+    {"label": "Excluded", "name": "^camera\\d*7$", "exclude": True},
+    {"label": "Group 1", "path": "^\\|group1\\|", "near": 2.0, "far": 20000},
+]})
+
+
+def _setup_reset(mode, skip_unchanged=False, rules=None):
+    def setup(transforms):
+        mc.select(transforms)
+        actions = reset_camera_clip_planes_core.MayaResetCameraClipPlanes()
+        actions.mode = mode
+        actions.skip_unchanged = skip_unchanged
+        actions.rules = rules
+        return actions.reset_cameras
+    return setup
+
+
+CASES = [
+    Case("resolve_cameras", _setup_resolve(maya_cameras.resolve_cameras)),
+    Case("resolve_cameras_bulk", _setup_resolve(maya_cameras.resolve_cameras_bulk)),
+    Case("set_cameras_clip_plane", _setup_set_clip_plane),
+    Case("camera_manip_clipping_toggle", _setup_manip_toggle),
+    Case("camera_manip_state[show_all]", _setup_manip_state),
+    Case("camera_filter[substring]", _setup_filter("cam1")),
+    Case("camera_filter[regex]", _setup_filter(r"^cam\d*5$", regex=True)),
+    Case("selection_watcher", _setup_selection_watcher),
+    Case("incoming_cameras[import]", _setup_incoming_cameras),
+    Case("camera_set[difference,changed]", _setup_camera_set),
+    Case("reset_cameras[selected]", _setup_reset("selected")),
+    Case("reset_cameras[all]", _setup_reset("all")),
+    Case("reset_cameras[all,skip_unchanged]", _setup_reset("all", skip_unchanged=True)),
+    Case("reset_cameras[all,rules]", _setup_reset("all", rules=RULES)),
+    Case("snapshot[reset,restore]", _setup_snapshot),
+]
+
+
+def run_case(case, size, repeat):
+    # type: (Case, int, int) -> OrderedDict
+    """
+    Time a case on a fresh scene of "size" cameras.
+
+    After a warm up run, one run counts the commands issued, then the case
+    is timed "repeat" times with the garbage collector disabled. Cases that
+    skip work already done, like "skip_unchanged", are measured with
+    nothing left to do.
+
+    :return: The result of the case.
+
+    """
+    transforms = _stub.build_camera_scene(size)
+    func = case.setup(transforms)
+
+    func()
+    _stub.scene.calls.clear()
+    func()
+    calls = OrderedDict(sorted(_stub.scene.calls.items()))
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = timer()
+            func()
+            samples.append(timer() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    samples.sort()
+    result = OrderedDict()
+    result["case"] = case.name
+    result["cameras"] = size
+    result["seconds_min"] = samples[0]
+    result["seconds_median"] = samples[len(samples) // 2]
+    result["us_per_camera"] = samples[0] / size * 1e6
+    result["commands"] = sum(calls.values())
+    result["calls"] = calls
+    return result
+
+
+def compare(results, baseline, tolerance):
+    # type: (list, list, float) -> list
+    """
+    Return the regressions of "results" against a "baseline" run.
+
+    :param results: Results of this run.
+    :param baseline: Results of a previous run.
+    :param tolerance: Slowdown ratio allowed before a time counts as a regression.
+
+    :return: Messages describing each regression.
+
+    """
+    previous = dict(((r["case"], r["cameras"]), r) for r in baseline)
+
+    regressions = []
+    for result in results:
+        before = previous.get((result["case"], result["cameras"]))
+        if before is None:
+            continue
+
+        label = "%s @ %d cameras" % (result["case"], result["cameras"])
+        if result["commands"] > before["commands"]:
+            regressions.append("%s: %d commands, was %d" % (label, result["commands"], before["commands"]))
+        if result["seconds_min"] > before["seconds_min"] * (1.0 + tolerance):
+            regressions.append("%s: %.2f ms, was %.2f ms" % (
+                label, result["seconds_min"] * 1000.0, before["seconds_min"] * 1000.0))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="+", metavar="CASE",
+                        help="Only run these cases, from: {}".format(", ".join(c.name for c in CASES)))
+    parser.add_argument("--json", help="Write the results to this file.")
+    parser.add_argument("--baseline", help="Results file of a previous run to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Slowdown ratio allowed against the baseline.")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.cases or c.name in args.cases]
+
+    results = []
+    for size in args.sizes:
+        for case in cases:
+            result = run_case(case, size, args.repeat)
+            results.append(result)
+            print("%(case)-34s cameras %(cameras)7d  %(seconds_min)10.4f s  "
+                  "%(us_per_camera)8.2f us/camera  %(commands)8d commands" % result)
+
+    if args.json:
+        report = OrderedDict()
+        report["python"] = platform.python_version()
+        report["platform"] = platform.platform()
+        report["repeat"] = args.repeat
+        report["results"] = results
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""
+Stand-in for "PySide2.QtCore".
+"""
+
+
+class Qt(object):
+    DisplayRole = 0
+    ToolTipRole = 3
+    TextAlignmentRole = 7
+    UserRole = 256
+    Horizontal = 1
+    Vertical = 2
+    AlignRight = 0x0002
+    AlignVCenter = 0x0080
+    AscendingOrder = 0
+    DescendingOrder = 1
+
+
+class QModelIndex(object):
+
+    def isValid(self):
+        return False
+
+
+class QAbstractItemModel(object):
+    pass
+
+
+class QAbstractTableModel(QAbstractItemModel):
+    pass
+
+
+class QAbstractProxyModel(QAbstractItemModel):
+    pass
@@ -0,0 +1,3 @@
+"""
+Stand-in for "PySide2.QtGui".
+"""
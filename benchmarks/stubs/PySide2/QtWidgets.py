@@ -0,0 +1,11 @@
+"""
+Stand-in for "PySide2.QtWidgets".
+"""
+
+
+class QWidget(object):
+    pass
+
+
+class QDialog(QWidget):
+    pass
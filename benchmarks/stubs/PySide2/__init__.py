@@ -0,0 +1,4 @@
+"""
+Stand-in for "PySide2", so the tool module can be imported to benchmark its
+non UI code. Only the names used when importing the module are provided.
+"""
@@ -0,0 +1,10 @@
+"""
+Stand-in for "maya.OpenMayaUI", there is no main window to return.
+"""
+
+
+class MQtUtil(object):
+
+    @staticmethod
+    def mainWindow():
+        return None
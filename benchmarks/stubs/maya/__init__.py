@@ -0,0 +1,4 @@
+"""
+Stand-in for the "maya" package so the tool modules can be imported and
+benchmarked without a Maya installation.
+"""
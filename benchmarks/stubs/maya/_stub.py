@@ -0,0 +1,234 @@
+"""
+In-memory scene behind the stand-in "maya" modules.
+
+Only what the tool's modules query is modelled: DAG paths, node types,
+attribute values and locks, animation curves, the active selection,
+"fileInfo", event callbacks and the undo queue of the plugin commands.
+Every command records a call count, so benchmarks can report how many
+commands a code path issues.
+
+Nodes are stored by index in flat arrays, and double attributes in one
+"array('d')" per attribute, so a scene of 100k cameras stays cheap to
+build and hold.
+"""
+
+from array import array
+from collections import Counter
+import itertools
+
+
+UNSET = float("nan")
+
+# Short attribute names, stored under their long name
+ATTR_ALIASES = {
+    "ncp": "nearClipPlane",
+    "fcp": "farClipPlane",
+}
+
+
+class Scene(object):
+
+    def __init__(self):
+        self.paths = []  # node index -> full path
+        self.index = {}  # full path -> node index
+        self.leaves = {}  # leaf name -> node index, -1 when not unique
+        self.types = array("B")  # node index -> node type code
+        self.type_names = []  # node type code -> node type
+        self.type_codes = {}  # node type -> node type code
+        self.children = {}  # parent full path -> array of child node indices
+        self.doubles = {}  # attribute name -> array("d") of values per node index
+        self.attrs = {}  # (node index, attribute name) -> value, other attributes
+        self.locked = set()  # (node index, attribute name) of the locked attributes
+        self.anim_curves = {}  # (node index, attribute name) -> AnimCurve connected to it
+        self.selection = []  # full paths
+        self.callbacks = {}  # callback id -> (event name, function)
+        self.calls = Counter()  # command name -> number of calls
+        self.batch = False  # Running in maya.standalone
+        self.file_path = ""
+        self.file_info = {}  # "fileInfo" key -> value, saved with the scene
+        self.undo_queue = []  # undo steps, each a list of undoable commands
+        self.redo_queue = []
+        self.undo_chunk = None  # commands of the open undo chunk
+        self.undo_chunk_depth = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def type_code(self, node_type):
+        code = self.type_codes.get(node_type)
+        if code is None:
+            code = self.type_codes[node_type] = len(self.type_names)
+            self.type_names.append(node_type)
+        return code
+
+    def node_type(self, index):
+        return self.type_names[self.types[index]]
+
+    def indices_of_type(self, node_types):
+        codes = set(self.type_codes[t] for t in node_types if t in self.type_codes)
+        return [ii for ii, code in enumerate(self.types) if code in codes]
+
+    def add_callback(self, event, func):
+        callback_id = next(_callback_ids)
+        self.callbacks[callback_id] = (event, func)
+        return callback_id
+
+    def send_event(self, event, *args):
+        for name, func in list(self.callbacks.values()):
+            if name == event:
+                func(*(args or (None,)))
+
+    def add_node(self, path, node_type, **attrs):
+        index = len(self.paths)
+        self.paths.append(path)
+        self.index[path] = index
+        self.types.append(self.type_code(node_type))
+
+        leaf = path.rsplit("|", 1)[-1]
+        self.leaves[leaf] = -1 if leaf in self.leaves else index
+
+        parent = path.rsplit("|", 1)[0]
+        self.children.setdefault(parent, array("l")).append(index)
+
+        for values in self.doubles.values():
+            values.append(UNSET)
+        for name, value in attrs.items():
+            self.set_attr(index, name, value)
+        return path
+
+    def add_camera(self, name, parent="", near=0.1, far=10000.0):
+        """
+        Add a camera transform and shape, return the shape full path.
+        """
+        transform = self.add_node("{}|{}".format(parent, name), "transform")
+        return self.add_node(
+            "{}|{}Shape".format(transform, name), "camera",
+            nearClipPlane=near, farClipPlane=far,
+        )
+
+    def resolve_index(self, name):
+        """
+        Return the node index for a full path or a unique leaf name.
+        """
+        index = self.index.get(name)
+        if index is None:
+            index = self.leaves.get(name.rsplit("|", 1)[-1], -1)
+        if index < 0:
+            raise ValueError("No object matches name: {}".format(name))
+        return index
+
+    def resolve(self, name):
+        """
+        Return the full path for a full path or a unique leaf name.
+        """
+        return self.paths[self.resolve_index(name)]
+
+    def record_undo(self, command):
+        """
+        Add an undoable command run to the open undo chunk, else as its own undo step.
+        """
+        if self.undo_chunk is not None:
+            self.undo_chunk.append(command)
+        else:
+            self.undo_queue.append([command])
+        self.redo_queue = []
+
+    def open_undo_chunk(self):
+        if not self.undo_chunk_depth:
+            self.undo_chunk = []
+        self.undo_chunk_depth += 1
+
+    def close_undo_chunk(self):
+        if not self.undo_chunk_depth:
+            return
+        self.undo_chunk_depth -= 1
+        if not self.undo_chunk_depth:
+            chunk, self.undo_chunk = self.undo_chunk, None
+            if chunk:
+                self.undo_queue.append(chunk)
+
+    def lock_attr(self, index, name, lock=True):
+        key = (index, ATTR_ALIASES.get(name, name))
+        if lock:
+            self.locked.add(key)
+        else:
+            self.locked.discard(key)
+
+    def is_locked(self, index, name):
+        return (index, ATTR_ALIASES.get(name, name)) in self.locked
+
+    def set_attr(self, index, name, value):
+        name = ATTR_ALIASES.get(name, name)
+        if isinstance(value, float) or name in self.doubles:
+            values = self.doubles.get(name)
+            if values is None:
+                values = self.doubles[name] = array("d", [UNSET]) * len(self.paths)
+            values[index] = value
+        else:
+            self.attrs[(index, name)] = value
+
+    def get_attr(self, index, name):
+        name = ATTR_ALIASES.get(name, name)
+        values = self.doubles.get(name)
+        if values is not None and values[index] == values[index]:
+            return values[index]
+        try:
+            return self.attrs[(index, name)]
+        except KeyError:
+            raise ValueError("No attribute: {}.{}".format(self.paths[index], name))
+
+
+class AnimCurve(object):
+    """
+    Animation curve node, not part of the DAG: its keys are never evaluated.
+    """
+
+    def __init__(self):
+        self.keys = []  # (time, value) pairs, by time
+
+    def key_times(self):
+        return [time for time, _ in self.keys]
+
+    def key_values(self):
+        return [value for _, value in self.keys]
+
+
+_callback_ids = itertools.count(1)
+
+scene = Scene()
+
+
+def reset():
+    global scene
+    scene = Scene()
+    return scene
+
+
+def build_camera_scene(count, cameras_per_group=100):
+    """
+    Reset the scene to "count" cameras, parented in groups.
+
+    :return: Full paths of the camera transforms.
+    """
+    reset()
+    transforms = []
+    for ii in range(count):
+        group = "|group{}".format(ii // cameras_per_group)
+        if group not in scene.index:
+            scene.add_node(group, "transform")
+        shape = scene.add_camera("camera{}".format(ii), parent=group)
+        transforms.append(shape.rsplit("|", 1)[0])
+    return transforms
+
+
+def counted(func):
+    """
+    Decorator recording the number of calls of a stand-in command.
+    """
+    def wrapper(*args, **kwargs):
+        scene.calls[func.__name__] += 1
+        return func(*args, **kwargs)
+
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
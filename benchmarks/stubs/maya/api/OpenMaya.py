@@ -0,0 +1,334 @@
+"""
+Stand-in for "maya.api.OpenMaya", backed by the in-memory scene of "maya._stub".
+
+Distances are returned as stored, the scene unit is taken to be centimeters.
+"""
+
+from maya import _stub
+
+
+class MFn(object):
+
+    kAnimCurve = "kAnimCurve"
+
+
+class MObject(object):
+    """
+    A scene node by index, or an animation curve of the scene.
+    """
+
+    def __init__(self, index=-1, curve=None):
+        self._index = index
+        self._curve = curve
+
+    def hasFn(self, fn):
+        return fn == MFn.kAnimCurve and self._curve is not None
+
+
+class MObjectHandle(object):
+
+    def __init__(self, obj):
+        self._index = obj._index
+
+    def __eq__(self, other):
+        return isinstance(other, MObjectHandle) and other._index == self._index
+
+    def __ne__(self, other):
+        return not self == other
+
+    def hashCode(self):
+        return self._index
+
+    def object(self):
+        return MObject(self._index)
+
+    def isValid(self):
+        return 0 <= self._index < len(_stub.scene)
+
+
+class MDagPath(object):
+
+    def __init__(self, index=-1):
+        self._index = index
+
+    @staticmethod
+    def getAPathTo(obj):
+        return MDagPath(obj._index)
+
+    def fullPathName(self):
+        return _stub.scene.paths[self._index]
+
+    def node(self):
+        return MObject(self._index)
+
+    def isValid(self):
+        return 0 <= self._index < len(_stub.scene)
+
+
+class MSelectionList(object):
+    """
+    Like Maya, adding a node already in the list leaves the list as is.
+    """
+
+    def __init__(self):
+        self._indices = []
+        self._added = set()
+
+    def add(self, item):
+        if isinstance(item, MDagPath):
+            index = item._index
+        else:
+            try:
+                index = _stub.scene.resolve_index(item)
+            except ValueError:
+                raise RuntimeError("(kInvalidParameter): Object does not exist")
+        if index not in self._added:
+            self._added.add(index)
+            self._indices.append(index)
+        return self
+
+    def length(self):
+        return len(self._indices)
+
+    def getDagPath(self, index):
+        return MDagPath(self._indices[index])
+
+    def getDependNode(self, index):
+        return MObject(self._indices[index])
+
+
+class MFnCamera(object):
+
+    def __init__(self, path):
+        self._index = path._index
+
+    @property
+    def nearClippingPlane(self):
+        return _stub.scene.get_attr(self._index, "nearClipPlane")
+
+    @property
+    def farClippingPlane(self):
+        return _stub.scene.get_attr(self._index, "farClipPlane")
+
+    @property
+    def focalLength(self):
+        return 35.0
+
+    def isOrtho(self):
+        return False
+
+
+class MPlug(object):
+
+    kFreeToChange = 0
+    kNotFreeToChange = 1
+    kChildrenNotFreeToChange = 2
+
+    def __init__(self, index=-1, name="", curve=None):
+        self._index = index
+        self._name = name
+        self._curve = curve  # Set on the output plug of an animation curve
+
+    @property
+    def isNull(self):
+        return self._index < 0 and self._curve is None
+
+    @property
+    def isLocked(self):
+        return _stub.scene.is_locked(self._index, self._name)
+
+    def node(self):
+        return MObject(self._index, self._curve)
+
+    def source(self):
+        curve = _stub.scene.anim_curves.get((self._index, self._name))
+        if curve is None:
+            return MPlug()
+        return MPlug(name="output", curve=curve)
+
+    def name(self):
+        return "{}.{}".format(_stub.scene.paths[self._index].rsplit("|", 1)[-1], self._name)
+
+    def asBool(self):
+        return bool(_stub.scene.get_attr(self._index, self._name))
+
+    def asDouble(self):
+        return _stub.scene.get_attr(self._index, self._name)
+
+    def isFreeToChange(self, checkParents=True, checkChildren=True):
+        if _stub.scene.is_locked(self._index, self._name):
+            return MPlug.kNotFreeToChange
+        return MPlug.kFreeToChange
+
+
+class MDGModifier(object):
+    """
+    Plug values are set and animation curves connected on "doIt", the values
+    they replace restored and the curves disconnected on "undoIt".
+    """
+
+    def __init__(self):
+        self._values = []  # (plug, new value)
+        self._previous = []  # (plug, value replaced), filled by "doIt"
+        self._curves = []  # (curve, plug), added by "MFnAnimCurve.create"
+
+    def newPlugValueDouble(self, plug, value):
+        self._values.append((plug, value))
+        return self
+
+    def doIt(self):
+        _stub.scene.calls["MDGModifier.doIt"] += 1
+        scene = _stub.scene
+        self._previous = []
+        for plug, value in self._values:
+            self._previous.append((plug, scene.get_attr(plug._index, plug._name)))
+            scene.set_attr(plug._index, plug._name, value)
+        for curve, plug in self._curves:
+            scene.anim_curves[(plug._index, plug._name)] = curve
+        return self
+
+    def undoIt(self):
+        scene = _stub.scene
+        for curve, plug in reversed(self._curves):
+            scene.anim_curves.pop((plug._index, plug._name), None)
+        for plug, value in reversed(self._previous):
+            scene.set_attr(plug._index, plug._name, value)
+        return self
+
+
+class MFnDependencyNode(object):
+
+    def __init__(self, obj):
+        self._index = obj._index
+
+    def hasAttribute(self, name):
+        try:
+            _stub.scene.get_attr(self._index, name)
+        except ValueError:
+            return False
+        return True
+
+    def findPlug(self, name, wantNetworkedPlug):
+        return MPlug(self._index, name)
+
+
+class MArgList(object):
+    pass
+
+
+class MPxCommand(object):
+
+    def isUndoable(self):
+        return False
+
+    def doIt(self, args):
+        pass
+
+    def redoIt(self):
+        pass
+
+    def undoIt(self):
+        pass
+
+
+class MFnPlugin(object):
+    """
+    Commands are registered in "maya.cmds" under their name, like Maya does.
+    """
+
+    def __init__(self, obj, vendor="", version="", apiVersion="Any"):
+        pass
+
+    def registerCommand(self, name, creator, syntax=None):
+        from maya import cmds
+        cmds.register_command(name, creator)
+
+    def deregisterCommand(self, name):
+        from maya import cmds
+        cmds.deregister_command(name)
+
+
+class MTime(object):
+
+    def __init__(self, value=0.0, unit=None):
+        self.value = value
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit():
+        return "film"
+
+
+class MTimeArray(list):
+    pass
+
+
+class MDoubleArray(list):
+    pass
+
+
+class MDistance(object):
+
+    @staticmethod
+    def internalToUI(value):
+        return value
+
+    @staticmethod
+    def uiToInternal(value):
+        return value
+
+
+class MMessage(object):
+
+    @staticmethod
+    def removeCallbacks(ids):
+        for callback_id in ids:
+            _stub.scene.callbacks.pop(callback_id, None)
+
+
+class MEventMessage(MMessage):
+
+    @staticmethod
+    def addEventCallback(event, func, clientData=None):
+        return _stub.scene.add_callback(event, func)
+
+
+class MDGMessage(MMessage):
+    """
+    Nodes are never added or removed through the stand-in commands, so these
+    callbacks are only called by benchmarks sending "nodeAdded" or
+    "nodeRemoved" themselves.
+    """
+
+    @staticmethod
+    def addNodeAddedCallback(func, node_type="dependNode", clientData=None):
+        return _stub.scene.add_callback("nodeAdded", func)
+
+    @staticmethod
+    def addNodeRemovedCallback(func, node_type="dependNode", clientData=None):
+        return _stub.scene.add_callback("nodeRemoved", func)
+
+
+class MSceneMessage(MMessage):
+    """
+    Messages are sent by benchmarks with "scene.send_event", by name.
+    """
+
+    kBeforeNew = "kBeforeNew"
+    kAfterNew = "kAfterNew"
+    kBeforeOpen = "kBeforeOpen"
+    kAfterOpen = "kAfterOpen"
+    kBeforeImport = "kBeforeImport"
+    kAfterImport = "kAfterImport"
+    kBeforeCreateReference = "kBeforeCreateReference"
+    kAfterCreateReference = "kAfterCreateReference"
+    kBeforeLoadReference = "kBeforeLoadReference"
+    kAfterLoadReference = "kAfterLoadReference"
+    kBeforeUnloadReference = "kBeforeUnloadReference"
+    kAfterUnloadReference = "kAfterUnloadReference"
+    kBeforeRemoveReference = "kBeforeRemoveReference"
+    kAfterRemoveReference = "kAfterRemoveReference"
+
+    @staticmethod
+    def addCallback(message, func, clientData=None):
+        return _stub.scene.add_callback(message, func)
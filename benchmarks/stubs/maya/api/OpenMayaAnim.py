@@ -0,0 +1,63 @@
+"""
+Stand-in for "maya.api.OpenMayaAnim", backed by the animation curves of
+"maya._stub". Curves hold their keys, they are never evaluated.
+"""
+
+from maya import _stub
+from maya.api.OpenMaya import MObject
+from maya.api.OpenMaya import MPlug
+
+
+class MAnimCurveChange(object):
+    """
+    Keys of each curve before and after the changes, restored on "undoIt".
+    """
+
+    def __init__(self):
+        self._changes = []  # (curve, keys before, keys after)
+
+    def undoIt(self):
+        for curve, before, _ in reversed(self._changes):
+            curve.keys = list(before)
+
+    def redoIt(self):
+        for curve, _, after in self._changes:
+            curve.keys = list(after)
+
+
+class MFnAnimCurve(object):
+
+    kTangentGlobal = 0
+    kTangentLinear = 2
+
+    def __init__(self, obj=None):
+        self._curve = None
+        if isinstance(obj, MPlug):
+            self._curve = obj.source()._curve
+        elif isinstance(obj, MObject):
+            self._curve = obj._curve
+        if obj is not None and self._curve is None:
+            raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+
+    def create(self, plug, animCurveType=None, modifier=None):
+        """
+        Like Maya, the curve is connected by "modifier.doIt" when a modifier is given.
+        """
+        if _stub.scene.is_locked(plug._index, plug._name):
+            raise RuntimeError("(kFailure): Unexpected Internal Failure")
+        self._curve = _stub.AnimCurve()
+        if modifier is None:
+            _stub.scene.anim_curves[(plug._index, plug._name)] = self._curve
+        else:
+            modifier._curves.append((self._curve, plug))
+        return MObject(curve=self._curve)
+
+    def addKeys(self, times, values, tangentInType=kTangentGlobal, tangentOutType=kTangentGlobal,
+                keepExistingKeys=False, change=None):
+        _stub.scene.calls["MFnAnimCurve.addKeys"] += 1
+        before = list(self._curve.keys)
+        keys = dict(before) if keepExistingKeys else {}
+        keys.update((time.value, value) for time, value in zip(times, values))
+        self._curve.keys = sorted(keys.items())
+        if change is not None:
+            change._changes.append((self._curve, before, list(self._curve.keys)))
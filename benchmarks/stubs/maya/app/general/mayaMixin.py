@@ -0,0 +1,7 @@
+"""
+Stand-in for "maya.app.general.mayaMixin", so the UI module can be imported.
+"""
+
+
+class MayaQWidgetDockableMixin(object):
+    pass
@@ -0,0 +1,262 @@
+"""
+Stand-in for "maya.cmds", backed by the in-memory scene of "maya._stub".
+"""
+
+import importlib
+import os
+import sys
+
+from maya import _stub
+from maya._stub import counted
+import maya.api.OpenMaya as om
+
+
+# Plugin name -> plugin module
+_plugins = {}
+
+
+def _as_list(args):
+    names = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            names.extend(arg)
+        else:
+            names.append(arg)
+    return names
+
+
+def _type_filter(kwargs):
+    node_type = kwargs.get("type", kwargs.get("typ"))
+    exact_type = kwargs.get("exactType", kwargs.get("et"))
+    if node_type is None and exact_type is None:
+        return None
+    scene = _stub.scene
+    wanted = set(scene.type_code(t) for t in _as_list([node_type or exact_type]))
+    return lambda index: scene.types[index] in wanted
+
+
+def _paths(scene, indices, long_names):
+    if long_names:
+        return [scene.paths[ii] for ii in indices]
+    return [scene.paths[ii].rsplit("|", 1)[-1] for ii in indices]
+
+
+@counted
+def ls(*args, **kwargs):
+    scene = _stub.scene
+
+    if kwargs.get("sl") or kwargs.get("selection"):
+        indices = [scene.index[path] for path in scene.selection]
+    elif kwargs.get("cameras") or kwargs.get("ca"):
+        indices = scene.indices_of_type(["camera"])
+    elif args:
+        indices = []
+        for name in _as_list(args):
+            try:
+                indices.append(scene.resolve_index(name))
+            except ValueError:
+                continue
+    else:
+        indices = range(len(scene))
+
+    type_filter = _type_filter(kwargs)
+    if type_filter:
+        indices = [ii for ii in indices if type_filter(ii)]
+
+    paths = _paths(scene, indices, kwargs.get("long") or kwargs.get("l"))
+
+    if kwargs.get("showType") or kwargs.get("st"):
+        typed = []
+        for path, index in zip(paths, indices):
+            typed.extend([path, scene.node_type(index)])
+        return typed
+
+    return paths
+
+
+@counted
+def nodeType(name):
+    scene = _stub.scene
+    return scene.node_type(scene.resolve_index(name))
+
+
+@counted
+def listRelatives(*args, **kwargs):
+    scene = _stub.scene
+
+    parents = [scene.resolve(name) for name in _as_list(args)]
+    if kwargs.get("parent") or kwargs.get("p"):
+        relatives = [scene.index[path.rsplit("|", 1)[0]] for path in parents]
+    else:
+        relatives = []
+        for parent in parents:
+            relatives.extend(scene.children.get(parent, ()))
+
+    type_filter = _type_filter(kwargs)
+    if type_filter:
+        relatives = [ii for ii in relatives if type_filter(ii)]
+
+    return _paths(scene, relatives, kwargs.get("fullPath") or kwargs.get("f")) or None
+
+
+@counted
+def select(*args, **kwargs):
+    scene = _stub.scene
+    if kwargs.get("clear") or kwargs.get("cl"):
+        scene.selection = []
+    else:
+        scene.selection = [scene.resolve(name) for name in _as_list(args)]
+    scene.send_event("SelectionChanged")
+
+
+@counted
+def setAttr(plug, *values, **kwargs):
+    scene = _stub.scene
+    node, attr = plug.split(".", 1)
+    try:
+        index = scene.resolve_index(node)
+    except ValueError as err:
+        raise RuntimeError(str(err))
+
+    lock = kwargs.get("lock", kwargs.get("l"))
+    if lock is not None:
+        scene.lock_attr(index, attr, lock)
+    if not values:
+        return
+    if scene.is_locked(index, attr):
+        raise RuntimeError("The attribute '{}' is locked or connected and cannot be modified.".format(plug))
+    scene.set_attr(index, attr, values[0] if len(values) == 1 else values)
+
+
+@counted
+def getAttr(plug, **kwargs):
+    scene = _stub.scene
+    node, attr = plug.split(".", 1)
+    return scene.get_attr(scene.resolve_index(node), attr)
+
+
+@counted
+def undoInfo(*args, **kwargs):
+    """
+    Only chunks are modelled, the commands of "maya.cmds" are not recorded.
+    """
+    scene = _stub.scene
+    if kwargs.get("openChunk") or kwargs.get("ock"):
+        scene.open_undo_chunk()
+    elif kwargs.get("closeChunk") or kwargs.get("cck"):
+        scene.close_undo_chunk()
+
+
+@counted
+def undo(*args, **kwargs):
+    scene = _stub.scene
+    if scene.undo_queue:
+        step = scene.undo_queue.pop()
+        for command in reversed(step):
+            command.undoIt()
+        scene.redo_queue.append(step)
+
+
+@counted
+def redo(*args, **kwargs):
+    scene = _stub.scene
+    if scene.redo_queue:
+        step = scene.redo_queue.pop()
+        for command in step:
+            command.redoIt()
+        scene.undo_queue.append(step)
+
+
+@counted
+def loadPlugin(path, **kwargs):
+    """
+    Plugins are imported as modules, from the directory of "path".
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in _plugins:
+        return [name]
+
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory not in sys.path:
+        sys.path.append(directory)
+    module = importlib.import_module(name)
+    module.initializePlugin(om.MObject())
+    _plugins[name] = module
+    return [name]
+
+
+@counted
+def pluginInfo(name, **kwargs):
+    name = os.path.splitext(os.path.basename(name))[0]
+    if kwargs.get("loaded") or kwargs.get("l"):
+        return name in _plugins
+    raise NotImplementedError("pluginInfo: {}".format(kwargs))
+
+
+def register_command(name, creator):
+    """
+    Add a plugin command to this module, its undoable runs recorded in the undo queue.
+    """
+    def command(*args, **kwargs):
+        instance = creator()
+        instance.doIt(om.MArgList())
+        if instance.isUndoable():
+            _stub.scene.record_undo(instance)
+
+    command.__name__ = name
+    globals()[name] = counted(command)
+
+
+def deregister_command(name):
+    globals().pop(name, None)
+
+
+@counted
+def refresh(*args, **kwargs):
+    pass
+
+
+@counted
+def renderManip(*args, **kwargs):
+    pass
+
+
+@counted
+def inViewMessage(*args, **kwargs):
+    pass
+
+
+@counted
+def about(*args, **kwargs):
+    if kwargs.get("batch") or kwargs.get("b"):
+        return _stub.scene.batch
+    raise NotImplementedError("about: {}".format(kwargs))
+
+
+@counted
+def file(*args, **kwargs):
+    """
+    Scenes are not read from disk: opening a file keeps the current
+    in-memory scene, so benchmarks can fill it beforehand.
+    """
+    scene = _stub.scene
+    if kwargs.get("open") or kwargs.get("o"):
+        scene.file_path = args[0]
+    elif kwargs.get("rename") or kwargs.get("rn"):
+        scene.file_path = kwargs.get("rename") or kwargs.get("rn")
+    elif kwargs.get("query") or kwargs.get("q"):
+        return scene.file_path
+
+
+@counted
+def fileInfo(*args, **kwargs):
+    info = _stub.scene.file_info
+    remove = kwargs.get("remove", kwargs.get("rm"))
+    if remove is not None:
+        info.pop(remove, None)
+    elif kwargs.get("query") or kwargs.get("q"):
+        if args:
+            return [info[args[0]]] if args[0] in info else []
+        return [item for pair in info.items() for item in pair]
+    else:
+        info[args[0]] = args[1]
@@ -0,0 +1,13 @@
+"""
+Stand-in for "maya.standalone".
+"""
+
+from maya import _stub
+
+
+def initialize(name="python"):
+    _stub.scene.batch = True
+
+
+def uninitialize():
+    pass
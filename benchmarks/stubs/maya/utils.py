@@ -0,0 +1,15 @@
+"""
+Stand-in for "maya.utils". Deferred functions run on "processIdleEvents".
+"""
+
+_deferred = []
+
+
+def executeDeferred(func, *args, **kwargs):
+    _deferred.append((func, args, kwargs))
+
+
+def processIdleEvents():
+    while _deferred:
+        func, args, kwargs = _deferred.pop(0)
+        func(*args, **kwargs)
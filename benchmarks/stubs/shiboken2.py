@@ -0,0 +1,11 @@
+"""
+Stand-in for "shiboken2".
+"""
+
+
+def wrapInstance(pointer, base):
+    raise NotImplementedError("wrapInstance")
+
+
+def isValid(obj):
+    return obj is not None
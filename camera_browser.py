@@ -0,0 +1,433 @@
+# coding=utf-8
+"""
+Camera browser widget, listing the scene cameras and their clip planes so
+users can pick the cameras to act on.
+
+Built to stay responsive with tens of thousands of cameras:
+- The model holds a "CameraSet", paths plus flat arrays of clip values,
+  and builds the displayed text only for the rows the view asks for.
+- The clip values are read in one bulk query, not one per row.
+- The filter proxy keeps a flat list of matching rows computed in one pass
+  by "camera_filter", instead of Qt calling back into Python per row.
+"""
+
+from array import array
+import logging
+import re
+
+# Type hinting in PyCharm
+try:
+    from typing import Callable, Iterable, List, Str, Tuple, Union
+except ImportError:
+    pass
+
+from camera_filter import CameraNameIndex
+from camera_set import CameraSet
+from maya_cameras import NothingSelectedError
+
+# Qt imports
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+
+
+log = logging.getLogger(__name__)
+
+# Role returning the full path of the camera shape of a row
+PathRole = QtCore.Qt.UserRole + 1
+
+
+def camera_name(path):
+    # type: (Str) -> Str
+    """
+    Return the name of the transform of a camera shape full path.
+    """
+    parts = path.rsplit("|", 2)
+    return parts[-2] if len(parts) > 2 and parts[-2] else parts[-1]
+
+
+class CameraTableModel(QtCore.QAbstractTableModel):
+    """
+    Table of cameras: name, near and far clip planes, and full path.
+    """
+
+    COLUMNS = ("Camera", "Near", "Far", "Path")
+    NAME_COLUMN, NEAR_COLUMN, FAR_COLUMN, PATH_COLUMN = range(4)
+
+    def __init__(self, parent=None):
+        super(CameraTableModel, self).__init__(parent)
+        self._cameras = CameraSet()
+        self._names = None  # type: Union[List[Str], None]
+
+    @property
+    def cameras(self):
+        # type: () -> CameraSet
+        return self._cameras
+
+    @property
+    def paths(self):
+        # type: () -> Tuple[Str]
+        return self._cameras.paths
+
+    @property
+    def names(self):
+        # type: () -> List[Str]
+        """
+        Camera names of every row, built on first use.
+        """
+        if self._names is None:
+            self._names = [camera_name(path) for path in self._cameras.paths]
+        return self._names
+
+    def set_cameras(self, cameras):
+        # type: (CameraSet) -> None
+        """
+        Replace the cameras listed, shown with the clip values of the set.
+        """
+        self.beginResetModel()
+        self._cameras = cameras
+        self._names = None
+        self.endResetModel()
+
+    def set_clip_values(self, clip_values):
+        # type: (Iterable[Tuple[float, float]]) -> None
+        """
+        Update the clip values of every row, in the order of "paths".
+        """
+        cameras = self._cameras
+        cameras.near = array("d")
+        cameras.far = array("d")
+        for near, far in clip_values:
+            cameras.near.append(near)
+            cameras.far.append(far)
+        self.clip_values_changed()
+
+    def clip_values_changed(self):
+        # type: () -> None
+        """
+        Redraw the clip values, after they were read or written on "cameras".
+        """
+        if len(self._cameras):
+            self.dataChanged.emit(
+                self.index(0, self.NEAR_COLUMN),
+                self.index(len(self._cameras) - 1, self.FAR_COLUMN),
+            )
+
+    # QAbstractTableModel
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._cameras)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = index.row()
+        column = index.column()
+        cameras = self._cameras
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == self.NAME_COLUMN:
+                return camera_name(cameras.paths[row])
+            if column == self.NEAR_COLUMN:
+                return "{:g}".format(cameras.near[row])
+            if column == self.FAR_COLUMN:
+                return "{:g}".format(cameras.far[row])
+            return cameras.paths[row]
+
+        if role == QtCore.Qt.ToolTipRole or role == PathRole:
+            return cameras.paths[row]
+
+        if role == QtCore.Qt.TextAlignmentRole and column in (self.NEAR_COLUMN, self.FAR_COLUMN):
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+
+class CameraFilterProxyModel(QtCore.QAbstractProxyModel):
+    """
+    Flat filter over a "CameraTableModel".
+
+    The matching source rows are computed in one pass by "CameraNameIndex"
+    and kept as a list, so mapping a row is a list lookup and Qt never calls
+    back into Python once per source row.
+    """
+
+    def __init__(self, parent=None):
+        super(CameraFilterProxyModel, self).__init__(parent)
+        self._rows = None  # type: Union[List[int], None]
+        self._inverse = None  # type: Union[array, None]
+        self._name_index = None  # type: Union[CameraNameIndex, None]
+        self._path_index = None  # type: Union[CameraNameIndex, None]
+        self._filter = ("", False, False)
+
+    def setSourceModel(self, model):
+        # type: (CameraTableModel) -> None
+        previous = self.sourceModel()
+        if previous is not None:
+            previous.modelReset.disconnect(self._on_source_reset)
+            previous.dataChanged.disconnect(self._on_source_data_changed)
+
+        self.beginResetModel()
+        super(CameraFilterProxyModel, self).setSourceModel(model)
+        model.modelReset.connect(self._on_source_reset)
+        model.dataChanged.connect(self._on_source_data_changed)
+        self._clear_indices()
+        self.endResetModel()
+
+    def set_filter(self, text, regex=False, full_path=False):
+        # type: (Str, bool, bool) -> None
+        """
+        Show only the cameras matching "text". See "CameraNameIndex.match".
+
+        :param text: Substring or regular expression to match.
+        :param regex: If True, "text" is a regular expression.
+        :param full_path: Match the full paths instead of the camera names.
+
+        :raise re.error: If "text" is not a valid regular expression, the
+            current filter is kept.
+
+        """
+        rows = self._match(text, regex, full_path)
+
+        self.beginResetModel()
+        self._filter = (text, regex, full_path)
+        self._rows = rows
+        self._inverse = None
+        self.endResetModel()
+
+    def source_rows(self):
+        # type: () -> Union[List[int], None]
+        """
+        Return the source rows shown, None when every row is shown.
+        """
+        return self._rows
+
+    def _match(self, text, regex, full_path):
+        # type: (Str, bool, bool) -> Union[List[int], None]
+        source = self.sourceModel()
+        if source is None:
+            return None
+
+        if full_path:
+            if self._path_index is None:
+                self._path_index = CameraNameIndex(source.paths)
+            return self._path_index.match(text, regex)
+
+        if self._name_index is None:
+            self._name_index = CameraNameIndex(source.names)
+        return self._name_index.match(text, regex)
+
+    def _clear_indices(self):
+        self._rows = None
+        self._inverse = None
+        self._name_index = None
+        self._path_index = None
+
+    def _on_source_reset(self):
+        self.beginResetModel()
+        self._clear_indices()
+        try:
+            self._rows = self._match(*self._filter)
+        except re.error:
+            self._rows = None
+        self.endResetModel()
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=()):
+        # Source changes span every row, so forward them as one range
+        count = self.rowCount()
+        if count:
+            self.dataChanged.emit(
+                self.index(0, top_left.column()),
+                self.index(count - 1, bottom_right.column()),
+            )
+
+    # QAbstractProxyModel
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        if self._rows is None:
+            return self.sourceModel().rowCount()
+        return len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not (0 <= row < self.rowCount()) or not (0 <= column < self.columnCount()):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QtCore.QModelIndex()):
+        return QtCore.QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QtCore.QModelIndex()
+        row = proxy_index.row()
+        if self._rows is not None:
+            row = self._rows[row]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QtCore.QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            if self._inverse is None:
+                # Built on demand, the views rarely map from the source
+                self._inverse = array("l", [-1]) * self.sourceModel().rowCount()
+                for proxy_row, source_row in enumerate(self._rows):
+                    self._inverse[source_row] = proxy_row
+            row = self._inverse[row]
+            if row < 0:
+                return QtCore.QModelIndex()
+        return self.index(row, source_index.column())
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and self.sourceModel() is not None:
+            return self.sourceModel().headerData(section, orientation, role)
+        return None
+
+
+class CameraBrowser(QtWidgets.QWidget):
+    """
+    Filterable table of the scene cameras, to pick cameras from.
+
+    The cameras picked are the rows selected in the table.
+    """
+
+    ROW_HEIGHT = 18
+
+    def __init__(self, get_cameras, parent=None):
+        # type: (Callable[[], Iterable[Str]], Union[QtWidgets.QWidget, None]) -> None
+        """
+        :param get_cameras: Callable returning the full paths of the cameras to list.
+        :param parent: Parent widget.
+        """
+        super(CameraBrowser, self).__init__(parent)
+
+        self._get_cameras = get_cameras
+
+        self._model = CameraTableModel(self)
+        self._proxy = CameraFilterProxyModel(self)
+        self._proxy.setSourceModel(self._model)
+
+        # Widgets
+
+        self._filter_edit = QtWidgets.QLineEdit()
+        self._filter_edit.setPlaceholderText('Filter cameras, e.g. "shot" or "re:^cam\\d+$"')
+        self._filter_edit.setClearButtonEnabled(True)
+
+        self._regex_check = QtWidgets.QCheckBox("Regex")
+        self._full_path_check = QtWidgets.QCheckBox("Full Path")
+        self._refresh_btn = QtWidgets.QPushButton("Refresh")
+        self._count_label = QtWidgets.QLabel()
+
+        view = QtWidgets.QTableView()
+        view.setModel(self._proxy)
+        view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        view.setWordWrap(False)
+        view.setShowGrid(False)
+        view.verticalHeader().hide()
+        # Fixed row heights, so the view never measures rows
+        view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+        view.horizontalHeader().setStretchLastSection(True)
+        self._view = view
+
+        # Layout
+
+        filter_layout = QtWidgets.QHBoxLayout()
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout.addWidget(self._filter_edit)
+        filter_layout.addWidget(self._regex_check)
+        filter_layout.addWidget(self._full_path_check)
+        filter_layout.addWidget(self._refresh_btn)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.setContentsMargins(2, 2, 2, 2)
+        layout.setSpacing(2)
+        layout.addLayout(filter_layout)
+        layout.addWidget(view)
+        layout.addWidget(self._count_label)
+        self.setLayout(layout)
+
+        # Connections
+
+        self._filter_edit.textChanged.connect(self._apply_filter)
+        self._regex_check.toggled.connect(self._apply_filter)
+        self._full_path_check.toggled.connect(self._apply_filter)
+        self._refresh_btn.clicked.connect(self.refresh)
+        view.selectionModel().selectionChanged.connect(self._update_count)
+        self._proxy.modelReset.connect(self._update_count)
+
+        self._update_count()
+
+    def refresh(self):
+        # type: () -> None
+        """
+        List the cameras again, with their current clip values.
+        """
+        self._model.set_cameras(CameraSet(self._get_cameras()).read_clip_values())
+        self._view.resizeColumnToContents(CameraTableModel.NAME_COLUMN)
+
+    def refresh_clip_values(self):
+        # type: () -> None
+        """
+        Update the clip values of the cameras listed, e.g. after a reset.
+        """
+        try:
+            self._model.cameras.read_clip_values()
+        except RuntimeError:
+            # Cameras were deleted or renamed since the last refresh
+            self.refresh()
+            return
+        self._model.clip_values_changed()
+
+    def picked_cameras(self):
+        # type: () -> List[Str]
+        """
+        Return the full paths of the cameras picked in the table.
+
+        :raise NothingSelectedError: If no camera is picked.
+
+        """
+        paths = [
+            index.data(PathRole) for index in self._view.selectionModel().selectedRows()
+        ]
+        if not paths:
+            raise NothingSelectedError("No cameras picked in the camera browser")
+        return paths
+
+    def _apply_filter(self, *args):
+        text = self._filter_edit.text()
+        try:
+            self._proxy.set_filter(
+                text, regex=self._regex_check.isChecked(),
+                full_path=self._full_path_check.isChecked())
+        except re.error as err:
+            self._filter_edit.setStyleSheet("QLineEdit { color: #F05A5A; }")
+            self._filter_edit.setToolTip("Invalid regular expression: {}".format(err))
+            return
+
+        self._filter_edit.setStyleSheet("")
+        self._filter_edit.setToolTip("")
+
+    def _update_count(self, *args):
+        shown = self._proxy.rowCount()
+        total = self._model.rowCount()
+        # Counted from the selection ranges, not one index per selected row
+        picked = sum(r.height() for r in self._view.selectionModel().selection())
+        self._count_label.setText("{} of {} camera(s) shown, {} picked".format(shown, total, picked))
@@ -0,0 +1,111 @@
+# coding=utf-8
+"""
+Filter camera names by substring or regular expression. It does not depend
+on Maya or Qt.
+
+Matching runs in C through "itertools.compress" over "map", with no Python
+code per name. Case is "smart": text without upper case letters matches
+any case, by searching names lower cased once up front, which is several
+times faster than "re.IGNORECASE". When the filter text grows from the
+previous substring, e.g. while typing, only the previous matches are
+searched again.
+"""
+
+from itertools import compress
+from itertools import repeat
+import operator
+import re
+
+try:
+    from itertools import imap
+except ImportError:
+    # Python 3
+    imap = map
+
+# Type hinting in PyCharm
+try:
+    from typing import List, Sequence, Str, Tuple, Union
+except ImportError:
+    pass
+
+
+REGEX_PREFIX = "re:"
+
+
+class CameraNameIndex(object):
+    """
+    Names of a list of cameras, searchable by substring or regex.
+
+    Attributes
+    ----------
+    names: List[Str]
+        Searched text of each camera, e.g. its name or full path.
+    """
+
+    def __init__(self, names):
+        # type: (Sequence[Str]) -> None
+        self.names = list(names)
+        self._lower_names = None  # type: Union[List[Str], None]
+
+        # Last substring filter run, to narrow the next one: (searched text, rows)
+        self._last = None  # type: Union[Tuple[Str, List[int]], None]
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def lower_names(self):
+        # type: () -> List[Str]
+        if self._lower_names is None:
+            self._lower_names = [name.lower() for name in self.names]
+        return self._lower_names
+
+    def match(self, text, regex=False):
+        # type: (Str, bool) -> Union[List[int], None]
+        """
+        Return the rows of the names matching "text".
+
+        :param text: Substring to search, or a regular expression. Text
+            starting with "re:" is always a regular expression. Without
+            upper case letters, it matches any case.
+        :param regex: If True, "text" is a regular expression.
+
+        :return: Matching rows in ascending order, None for every row when
+            "text" is empty.
+
+        :raise re.error: If "text" is not a valid regular expression.
+
+        """
+        if text.startswith(REGEX_PREFIX):
+            text = text[len(REGEX_PREFIX):]
+            regex = True
+
+        if not text:
+            self._last = None
+            return None
+
+        names = self.names if text != text.lower() else self.lower_names
+
+        if regex:
+            self._last = None
+            rows = range(len(names))
+            matches = list(compress(rows, imap(re.compile(text).search, names)))
+            return matches
+
+        # Names containing "text" also contain any substring of it, so only
+        # the previous matches can match a longer text.
+        key = (names is self.names, text)
+        rows = None
+        if self._last is not None:
+            (last_case_sensitive, last_text), last_rows = self._last
+            if last_case_sensitive == key[0] and last_text in text:
+                rows = last_rows
+
+        if rows is None:
+            matches = list(compress(range(len(names)), imap(operator.contains, names, repeat(text))))
+        else:
+            candidates = [names[ii] for ii in rows]
+            matches = list(compress(rows, imap(operator.contains, candidates, repeat(text))))
+
+        self._last = (key, matches)
+        return matches
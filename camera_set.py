@@ -0,0 +1,290 @@
+# coding=utf-8
+"""
+Array-backed set of cameras, to act on tens of thousands of cameras at once.
+
+A "CameraSet" holds the full paths of the camera shapes in order, and their
+near and far clip values in two contiguous "array('d')", rather than one
+object per camera. Filtering, set algebra, and clip value reads and writes
+all act on the whole set:
+
+    cameras = CameraSet.all() - CameraSet.selected()
+    cameras.read_clip_values()
+    changed = cameras.compress(cameras.changed(ClipPair(1.0, 50000.0)))
+    changed.write_clip_values(ClipPair(1.0, 50000.0))
+"""
+
+from array import array
+from itertools import compress
+from itertools import repeat
+
+# Type hinting in PyCharm
+try:
+    from typing import Dict, Iterable, Iterator, List, Sequence, Str, Tuple, Union
+except ImportError:
+    pass
+
+from clip_planes import CLIP_VALUE_TOLERANCE
+from clip_planes import clip_values_equal
+from clip_planes import ClipPair
+from maya_cameras import get_all_cameras
+from maya_cameras import get_cameras_clip_values
+from maya_cameras import get_selected_cameras
+from maya_cameras import set_cameras_clip_values
+
+
+# Clip value of the cameras whose values were not read
+UNREAD = float("nan")
+
+
+class CameraSet(object):
+    """
+    Ordered set of camera shapes, with their clip values.
+
+    Attributes
+    ----------
+    paths: Tuple[Str]
+        Full paths of the camera shapes, without duplicates.
+    near: array
+        Near clip value per camera, NaN until read.
+    far: array
+        Far clip value per camera, NaN until read.
+    """
+
+    def __init__(self, paths=(), near=None, far=None):
+        # type: (Iterable[Str], Union[Iterable[float], None], Union[Iterable[float], None]) -> None
+        """
+        :param paths: Full paths of the camera shapes. Only the first of
+            duplicate paths is kept.
+        :param near: Near clip value per path, None if not read.
+        :param far: Far clip value per path, None if not read.
+        """
+        paths = tuple(paths)
+        unread_near, unread_far = _unread(len(paths))
+        near = unread_near if near is None else array("d", near)
+        far = unread_far if far is None else array("d", far)
+
+        self._index = None  # type: Union[Dict[Str, int], None]
+        if len(set(paths)) != len(paths):
+            index = {}
+            for row, path in enumerate(paths):
+                index.setdefault(path, row)
+            keep = [index[path] == row for row, path in enumerate(paths)]
+            paths = tuple(compress(paths, keep))
+            near = array("d", compress(near, keep))
+            far = array("d", compress(far, keep))
+
+        self.paths = paths
+        self.near = near
+        self.far = far
+
+    @classmethod
+    def _from_unique(cls, paths, near, far):
+        # type: (Tuple[Str], array, array) -> CameraSet
+        """
+        Return a set of paths known to be unique, skipping the duplicates check.
+        """
+        camera_set = cls.__new__(cls)
+        camera_set._index = None
+        camera_set.paths = paths
+        camera_set.near = near
+        camera_set.far = far
+        return camera_set
+
+    @classmethod
+    def all(cls):
+        # type: () -> CameraSet
+        """
+        Return every camera of the scene.
+        """
+        paths = tuple(get_all_cameras())
+        return cls._from_unique(paths, *_unread(len(paths)))
+
+    @classmethod
+    def selected(cls):
+        # type: () -> CameraSet
+        """
+        Return the cameras resolved from the selection.
+
+        :raise NothingSelectedError: If nothing is selected.
+        :raise FailedToResolveFromSelectionError: If no camera resolves from the selection.
+
+        """
+        return cls(get_selected_cameras())
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        # type: () -> Iterator[Str]
+        return iter(self.paths)
+
+    def __getitem__(self, row):
+        # type: (int) -> Str
+        return self.paths[row]
+
+    def __contains__(self, path):
+        return path in self.index
+
+    def __repr__(self):
+        return "{}({} camera(s))".format(type(self).__name__, len(self.paths))
+
+    @property
+    def index(self):
+        # type: () -> Dict[Str, int]
+        """
+        Row of each path, built on first use.
+        """
+        if self._index is None:
+            self._index = dict((path, row) for row, path in enumerate(self.paths))
+        return self._index
+
+    @property
+    def clip_values_read(self):
+        # type: () -> bool
+        """
+        If the clip values were read or written, rather than left unread.
+        """
+        # NaN is the only value not equal to itself
+        return not self.near or self.near[0] == self.near[0]
+
+    def clip_values(self):
+        # type: () -> List[ClipPair]
+        """
+        Return the clip values of every camera, as last read or written.
+        """
+        return [ClipPair(near, far) for near, far in zip(self.near, self.far)]
+
+    # Filtering
+
+    def compress(self, mask):
+        # type: (Iterable[bool]) -> CameraSet
+        """
+        Return the cameras whose item of "mask" is true, in order.
+        """
+        mask = list(mask)
+        return self._from_unique(
+            tuple(compress(self.paths, mask)),
+            array("d", compress(self.near, mask)),
+            array("d", compress(self.far, mask)),
+        )
+
+    def take(self, rows):
+        # type: (Iterable[int]) -> CameraSet
+        """
+        Return the cameras of "rows", in the order of "rows".
+        """
+        rows = list(rows)
+        paths = self.paths
+        near = self.near
+        far = self.far
+        return type(self)(
+            [paths[row] for row in rows],
+            [near[row] for row in rows],
+            [far[row] for row in rows],
+        )
+
+    def changed(self, clip_values, tolerance=CLIP_VALUE_TOLERANCE):
+        # type: (Union[ClipPair, Sequence[ClipPair]], float) -> List[bool]
+        """
+        Return which cameras' clip values differ from "clip_values".
+
+        See "clip_planes.clip_values_equal" for the tolerance. Cameras whose
+        values were not read always differ.
+
+        :param clip_values: Values for every camera, or one pair per camera.
+        :param tolerance: Largest relative difference considered equal.
+
+        :return: A bool per camera, to pass to "compress".
+
+        """
+        if isinstance(clip_values, ClipPair):
+            clip_values = repeat(clip_values)
+
+        return [
+            not clip_values_equal(current, target, tolerance)
+            for current, target in zip(zip(self.near, self.far), clip_values)
+        ]
+
+    # Set algebra
+
+    def union(self, other):
+        # type: (Iterable[Str]) -> CameraSet
+        """
+        Return the cameras of this set, then those of "other" not in it.
+        """
+        other = _as_camera_set(other)
+        index = self.index
+        mask = [path not in index for path in other.paths]
+        added = other.compress(mask)
+        return self._from_unique(self.paths + added.paths, self.near + added.near, self.far + added.far)
+
+    def difference(self, other):
+        # type: (Iterable[Str]) -> CameraSet
+        """
+        Return the cameras of this set that are not in "other".
+        """
+        other_index = _as_camera_set(other).index
+        return self.compress(path not in other_index for path in self.paths)
+
+    def intersection(self, other):
+        # type: (Iterable[Str]) -> CameraSet
+        """
+        Return the cameras of this set that are also in "other".
+        """
+        other_index = _as_camera_set(other).index
+        return self.compress(path in other_index for path in self.paths)
+
+    __or__ = union
+    __sub__ = difference
+    __and__ = intersection
+
+    # Bulk read and write
+
+    def read_clip_values(self):
+        # type: () -> CameraSet
+        """
+        Read the clip values of every camera from the scene, in one pass.
+
+        :return: This set, to chain calls.
+
+        """
+        values = get_cameras_clip_values(self.paths)
+        self.near = array("d", [near for near, _ in values])
+        self.far = array("d", [far for _, far in values])
+        return self
+
+    def write_clip_values(self, clip_values):
+        # type: (Union[ClipPair, Sequence[ClipPair]]) -> int
+        """
+        Set the clip values of every camera, as one undo step.
+
+        :param clip_values: Values for every camera, or one pair per camera.
+
+        :return: Number of cameras written.
+
+        """
+        if isinstance(clip_values, ClipPair):
+            near, far = float(clip_values.near), float(clip_values.far)
+            self.near = array("d", [near]) * len(self.paths)
+            self.far = array("d", [far]) * len(self.paths)
+        else:
+            self.near = array("d", [near for near, _ in clip_values])
+            self.far = array("d", [far for _, far in clip_values])
+
+        written = set_cameras_clip_values(self.paths, zip(self.near, self.far))
+        if written < len(self.paths):
+            # Cameras that failed keep their values
+            self.read_clip_values()
+        return written
+
+
+def _unread(count):
+    # type: (int) -> Tuple[array, array]
+    return array("d", [UNREAD]) * count, array("d", [UNREAD]) * count
+
+
+def _as_camera_set(cameras):
+    # type: (Iterable[Str]) -> CameraSet
+    if isinstance(cameras, CameraSet):
+        return cameras
+    return CameraSet(cameras)
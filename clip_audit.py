@@ -0,0 +1,344 @@
+# coding=utf-8
+"""
+Audit of the depth buffer precision given by camera clip planes.
+
+A perspective depth buffer spends most of its precision close to the near
+plane: the smallest depth difference it resolves at distance "z" is about
+"z^2 * (far - near) / (far * near * 2^bits)". A tiny near clip plane, like
+0.001 with a far of 50000, leaves objects a few meters away z-fighting.
+
+The resolution is computed for every camera and audited distance in one
+NumPy pass, for 24-bit fixed point and 32-bit float depth buffers. Cameras
+whose resolution, relative to the distance, is worse than
+"max_relative_error" at an audited distance are flagged, with a suggested
+near clip plane. The report rows are streamed as CSV or JSON.
+
+The focal length is only reported. The depth resolution at a distance does
+not depend on it, so it plays no part in the flags or the suggested near.
+
+It does not depend on Maya. Run headless over scene files for nightly
+checks, it exits with 1 when a camera is flagged:
+
+    python clip_audit.py /shows/abc/scenes -r --format csv -o audit.csv
+"""
+
+from collections import namedtuple
+from collections import OrderedDict
+import argparse
+import csv
+import json
+import logging
+import math
+import sys
+
+# Type hinting in PyCharm
+try:
+    from typing import Dict, Generator, IO, Iterable, List, Sequence, Str, Union
+except ImportError:
+    pass
+
+from clip_fit import require_numpy
+
+
+log = logging.getLogger(__name__)
+
+# Depth buffer formats: name -> (bits, floating point)
+DEPTH_FORMATS = OrderedDict([
+    ("d24", (24, False)),
+    ("d32f", (32, True)),
+])
+
+# Distances, in scene units, the precision is audited at
+DEFAULT_DISTANCES = (1.0, 10.0, 100.0, 1000.0, 10000.0)
+
+# Largest depth resolution allowed, relative to the distance
+DEFAULT_MAX_RELATIVE_ERROR = 0.01
+
+# Depth format the cameras are flagged against
+DEFAULT_DEPTH_FORMAT = "d24"
+
+# Values Maya uses for attributes not stored in scene files
+MAYA_DEFAULT_NEAR = 0.1
+MAYA_DEFAULT_FAR = 10000.0
+MAYA_DEFAULT_FOCAL_LENGTH = 35.0
+
+FORMAT_CSV = "csv"
+FORMAT_JSON = "json"
+
+# Camera to audit.
+#   scene: Scene file the camera comes from, empty for the open scene.
+#   focal_length: In millimeters, None if unknown. Reported only.
+AuditCamera = namedtuple("AuditCamera", "scene name near far orthographic focal_length")
+
+
+def depth_resolution(near, far, orthographic, distances, depth_format=DEFAULT_DEPTH_FORMAT):
+    # type: (np.ndarray, np.ndarray, np.ndarray, Sequence[float], Str) -> np.ndarray
+    """
+    Return the smallest depth difference resolved at each distance, per camera.
+
+    :param near: Near clip plane per camera.
+    :param far: Far clip plane per camera.
+    :param orthographic: Orthographic flag per camera, with a linear depth.
+    :param distances: Distances from the camera to audit.
+    :param depth_format: Key of "DEPTH_FORMATS".
+
+    :return: Array of cameras x distances, NaN for distances outside the
+        clip planes.
+
+    """
+    np = require_numpy()
+    bits, floating = DEPTH_FORMATS[depth_format]
+
+    n = np.asarray(near, dtype=np.float64)[:, None]
+    f = np.asarray(far, dtype=np.float64)[:, None]
+    ortho = np.asarray(orthographic, dtype=bool)[:, None]
+    z = np.asarray(distances, dtype=np.float64)[None, :]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Depth in [0, 1] and its derivative, as written by a standard projection
+        depth = np.where(ortho, (z - n) / (f - n), f / (f - n) * (1.0 - n / z))
+        slope = np.where(ortho, 1.0 / (f - n), f * n / ((f - n) * z * z))
+
+        if floating:
+            # Spacing of float32 values around the stored depth
+            step = np.spacing(np.clip(depth, 0.0, 1.0).astype(np.float32)).astype(np.float64)
+        else:
+            step = np.full(depth.shape, 1.0 / (2 ** bits))
+
+        resolution = step / slope
+
+    outside = (z < n) | (z > f) | ~(f > n)
+    resolution[outside] = np.nan
+    return resolution
+
+
+def suggest_near(far, distance, max_relative_error=DEFAULT_MAX_RELATIVE_ERROR, depth_format=DEFAULT_DEPTH_FORMAT):
+    # type: (float, float, float, Str) -> float
+    """
+    Return the smallest near clip plane, rounded up to one significant
+    digit, resolving "distance" within "max_relative_error" on a
+    perspective camera.
+    """
+    bits, _ = DEPTH_FORMATS[depth_format]
+    near = distance * far / (max_relative_error * far * (2 ** bits) + distance)
+    magnitude = 10 ** math.floor(math.log10(near))
+    return math.ceil(near / magnitude) * magnitude
+
+
+def audit_cameras(cameras, distances=DEFAULT_DISTANCES, max_relative_error=DEFAULT_MAX_RELATIVE_ERROR,
+                  depth_format=DEFAULT_DEPTH_FORMAT):
+    # type: (Sequence[AuditCamera], Sequence[float], float, Str) -> Generator[OrderedDict]
+    """
+    Audit the depth precision of the cameras.
+
+    The resolutions of every camera are computed in one pass, then a report
+    row is yielded per camera.
+
+    :param cameras: Cameras to audit.
+    :param distances: Distances from the cameras to audit.
+    :param max_relative_error: Largest resolution allowed, relative to the distance.
+    :param depth_format: Depth format the cameras are flagged against.
+
+    :return: Report rows, see "report_fields".
+
+    """
+    np = require_numpy()
+    if not cameras:
+        return
+
+    distances = sorted(float(d) for d in distances)
+    near = np.array([cam.near for cam in cameras], dtype=np.float64)
+    far = np.array([cam.far for cam in cameras], dtype=np.float64)
+    orthographic = np.array([bool(cam.orthographic) for cam in cameras], dtype=bool)
+
+    resolutions = OrderedDict(
+        (name, depth_resolution(near, far, orthographic, distances, name)) for name in DEPTH_FORMATS)
+
+    with np.errstate(invalid="ignore"):
+        relative = resolutions[depth_format] / np.asarray(distances)[None, :]
+        worst = np.where(np.isnan(relative), -np.inf, relative).max(axis=1)
+    flagged = (worst > max_relative_error).tolist()
+    worst = np.where(np.isfinite(worst), worst, np.nan).tolist()
+
+    # Plain lists, indexing arrays per value is much slower
+    columns = []
+    for name, resolution in resolutions.items():
+        for jj, distance in enumerate(distances):
+            columns.append(("{}@{:g}".format(name, distance), resolution[:, jj].tolist()))
+
+    for ii, cam in enumerate(cameras):
+        row = OrderedDict()
+        row["scene"] = cam.scene
+        row["camera"] = cam.name
+        row["near"] = cam.near
+        row["far"] = cam.far
+        row["orthographic"] = bool(cam.orthographic)
+        row["focal_length"] = cam.focal_length
+        row["far_near_ratio"] = cam.far / cam.near if cam.near > 0 else None
+
+        for key, values in columns:
+            value = values[ii]
+            row[key] = None if value != value else value
+
+        row["worst_relative_error"] = None if worst[ii] != worst[ii] else worst[ii]
+        row["flagged"] = flagged[ii]
+
+        row["suggested_near"] = None
+        if flagged[ii] and not cam.orthographic:
+            # Resolve the farthest audited distance within the clip planes
+            audited = [d for d in distances if cam.near <= d <= cam.far]
+            if audited:
+                suggested = suggest_near(cam.far, audited[-1], max_relative_error, depth_format)
+                row["suggested_near"] = max(suggested, cam.near)
+
+        yield row
+
+
+def report_fields(distances=DEFAULT_DISTANCES):
+    # type: (Sequence[float]) -> List[Str]
+    """
+    Return the fields of the report rows, in order.
+    """
+    fields = ["scene", "camera", "near", "far", "orthographic", "focal_length", "far_near_ratio"]
+    for name in DEPTH_FORMATS:
+        fields.extend("{}@{:g}".format(name, float(d)) for d in sorted(distances))
+    fields.extend(["worst_relative_error", "flagged", "suggested_near"])
+    return fields
+
+
+# --- Report writers
+
+def write_csv(rows, stream, fields):
+    # type: (Iterable[Dict], IO, List[Str]) -> int
+    """
+    Write the report rows to "stream" as CSV, one row at a time.
+
+    :return: Number of rows written.
+
+    """
+    writer = csv.DictWriter(stream, fields)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_json(rows, stream):
+    # type: (Iterable[Dict], IO) -> int
+    """
+    Write the report rows to "stream" as a JSON list, one row at a time.
+
+    :return: Number of rows written.
+
+    """
+    count = 0
+    stream.write("[")
+    for row in rows:
+        stream.write(",\n  " if count else "\n  ")
+        stream.write(json.dumps(row))
+        count += 1
+    stream.write("\n]\n" if count else "]\n")
+    return count
+
+
+def write_report(rows, stream, report_format, distances=DEFAULT_DISTANCES):
+    # type: (Iterable[Dict], IO, Str, Sequence[float]) -> int
+    if report_format == FORMAT_JSON:
+        return write_json(rows, stream)
+    return write_csv(rows, stream, report_fields(distances))
+
+
+# --- Scene files
+
+def read_scene_cameras(path):
+    # type: (Str) -> List[AuditCamera]
+    """
+    Return the cameras created in a .ma or .mb file, without Maya.
+
+    Attributes not stored in the file get Maya's default values. Only the
+    clip planes are read from .mb files, their cameras are audited as
+    perspective cameras.
+    """
+    if path.lower().endswith(".mb"):
+        from mb_clip_planes import read_mb_clip_planes
+        return [
+            AuditCamera(
+                path, cam.name,
+                MAYA_DEFAULT_NEAR if cam.near is None else cam.near,
+                MAYA_DEFAULT_FAR if cam.far is None else cam.far,
+                False, None,
+            )
+            for cam in read_mb_clip_planes(path)
+        ]
+
+    from ma_clip_planes import read_ma_cameras
+    return [
+        AuditCamera(
+            path, cam.name,
+            MAYA_DEFAULT_NEAR if cam.near is None else cam.near,
+            MAYA_DEFAULT_FAR if cam.far is None else cam.far,
+            bool(cam.orthographic),
+            MAYA_DEFAULT_FOCAL_LENGTH if cam.focal_length is None else cam.focal_length,
+        )
+        for cam in read_ma_cameras(path)
+    ]
+
+
+def _flag_counter(rows, counts):
+    # type: (Iterable[Dict], Dict) -> Generator[Dict]
+    for row in rows:
+        counts["cameras"] += 1
+        counts["flagged"] += row["flagged"]
+        yield row
+
+
+def main(argv=None):
+    from clip_planes_batch import collect_scene_paths
+
+    parser = argparse.ArgumentParser(description="Audit the depth precision of the cameras of scene files.")
+    parser.add_argument("paths", nargs="+", help="Scene files or folders.")
+    parser.add_argument("-r", "--recursive", action="store_true", help="Search folders recursively.")
+    parser.add_argument("--format", choices=(FORMAT_CSV, FORMAT_JSON), default=FORMAT_CSV)
+    parser.add_argument("-o", "--output", help="Report file, standard output if not set.")
+    parser.add_argument("--distances", type=float, nargs="+", default=list(DEFAULT_DISTANCES),
+                        help="Distances to audit, in scene units.")
+    parser.add_argument("--max-error", type=float, default=DEFAULT_MAX_RELATIVE_ERROR,
+                        help="Largest depth resolution allowed, relative to the distance.")
+    parser.add_argument("--depth-format", choices=list(DEPTH_FORMATS), default=DEFAULT_DEPTH_FORMAT,
+                        help="Depth buffer format cameras are flagged against.")
+    parser.add_argument("--flagged-only", action="store_true", help="Only report the flagged cameras.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    def iter_rows():
+        for path, _ in collect_scene_paths(args.paths, recursive=args.recursive):
+            try:
+                cameras = read_scene_cameras(path)
+            except (IOError, ValueError) as err:
+                log.error('Unable to read "%s": %s', path, err)
+                continue
+
+            for row in audit_cameras(cameras, args.distances, args.max_error, args.depth_format):
+                if row["flagged"] or not args.flagged_only:
+                    yield row
+
+    counts = {"cameras": 0, "flagged": 0}
+    rows = _flag_counter(iter_rows(), counts)
+
+    if args.output:
+        kwargs = {"newline": ""} if sys.version_info[0] >= 3 else {}
+        mode = "w" if sys.version_info[0] >= 3 else "wb"
+        with open(args.output, mode, **kwargs) as stream:
+            write_report(rows, stream, args.format, args.distances)
+    else:
+        write_report(rows, sys.stdout, args.format, args.distances)
+
+    log.info("%d camera(s) reported, %d flagged", counts["cameras"], counts["flagged"])
+    return 1 if counts["flagged"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
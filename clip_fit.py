@@ -0,0 +1,540 @@
+# coding=utf-8
+"""
+Fit camera near/far clip planes to the geometry each camera can see, and
+count the geometry given clip planes would cut.
+
+The maths runs as NumPy batches over all cameras x all bounding boxes,
+with no Python loop per camera or per box. It does not depend on Maya.
+
+Conventions follow Maya:
+- Matrices are row-major, for row vectors: "p_camera = p_world * M".
+- Cameras look down their local -Z axis.
+"""
+
+# Type hinting in PyCharm
+try:
+    from typing import ModuleType, Sequence, Tuple
+except ImportError:
+    pass
+
+# Imported by "require_numpy" when the maths first runs, as NumPy takes
+# longer to import than the whole tool.
+np = None
+
+
+DEFAULT_MIN_NEAR = 0.01
+DEFAULT_PADDING = 0.05
+
+# Upper bound of (camera, box) pairs evaluated per batch, to cap memory use.
+BATCH_PAIRS = 1 << 20
+
+
+def require_numpy():
+    # type: () -> ModuleType
+    """
+    Import NumPy on first use.
+
+    :return: The "numpy" module.
+
+    :raise ImportError: If NumPy is not available.
+
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError('"numpy" is required to fit clip planes to the scene geometry')
+        np = numpy
+    return np
+
+
+def camera_space_planes(orthographic, half_width, half_height):
+    """
+    Return the frustum side and front planes of each camera, in camera space.
+
+    A point "p" is inside a plane "(n, d)" when "n . p + d >= 0".
+
+    :param orthographic: (C,) Bools, True for orthographic cameras.
+    :param half_width: (C,) Tangent of the half horizontal field of view for
+        perspective cameras, half the view width for orthographic ones.
+    :param half_height: (C,) Same as "half_width", vertically.
+
+    :return: Normals (C, 5, 3) and offsets (C, 5).
+
+    """
+    require_numpy()
+
+    orthographic = np.asarray(orthographic, dtype=bool)
+    half_width = np.asarray(half_width, dtype=np.float64)
+    half_height = np.asarray(half_height, dtype=np.float64)
+
+    # Perspective sides slope with depth, orthographic sides are offset.
+    slope_w = np.where(orthographic, 0.0, half_width)
+    slope_h = np.where(orthographic, 0.0, half_height)
+    offset_w = np.where(orthographic, half_width, 0.0)
+    offset_h = np.where(orthographic, half_height, 0.0)
+
+    count = len(orthographic)
+    normals = np.zeros((count, 5, 3))
+    offsets = np.zeros((count, 5))
+
+    normals[:, 0] = (0.0, 0.0, -1.0)  # In front of the camera
+
+    normals[:, 1, 0] = -1.0  # Right
+    normals[:, 2, 0] = 1.0  # Left
+    normals[:, 1:3, 2] = -slope_w[:, None]
+    offsets[:, 1:3] = offset_w[:, None]
+
+    normals[:, 3, 1] = -1.0  # Top
+    normals[:, 4, 1] = 1.0  # Bottom
+    normals[:, 3:5, 2] = -slope_h[:, None]
+    offsets[:, 3:5] = offset_h[:, None]
+
+    return normals, offsets
+
+
+def _world_space_rows(world_inverse, orthographic, half_width, half_height):
+    """
+    Return the linear functions evaluated against the boxes, in world space.
+
+    Per camera, rows 0-4 are the frustum planes and row 5 is the view depth.
+
+    :return: Normals (C, 6, 3) and offsets (C, 6).
+
+    """
+    world_inverse = np.asarray(world_inverse, dtype=np.float64).reshape(-1, 4, 4)
+    rotation = world_inverse[:, :3, :3]
+    translation = world_inverse[:, 3, :3]
+
+    normals, offsets = camera_space_planes(orthographic, half_width, half_height)
+
+    # Depth is the distance along -Z
+    depth = np.zeros((len(world_inverse), 1, 3))
+    depth[:, 0, 2] = -1.0
+    normals = np.concatenate([normals, depth], axis=1)
+    offsets = np.concatenate([offsets, np.zeros((len(world_inverse), 1))], axis=1)
+
+    # n . (p R + T) + d == (R n) . p + (n . T + d)
+    world_normals = np.einsum("cij,ckj->cki", rotation, normals)
+    world_offsets = np.einsum("ckj,cj->ck", normals, translation) + offsets
+
+    return world_normals, world_offsets
+
+
+def _morton_order(centers):
+    """
+    Return the order sorting the points along a Z-order curve, so that
+    consecutive points are close in space.
+
+    :param centers: (N, 3) Points to sort.
+
+    """
+    lo = centers.min(axis=0)
+    span = np.maximum(centers.max(axis=0) - lo, 1e-12)
+    cells = ((centers - lo) / span * 1023.0).astype(np.uint64)
+
+    def spread(bits):
+        bits = (bits | (bits << np.uint64(16))) & np.uint64(0x030000FF)
+        bits = (bits | (bits << np.uint64(8))) & np.uint64(0x0300F00F)
+        bits = (bits | (bits << np.uint64(4))) & np.uint64(0x030C30C3)
+        bits = (bits | (bits << np.uint64(2))) & np.uint64(0x09249249)
+        return bits
+
+    codes = spread(cells[:, 0]) | (spread(cells[:, 1]) << np.uint64(1)) | (spread(cells[:, 2]) << np.uint64(2))
+    return np.argsort(codes, kind="mergesort")
+
+
+class BoxClusters(object):
+    """
+    Bounding boxes grouped into spatially coherent clusters of fixed size.
+
+    Clusters let most (camera, box) pairs be accepted or rejected a whole
+    cluster at a time. Only the clusters that can hold a camera's nearest
+    or farthest visible box are then evaluated box by box.
+
+    Attributes
+    ----------
+    centers, extents: np.ndarray
+        (N, 3) Box centers and half sizes.
+    members: np.ndarray
+        (K, size) Box indices of each cluster. The last cluster is padded
+        with repeats of its last box, which do not change any min or max.
+    member_valid: np.ndarray
+        (K, size) False for the padding of the last cluster, to count boxes.
+    counts: np.ndarray
+        (K,) Number of boxes of each cluster, padding excluded.
+    member_centers, member_extents: np.ndarray
+        (K, size, 3) Box centers and half sizes of each cluster.
+    cluster_centers, cluster_extents: np.ndarray
+        (K, 3) Bounding box of each cluster.
+    spread: np.ndarray
+        (K,) Distance from each cluster center to its closest member center.
+    """
+
+    SIZE = 64
+
+    def __init__(self, bounds_min, bounds_max, size=SIZE):
+        require_numpy()
+
+        bounds_min = np.asarray(bounds_min, dtype=np.float64).reshape(-1, 3)
+        bounds_max = np.asarray(bounds_max, dtype=np.float64).reshape(-1, 3)
+        self.centers = (bounds_min + bounds_max) * 0.5
+        self.extents = (bounds_max - bounds_min) * 0.5
+
+        order = _morton_order(self.centers)
+        padding = -len(order) % size
+        order = np.concatenate([order, np.repeat(order[-1:], padding)])
+        self.members = order.reshape(-1, size)
+        self.member_valid = (np.arange(len(order)) < len(order) - padding).reshape(-1, size)
+        self.counts = self.member_valid.sum(axis=1)
+
+        # Box data laid out per cluster, so a cluster's boxes are one block
+        self.member_centers = self.centers[self.members]
+        self.member_extents = self.extents[self.members]
+
+        members_min = bounds_min[self.members].min(axis=1)
+        members_max = bounds_max[self.members].max(axis=1)
+        self.cluster_centers = (members_min + members_max) * 0.5
+        self.cluster_extents = (members_max - members_min) * 0.5
+
+        offsets = self.member_centers - self.cluster_centers[:, None]
+        self.spread = np.sqrt((offsets ** 2).sum(axis=2).min(axis=1))
+
+    def __len__(self):
+        return len(self.centers)
+
+
+def _row_ranges(normals, offsets, centers, extents):
+    """
+    Return the value of each row of "_world_space_rows" at the box
+    centers, and its largest change over the box: the box spans
+    center +/- radius.
+
+    :param normals: (C, 6, 3) Normals of the rows.
+    :param offsets: (C, 6) Offsets of the rows.
+    :param centers: (C, M, 3) or (M, 3) Box centers.
+    :param extents: (C, M, 3) or (M, 3) Box half sizes.
+
+    :return: Centers (C, 6, M) and radii (C, 6, M).
+
+    """
+    center = np.matmul(normals, np.swapaxes(centers, -1, -2))
+    center += offsets[:, :, None]
+    radius = np.matmul(np.abs(normals), np.swapaxes(extents, -1, -2))
+    return center, radius
+
+
+def _evaluate(normals, offsets, centers, extents, inside=False):
+    """
+    Evaluate the per camera rows of "_world_space_rows" against boxes.
+
+    :param normals: (C, 6, 3) Normals of the rows.
+    :param offsets: (C, 6) Offsets of the rows.
+    :param centers: (C, M, 3) or (M, 3) Box centers.
+    :param extents: (C, M, 3) or (M, 3) Box half sizes.
+    :param inside: Also return which boxes are fully inside the frustum.
+
+    :return: Visible (C, M) bools, depth at the centers (C, M), depth
+        radius (C, M), then inside (C, M) bools if requested.
+
+    """
+    center, radius = _row_ranges(normals, offsets, centers, extents)
+
+    planes_center = center[:, :5]
+    planes_radius = radius[:, :5]
+    result = (
+        (planes_center + planes_radius).min(axis=1) >= 0.0,
+        center[:, 5],
+        radius[:, 5],
+    )
+    if inside:
+        result += ((planes_center - planes_radius).min(axis=1) >= 0.0,)
+    return result
+
+
+def transform_bounds(bounds_min, bounds_max, matrices):
+    # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """
+    Return the world bounding boxes of local bounding boxes.
+
+    :param bounds_min: (N, 3) Local bounding box minimums.
+    :param bounds_max: (N, 3) Local bounding box maximums.
+    :param matrices: (N, 4, 4) World matrix of each box.
+
+    :return: World bounding box minimums (N, 3) and maximums (N, 3).
+
+    """
+    require_numpy()
+
+    bounds_min = np.asarray(bounds_min, dtype=np.float64).reshape(-1, 3)
+    bounds_max = np.asarray(bounds_max, dtype=np.float64).reshape(-1, 3)
+    matrices = np.asarray(matrices, dtype=np.float64).reshape(-1, 4, 4)
+
+    centers = (bounds_min + bounds_max) * 0.5
+    extents = (bounds_max - bounds_min) * 0.5
+
+    # The world extent along an axis sums the local extents projected on it
+    world_centers = np.einsum("ni,nij->nj", centers, matrices[:, :3, :3]) + matrices[:, 3, :3]
+    world_extents = np.einsum("ni,nij->nj", extents, np.abs(matrices[:, :3, :3]))
+
+    return world_centers - world_extents, world_centers + world_extents
+
+
+def fit_clip_planes(world_inverse, orthographic, half_width, half_height,
+                    bounds_min, bounds_max, min_near=DEFAULT_MIN_NEAR,
+                    padding=DEFAULT_PADDING):
+    # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """
+    Return the tightest near/far clip planes containing the visible boxes.
+
+    A box counts as visible to a camera if it is not fully outside any of
+    the camera's frustum side planes, or fully behind it.
+
+    :param world_inverse: (C, 4, 4) World inverse matrix of each camera.
+    :param orthographic: (C,) Bools, True for orthographic cameras.
+    :param half_width: (C,) See "camera_space_planes".
+    :param half_height: (C,) See "camera_space_planes".
+    :param bounds_min: (N, 3) World bounding box minimums, or "BoxClusters"
+        built from them, to reuse across calls.
+    :param bounds_max: (N, 3) World bounding box maximums, unused when
+        "bounds_min" is "BoxClusters".
+    :param min_near: Lowest near clip plane value to return.
+    :param padding: Ratio the planes are pushed out by, so geometry
+        touching them is not clipped.
+
+    :return: Near (C,) and far (C,) arrays, NaN for cameras seeing no box.
+
+    """
+    require_numpy()
+
+    normals, offsets = _world_space_rows(world_inverse, orthographic, half_width, half_height)
+    camera_count = len(normals)
+
+    near = np.full(camera_count, np.inf)
+    far = np.full(camera_count, -np.inf)
+
+    boxes = bounds_min
+    if not isinstance(boxes, BoxClusters):
+        if not camera_count or not len(bounds_min):
+            return np.full(camera_count, np.nan), np.full(camera_count, np.nan)
+        boxes = BoxClusters(bounds_min, bounds_max)
+
+    cluster_size = boxes.members.shape[1]
+    # Depth changes by at most "depth_scale" per unit of world distance.
+    depth_scale = np.sqrt((normals[:, 5] ** 2).sum(axis=1))
+
+    camera_batch = max(1, BATCH_PAIRS // len(boxes.members))
+    for start in range(0, camera_count, camera_batch):
+        stop = min(start + camera_batch, camera_count)
+        batch_normals = normals[start:stop]
+        batch_offsets = offsets[start:stop]
+
+        visible, depth, radius, inside = _evaluate(
+            batch_normals, batch_offsets, boxes.cluster_centers, boxes.cluster_extents,
+            inside=True)
+
+        # Every box of a cluster fully inside the frustum is visible, and one
+        # of them is within "spread" of the cluster center. That bounds the
+        # nearest and farthest visible depths before looking at any box.
+        slack = boxes.spread[None, :] * depth_scale[start:stop, None]
+        near_bound = np.where(inside, depth + slack, np.inf).min(axis=1)
+        far_bound = np.where(inside, depth - slack, -np.inf).max(axis=1)
+
+        candidates = visible & (
+            (depth - radius <= near_bound[:, None]) |
+            (depth + radius >= far_bound[:, None])
+        )
+        cameras, clusters = np.nonzero(candidates)
+        cameras += start
+
+        pair_batch = max(1, BATCH_PAIRS // cluster_size)
+        for pair_start in range(0, len(cameras), pair_batch):
+            pair_cameras = cameras[pair_start:pair_start + pair_batch]
+            pair_clusters = clusters[pair_start:pair_start + pair_batch]
+
+            visible, depth, radius = _evaluate(
+                normals[pair_cameras], offsets[pair_cameras],
+                boxes.member_centers[pair_clusters], boxes.member_extents[pair_clusters])
+
+            pair_near = np.where(visible, depth - radius, np.inf).min(axis=1)
+            pair_far = np.where(visible, depth + radius, -np.inf).max(axis=1)
+
+            # Pairs are sorted by camera, reduce each camera's run of pairs
+            runs = np.flatnonzero(np.diff(pair_cameras, prepend=-1))
+            run_cameras = pair_cameras[runs]
+            near[run_cameras] = np.minimum(near[run_cameras], np.minimum.reduceat(pair_near, runs))
+            far[run_cameras] = np.maximum(far[run_cameras], np.maximum.reduceat(pair_far, runs))
+
+    seen = np.isfinite(near)
+    near = np.where(seen, near, np.nan)
+    far = np.where(seen, far, np.nan)
+
+    near = np.maximum(near * (1.0 - padding), min_near)
+    far = np.maximum(far * (1.0 + padding), near * (1.0 + padding))
+
+    return near, far
+
+
+def count_clipped(world_inverse, orthographic, half_width, half_height,
+                  bounds_min, bounds_max, near, far):
+    # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """
+    Count, per camera, the visible boxes its clip planes would cut.
+
+    A box is visible as for "fit_clip_planes". A visible box is clipped
+    when its depth range is fully nearer than the near clip plane or
+    farther than the far one, and partially clipped when it crosses either.
+
+    Clusters fully inside a camera's frustum and fully clipped are counted
+    whole. Clusters that are invisible, or that no clip plane can cut, are
+    skipped. The boxes of the remaining clusters are evaluated one cluster
+    at a time, against all the cameras that need them in one product.
+
+    :param world_inverse: (C, 4, 4) World inverse matrix of each camera.
+    :param orthographic: (C,) Bools, True for orthographic cameras.
+    :param half_width: (C,) See "camera_space_planes".
+    :param half_height: (C,) See "camera_space_planes".
+    :param bounds_min: (N, 3) World bounding box minimums, or "BoxClusters"
+        built from them, to reuse across calls.
+    :param bounds_max: (N, 3) World bounding box maximums, unused when
+        "bounds_min" is "BoxClusters".
+    :param near: (C,) Near clip plane of each camera, or one for all.
+    :param far: (C,) Far clip plane of each camera, or one for all.
+
+    :return: Clipped (C,) and partially clipped (C,) box counts.
+
+    """
+    require_numpy()
+
+    normals, offsets = _world_space_rows(world_inverse, orthographic, half_width, half_height)
+    camera_count = len(normals)
+    near = np.broadcast_to(np.asarray(near, dtype=np.float64).reshape(-1), (camera_count,))
+    far = np.broadcast_to(np.asarray(far, dtype=np.float64).reshape(-1), (camera_count,))
+
+    clipped_count = np.zeros(camera_count, dtype=np.int64)
+    partial_count = np.zeros(camera_count, dtype=np.int64)
+
+    if not camera_count:
+        return clipped_count, partial_count
+
+    boxes = bounds_min
+    if not isinstance(boxes, BoxClusters):
+        if not len(bounds_min):
+            return clipped_count, partial_count
+        boxes = BoxClusters(bounds_min, bounds_max)
+
+    pair_cameras = []
+    pair_clusters = []
+
+    camera_batch = max(1, BATCH_PAIRS // len(boxes.members))
+    for start in range(0, camera_count, camera_batch):
+        stop = min(start + camera_batch, camera_count)
+
+        center, radius = _row_ranges(
+            normals[start:stop], offsets[start:stop], boxes.cluster_centers, boxes.cluster_extents)
+        visible = (center[:, :5] + radius[:, :5]).min(axis=1) >= 0.0
+        inside = (center[:, :5] - radius[:, :5]).min(axis=1) >= 0.0
+
+        depth_low = center[:, 5] - radius[:, 5]
+        depth_high = center[:, 5] + radius[:, 5]
+        all_clipped = (depth_high < near[start:stop, None]) | (depth_low > far[start:stop, None])
+        none_clipped = (depth_low >= near[start:stop, None]) & (depth_high <= far[start:stop, None])
+        whole = inside & all_clipped
+
+        clipped_count[start:stop] += np.where(whole, boxes.counts, 0).sum(axis=1)
+
+        clusters, cameras = np.nonzero((visible & ~whole & ~none_clipped).T)
+        pair_clusters.append(clusters)
+        pair_cameras.append(cameras + start)
+
+    # Per camera, rows 0-4 are the highest value of the frustum planes over
+    # a box, rows 5 and 6 its lowest and highest depth: the product of the
+    # rows with the centers, half sizes and a 1 for the offset of a
+    # cluster's boxes evaluates them all at once.
+    abs_normals = np.abs(normals)
+    range_rows = np.concatenate([
+        np.concatenate([normals[:, :5], abs_normals[:, :5], offsets[:, :5, None]], axis=2),
+        np.concatenate([normals[:, 5:], -abs_normals[:, 5:], offsets[:, 5:, None]], axis=2),
+        np.concatenate([normals[:, 5:], abs_normals[:, 5:], offsets[:, 5:, None]], axis=2),
+    ], axis=1).transpose(1, 0, 2).copy()
+    member_boxes = np.concatenate([
+        boxes.member_centers, boxes.member_extents, np.ones(boxes.members.shape + (1,))
+    ], axis=2).transpose(0, 2, 1).copy()
+
+    # Pairs sorted by cluster, each cluster's run of cameras is one product
+    pair_clusters = np.concatenate(pair_clusters)
+    order = np.argsort(pair_clusters, kind="mergesort")
+    pair_clusters = pair_clusters[order]
+    pair_cameras = np.concatenate(pair_cameras)[order]
+    pair_clipped = np.zeros(len(pair_cameras), dtype=np.int64)
+    pair_crossing = np.zeros(len(pair_cameras), dtype=np.int64)
+
+    cluster_size = boxes.members.shape[1]
+    runs = np.flatnonzero(np.diff(pair_clusters, prepend=-1))
+    for run_start, run_stop in zip(runs, np.append(runs[1:], len(pair_clusters))):
+        cluster = pair_clusters[run_start]
+        cameras = pair_cameras[run_start:run_stop]
+
+        values = np.dot(range_rows[:, cameras].reshape(-1, 7), member_boxes[cluster])
+        values = values.reshape(7, len(cameras), -1)
+        low = values[5]
+        high = values[6]
+
+        visible = np.minimum(np.minimum(values[0], values[1]), np.minimum(values[2], values[3]))
+        visible = np.minimum(visible, values[4], out=visible) >= 0.0
+        if boxes.counts[cluster] < cluster_size:
+            visible &= boxes.member_valid[cluster]
+
+        run_near = near[cameras, None]
+        run_far = far[cameras, None]
+        clipped = high < run_near
+        clipped |= low > run_far
+        clipped &= visible
+        # Boxes crossing or beyond a clip plane, the clipped ones included
+        crossing = low < run_near
+        crossing |= high > run_far
+        crossing &= visible
+        pair_clipped[run_start:run_stop] = np.count_nonzero(clipped, axis=1)
+        pair_crossing[run_start:run_stop] = np.count_nonzero(crossing, axis=1)
+
+    pair_partial = pair_crossing - pair_clipped
+    clipped_count += np.bincount(pair_cameras, weights=pair_clipped, minlength=camera_count).astype(np.int64)
+    partial_count += np.bincount(pair_cameras, weights=pair_partial, minlength=camera_count).astype(np.int64)
+
+    return clipped_count, partial_count
+
+
+def clip_masks(world_inverse, orthographic, half_width, half_height,
+               bounds_min, bounds_max, near, far):
+    # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """
+    Return which boxes each camera's clip planes would cut, as counted by
+    "count_clipped".
+
+    Every box is evaluated against every camera, so keep to a few cameras.
+    "bounds_min" can be "BoxClusters", the boxes keep their original order.
+
+    :return: Clipped and partially clipped bools, (C, N) each.
+
+    """
+    require_numpy()
+
+    normals, offsets = _world_space_rows(world_inverse, orthographic, half_width, half_height)
+    camera_count = len(normals)
+    near = np.broadcast_to(np.asarray(near, dtype=np.float64).reshape(-1), (camera_count,))[:, None]
+    far = np.broadcast_to(np.asarray(far, dtype=np.float64).reshape(-1), (camera_count,))[:, None]
+
+    if isinstance(bounds_min, BoxClusters):
+        centers = bounds_min.centers
+        extents = bounds_min.extents
+    else:
+        bounds_min = np.asarray(bounds_min, dtype=np.float64).reshape(-1, 3)
+        bounds_max = np.asarray(bounds_max, dtype=np.float64).reshape(-1, 3)
+        centers = (bounds_min + bounds_max) * 0.5
+        extents = (bounds_max - bounds_min) * 0.5
+
+    visible, depth, radius = _evaluate(normals, offsets, centers, extents)
+    clipped = visible & ((depth + radius < near) | (depth - radius > far))
+    partial = visible & ~clipped & ((depth - radius < near) | (depth + radius > far))
+    return clipped, partial
@@ -0,0 +1,37 @@
+# coding=utf-8
+"""
+Clip plane values shared by the Maya tool, the scene file processors and
+the batch tools. It does not depend on Maya.
+"""
+
+from collections import namedtuple
+
+
+DEFAULT_CLIP_PLANE_NEAR = 1.0
+DEFAULT_CLIP_PLANE_FAR = 50000.0
+
+# Convenience object for containing  near and far clip plane values
+ClipPair = namedtuple("ClipPair", "near far")
+
+# Clip values closer than this, relative to their magnitude, are considered equal
+CLIP_VALUE_TOLERANCE = 1e-6
+
+
+def clip_values_equal(current, target, tolerance=CLIP_VALUE_TOLERANCE):
+    # type: (ClipPair, ClipPair, float) -> bool
+    """
+    Return if two pairs of clip values are equal within "tolerance".
+
+    :param current: (near, far) values to compare.
+    :param target: (near, far) values to compare with.
+    :param tolerance: Largest difference considered equal, relative to the
+        magnitude of the target values, and absolute below 1.
+
+    :return: If both the near and far values are equal, False when a value is NaN.
+
+    """
+    for value, target_value in zip(current, target):
+        # "not <=" so NaN values are never equal
+        if not abs(value - target_value) <= tolerance * max(1.0, abs(target_value)):
+            return False
+    return True
@@ -0,0 +1,497 @@
+# coding=utf-8
+"""
+Headless batch reset of camera clip planes over scene files.
+
+Scenes are processed on a pool of worker processes. Each file has its own
+timeout: a worker stuck on a file is killed and replaced, and the batch
+goes on. Every finished file is appended to a journal with the options it
+was processed with, so an interrupted run resumes without redoing the files
+already done with the same options.
+
+Maya ASCII files are rewritten directly by "ma_clip_planes", and Maya binary
+files patched in place by "mb_clip_planes", without Maya. Binary scenes with
+a clip plane at its default value, not stored in the file, are reported as
+"missing" and need "--maya". With "--maya", every worker starts "maya.standalone" once and opens, resets
+and saves each scene with the same functions as the tool's "all" mode.
+
+Example:
+
+    python clip_planes_batch.py /shows/abc/scenes -r --workers 8 --journal abc.journal
+    mayapy clip_planes_batch.py /shows/abc/scenes -r --maya --timeout 1800
+"""
+
+from collections import Counter
+from collections import deque
+from collections import namedtuple
+import argparse
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+# Type hinting in PyCharm
+try:
+    from typing import Callable, Dict, Int, Iterable, List, Set, Str, Tuple, Union
+except ImportError:
+    pass
+
+from clip_planes import ClipPair
+from clip_planes import DEFAULT_CLIP_PLANE_FAR
+from clip_planes import DEFAULT_CLIP_PLANE_NEAR
+
+
+log = logging.getLogger(__name__)
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMEOUT = "timeout"
+
+DEFAULT_TIMEOUT = 600.0
+
+# Seconds between two polls of the workers for results and timeouts
+POLL_INTERVAL = 0.05
+
+# A scene to process, "dst_path" is where the result is saved.
+BatchTask = namedtuple("BatchTask", "path dst_path")
+
+# Outcome of a scene.
+#   detail: Dict of counts from the processor, or the error message.
+BatchResult = namedtuple("BatchResult", "path status seconds detail")
+
+
+# --- Processors
+#
+# A processor is built once per worker from the batch options, then called
+# with (path, dst_path) for each scene. It returns a dict of counts.
+
+def _file_processor(options):
+    # type: (Dict) -> Callable[[Str, Str], Dict]
+    from ma_clip_planes import rewrite_ma_file
+    from mb_clip_planes import patch_mb_file
+
+    clip_values = ClipPair(options["near"], options["far"])
+
+    def process(path, dst_path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".ma":
+            result = rewrite_ma_file(path, clip_values, dst_path=dst_path)
+        elif extension == ".mb":
+            result = patch_mb_file(path, clip_values, dst_path=dst_path)
+        else:
+            raise ValueError('Unsupported scene file "%s", use --maya' % path)
+        return dict(result._asdict())
+
+    return process
+
+
+def _maya_processor(options):
+    # type: (Dict) -> Callable[[Str, Str], Dict]
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+
+    import maya.cmds as mc
+    from maya_cameras import get_all_cameras
+    from maya_cameras import set_cameras_clip_plane
+
+    near = float(options["near"])
+    far = float(options["far"])
+
+    def process(path, dst_path):
+        mc.file(path, open=True, force=True)
+        cameras = get_all_cameras()
+        written = set_cameras_clip_plane(cameras, near, far)
+        if os.path.abspath(dst_path) != os.path.abspath(path):
+            mc.file(rename=dst_path)
+        mc.file(save=True, force=True)
+        return {"cameras": len(cameras), "written": written}
+
+    return process
+
+
+def make_processor(options):
+    # type: (Dict) -> Callable[[Str, Str], Dict]
+    """
+    Return the scene processor for the batch options.
+
+    :param options: Batch options, as given to "run_batch".
+
+    :return: Callable taking (path, dst_path), returning a dict of counts.
+
+    """
+    if options.get("maya"):
+        return _maya_processor(options)
+    return _file_processor(options)
+
+
+# --- Workers
+
+def _worker_main(conn, options):
+    """
+    Worker process loop: receive tasks, process them, send results back.
+    """
+    processor = make_processor(options)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+
+        start = time.time()
+        try:
+            detail = processor(task.path, task.dst_path)
+            status = STATUS_OK
+        except Exception as err:
+            detail = "{}: {}".format(err.__class__.__name__, err)
+            status = STATUS_FAILED
+        conn.send(BatchResult(task.path, status, time.time() - start, detail))
+
+
+class _Worker(object):
+    """
+    A worker process, with the task it is busy with.
+
+    Each worker has its own pipe, so killing one on timeout cannot corrupt
+    the channel of the others.
+    """
+
+    def __init__(self, options):
+        self._options = options
+        self.process = None
+        self.conn = None
+        self.task = None  # type: Union[BatchTask, None]
+        self.started = 0.0
+        self.start()
+
+    def start(self):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main, args=(child_conn, self._options))
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+
+    def restart(self):
+        self.process.terminate()
+        self.process.join()
+        self.conn.close()
+        self.task = None
+        self.start()
+
+    def assign(self, task):
+        # type: (BatchTask) -> None
+        self.task = task
+        self.started = time.time()
+        self.conn.send(task)
+
+    def stop(self):
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (IOError, OSError):
+                pass
+            self.process.join(1.0)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+        self.conn.close()
+
+
+# --- Journal
+
+def journal_options(task, options):
+    # type: (BatchTask, Dict) -> Dict
+    """
+    Return the options a scene is processed with, as recorded in the journal.
+
+    :param task: Scene to process.
+    :param options: Batch options, as given to "run_batch".
+
+    :return: Clip values, processor and destination of the scene.
+
+    """
+    return {
+        "near": float(options["near"]),
+        "far": float(options["far"]),
+        "maya": bool(options.get("maya")),
+        "dst_path": os.path.abspath(task.dst_path),
+    }
+
+
+def load_journal(journal_path):
+    # type: (Str) -> Dict[Str, Dict]
+    """
+    Return the scenes recorded as done in a journal, with their options.
+
+    :param journal_path: Path of the journal, missing files are fine.
+
+    :return: Options per absolute path whose latest journal entry is
+        successful. Entries written without options map to None.
+
+    """
+    entries = {}
+    if not journal_path or not os.path.exists(journal_path):
+        return {}
+
+    with io.open(journal_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line of an interrupted run can be partial
+                continue
+            entries[entry["path"]] = entry
+
+    return dict(
+        (path, entry.get("options")) for path, entry in entries.items()
+        if entry["status"] == STATUS_OK
+    )
+
+
+class _Journal(object):
+
+    def __init__(self, journal_path):
+        self._file = None
+        if journal_path:
+            self._file = io.open(journal_path, "a", encoding="utf-8")
+
+    def record(self, result, options):
+        # type: (BatchResult, Dict) -> None
+        """
+        :param result: Outcome of a scene.
+        :param options: Options the scene was processed with, see "journal_options".
+        """
+        if self._file is None:
+            return
+        entry = dict(result._asdict())
+        entry["options"] = options
+        line = json.dumps(entry, sort_keys=True)
+        self._file.write(u"{}\n".format(line))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+# --- Batch
+
+def collect_scene_paths(paths, recursive=False, extensions=(".ma", ".mb")):
+    # type: (Iterable[Str], bool, Iterable[Str]) -> List[Tuple[Str, Str]]
+    """
+    Expand the given files and directories into the scene files to process.
+
+    :param paths: Scene files and directories of scene files.
+    :param recursive: Also collect scenes in sub directories.
+    :param extensions: Lower case extensions of the scene files to collect.
+
+    :return: (absolute path, path relative to the given root) per scene.
+
+    """
+    extensions = tuple(extensions)
+    scenes = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if not os.path.isdir(path):
+            scenes.append((path, os.path.basename(path)))
+            continue
+
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            if not recursive:
+                del dirs[:]
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    file_path = os.path.join(root, name)
+                    scenes.append((file_path, os.path.relpath(file_path, path)))
+
+    return scenes
+
+
+def _remove_partial_outputs(task, options):
+    # type: (BatchTask, Dict) -> None
+    """
+    Remove the temporary files of a scene whose worker was killed.
+    """
+    if options.get("maya"):
+        return
+
+    from ma_clip_planes import partial_output_paths
+    for path in partial_output_paths(task.dst_path):
+        try:
+            os.remove(path)
+        except OSError as err:
+            log.warning('Unable to remove "%s": %s', path, err)
+
+
+def run_batch(tasks, options, workers=None, timeout=DEFAULT_TIMEOUT, journal_path=None,
+              on_result=None):
+    # type: (Iterable[BatchTask], Dict, Int, float, Str, Callable[[BatchResult], None]) -> List[BatchResult]
+    """
+    Process scenes on a pool of worker processes.
+
+    :param tasks: Scenes to process.
+    :param options: Batch options given to "make_processor": "near", "far"
+        and "maya".
+    :param workers: Number of worker processes, the CPU count if None.
+    :param timeout: Seconds a single scene may take before its worker is
+        killed, no limit if None.
+    :param journal_path: Journal to skip the scenes already done with the
+        same clip values, processor and destination, and to record the
+        finished ones.
+    :param on_result: Optional callable called with each result.
+
+    :return: Results of the scenes processed, not including skipped ones.
+
+    """
+    tasks = list(tasks)
+    done = load_journal(journal_path)
+    pending = deque(
+        task for task in tasks
+        if task.path not in done or done[task.path] != journal_options(task, options)
+    )
+    if len(pending) < len(tasks):
+        log.info("Resuming, skipping %d scene(s) already done in the journal", len(tasks) - len(pending))
+
+    results = []
+    if not pending:
+        return results
+
+    worker_count = min(workers or multiprocessing.cpu_count(), len(pending))
+    pool = [_Worker(options) for _ in range(worker_count)]
+    journal = _Journal(journal_path)
+
+    def finish(worker, task, result):
+        journal.record(result, journal_options(task, options))
+        worker.task = None
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    try:
+        while pending or any(worker.task for worker in pool):
+            for worker in pool:
+                if worker.task is None and pending:
+                    worker.assign(pending.popleft())
+
+            time.sleep(POLL_INTERVAL)
+            now = time.time()
+
+            for worker in pool:
+                task = worker.task
+                if task is None:
+                    continue
+
+                if worker.conn.poll():
+                    try:
+                        finish(worker, task, worker.conn.recv())
+                    except EOFError:
+                        pass
+                    else:
+                        continue
+
+                if not worker.process.is_alive():
+                    result = BatchResult(task.path, STATUS_FAILED, now - worker.started,
+                                         "Worker exited with code {}".format(worker.process.exitcode))
+                    worker.restart()
+                    _remove_partial_outputs(task, options)
+                    finish(worker, task, result)
+
+                elif timeout is not None and now - worker.started > timeout:
+                    result = BatchResult(task.path, STATUS_TIMEOUT, now - worker.started,
+                                         "Timed out after {:.0f}s".format(timeout))
+                    worker.restart()
+                    _remove_partial_outputs(task, options)
+                    finish(worker, task, result)
+
+    finally:
+        for worker in pool:
+            worker.stop()
+        journal.close()
+
+    return results
+
+
+def summarize(results):
+    # type: (List[BatchResult]) -> Dict
+    """
+    Return the counts of a batch, per status and in total.
+    """
+    counts = Counter(result.status for result in results)
+    return {
+        "scenes": len(results),
+        "ok": counts[STATUS_OK],
+        "failed": counts[STATUS_FAILED],
+        "timeout": counts[STATUS_TIMEOUT],
+        "seconds": sum(result.seconds for result in results),
+        "failures": [dict(result._asdict()) for result in results if result.status != STATUS_OK],
+        # Binary scenes with clip planes that could not be patched without Maya
+        "incomplete": [
+            result.path for result in results
+            if result.status == STATUS_OK and result.detail.get("missing")
+        ],
+    }
+
+
+def _dst_path(path, relative_path, output_dir):
+    if not output_dir:
+        return path
+    dst_path = os.path.join(os.path.abspath(output_dir), relative_path)
+    if not os.path.isdir(os.path.dirname(dst_path)):
+        os.makedirs(os.path.dirname(dst_path))
+    return dst_path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Scene files or directories of scene files.")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="Also process scenes in sub directories.")
+    parser.add_argument("--near", type=float, default=DEFAULT_CLIP_PLANE_NEAR)
+    parser.add_argument("--far", type=float, default=DEFAULT_CLIP_PLANE_FAR)
+    parser.add_argument("--maya", action="store_true",
+                        help="Process scenes in maya.standalone, needed for .mb files "
+                             "with clip planes at their default value.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes, defaults to the CPU count.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="Seconds a single scene may take, 0 for no limit.")
+    parser.add_argument("--journal", help="Journal file used to resume an interrupted run.")
+    parser.add_argument("--output-dir", help="Save the scenes there instead of in place.")
+    parser.add_argument("--json", help="Write the summary to this file.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    tasks = [
+        BatchTask(path, _dst_path(path, relative_path, args.output_dir))
+        for path, relative_path in collect_scene_paths(args.paths, args.recursive)
+    ]
+    options = {"near": args.near, "far": args.far, "maya": args.maya}
+
+    def report(result):
+        log.info("[%s] %s (%.2fs) %s", result.status, result.path, result.seconds, result.detail)
+
+    results = run_batch(
+        tasks, options, workers=args.workers, timeout=args.timeout or None,
+        journal_path=args.journal, on_result=report,
+    )
+
+    summary = summarize(results)
+    summary["skipped"] = len(tasks) - len(results)
+    log.info("%(scenes)d scene(s) processed: %(ok)d ok, %(failed)d failed, "
+             "%(timeout)d timed out, %(skipped)d skipped from the journal", summary)
+    if summary["incomplete"]:
+        log.warning("%d binary scene(s) have clip planes not stored in the file, "
+                    "process them again with --maya", len(summary["incomplete"]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    return 1 if summary["failed"] or summary["timeout"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,293 @@
+# coding=utf-8
+"""
+Clip preview dialog, listing per camera how much visible geometry the clip
+values of the next Apply would cut, before anything is written.
+
+The counts come from "MayaResetCameraClipPlanes.preview_clip_values". The
+table sorts its rows in the model in one "list.sort", rather than through a
+"QSortFilterProxyModel" calling back into Python per comparison.
+
+"Highlight in Viewport" selects the geometry the current camera cuts, so
+Maya draws it highlighted, and puts the previous selection back when
+unchecked or when the dialog closes. Nothing in the scene is edited.
+"""
+
+import logging
+
+# Type hinting in PyCharm
+try:
+    from typing import Callable, List, Str, Union
+except ImportError:
+    pass
+
+import maya.cmds as mc
+
+from camera_browser import camera_name
+
+# Qt imports
+from PySide2 import QtCore
+from PySide2 import QtWidgets
+
+
+log = logging.getLogger(__name__)
+
+
+class ClipPreviewModel(QtCore.QAbstractTableModel):
+    """
+    Table of a "ClipPreview": camera name, clip values, geometry fully and
+    partially clipped, and full path.
+    """
+
+    COLUMNS = ("Camera", "Near", "Far", "Clipped", "Partial", "Path")
+    NAME_COLUMN, NEAR_COLUMN, FAR_COLUMN, CLIPPED_COLUMN, PARTIAL_COLUMN, PATH_COLUMN = range(6)
+
+    NUMBER_COLUMNS = (NEAR_COLUMN, FAR_COLUMN, CLIPPED_COLUMN, PARTIAL_COLUMN)
+
+    def __init__(self, parent=None):
+        super(ClipPreviewModel, self).__init__(parent)
+        self._preview = None  # type: Union[ClipPreview, None]
+        # Row of "preview" shown at each row of the table
+        self._order = []  # type: List[int]
+        self._sort_column = self.CLIPPED_COLUMN
+        self._sort_order = QtCore.Qt.DescendingOrder
+
+    @property
+    def preview(self):
+        # type: () -> Union[ClipPreview, None]
+        return self._preview
+
+    def set_preview(self, preview):
+        # type: (Union[ClipPreview, None]) -> None
+        self.beginResetModel()
+        self._preview = preview
+        self._order = list(range(len(preview))) if preview is not None else []
+        self._sort_rows()
+        self.endResetModel()
+
+    def preview_row(self, row):
+        # type: (int) -> int
+        """
+        Return the row of "preview" shown at a row of the table.
+        """
+        return self._order[row]
+
+    def _sort_key(self, column):
+        # type: (int) -> Callable[[int], object]
+        preview = self._preview
+        if column == self.NAME_COLUMN:
+            return lambda row: camera_name(preview.cameras.paths[row]).lower()
+        if column == self.NEAR_COLUMN:
+            return lambda row: float(preview.clip_values[row].near)
+        if column == self.FAR_COLUMN:
+            return lambda row: float(preview.clip_values[row].far)
+        if column == self.CLIPPED_COLUMN:
+            return lambda row: (preview.clipped[row], preview.partial[row])
+        if column == self.PARTIAL_COLUMN:
+            return lambda row: (preview.partial[row], preview.clipped[row])
+        return lambda row: preview.cameras.paths[row]
+
+    def _sort_rows(self):
+        if self._preview is None:
+            return
+        self._order.sort(
+            key=self._sort_key(self._sort_column),
+            reverse=self._sort_order == QtCore.Qt.DescendingOrder,
+        )
+
+    # QAbstractTableModel
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort_column = column
+        self._sort_order = order
+        self._sort_rows()
+        self.layoutChanged.emit()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self._order[index.row()]
+        column = index.column()
+        preview = self._preview
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == self.NAME_COLUMN:
+                return camera_name(preview.cameras.paths[row])
+            if column == self.NEAR_COLUMN:
+                return "{:g}".format(float(preview.clip_values[row].near))
+            if column == self.FAR_COLUMN:
+                return "{:g}".format(float(preview.clip_values[row].far))
+            if column == self.CLIPPED_COLUMN:
+                return str(preview.clipped[row])
+            if column == self.PARTIAL_COLUMN:
+                return str(preview.partial[row])
+            return preview.cameras.paths[row]
+
+        if role == QtCore.Qt.ToolTipRole:
+            return preview.cameras.paths[row]
+
+        if role == QtCore.Qt.TextAlignmentRole and column in self.NUMBER_COLUMNS:
+            return int(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)
+
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+
+class ClipPreviewDialog(QtWidgets.QDialog):
+    """
+    Sortable table of the geometry each camera's clip values would cut.
+    """
+
+    ROW_HEIGHT = 18
+
+    def __init__(self, get_preview, parent=None):
+        # type: (Callable[[], Union[ClipPreview, None]], Union[QtWidgets.QWidget, None]) -> None
+        """
+        :param get_preview: Callable returning a new preview, None if it failed.
+        :param parent: Parent widget.
+        """
+        super(ClipPreviewDialog, self).__init__(parent)
+
+        self._get_preview = get_preview
+
+        # Selection before the geometry was highlighted, None when not highlighting
+        self._previous_selection = None  # type: Union[List[Str], None]
+
+        self._model = ClipPreviewModel(self)
+
+        # Widgets
+
+        view = QtWidgets.QTableView()
+        view.setModel(self._model)
+        view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        view.setSelectionMode(QtWidgets.QAbstractItemView.SingleSelection)
+        view.setWordWrap(False)
+        view.setShowGrid(False)
+        view.verticalHeader().hide()
+        view.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+        view.horizontalHeader().setStretchLastSection(True)
+        view.horizontalHeader().setSortIndicator(ClipPreviewModel.CLIPPED_COLUMN, QtCore.Qt.DescendingOrder)
+        view.setSortingEnabled(True)
+        self._view = view
+
+        self._summary_label = QtWidgets.QLabel()
+
+        self._highlight_check = QtWidgets.QCheckBox("Highlight in Viewport")
+        self._highlight_check.setToolTip(
+            "Select the geometry the clip values of the current camera cut, fully or partially,\n"
+            "the previous selection is restored when unchecked or when this dialog closes")
+
+        self._refresh_btn = QtWidgets.QPushButton("Refresh")
+
+        # Layout
+
+        options_layout = QtWidgets.QHBoxLayout()
+        options_layout.addWidget(self._highlight_check)
+        options_layout.addStretch()
+        options_layout.addWidget(self._refresh_btn)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(view)
+        layout.addWidget(self._summary_label)
+        layout.addLayout(options_layout)
+        self.setLayout(layout)
+
+        # Connections
+
+        self._highlight_check.toggled.connect(self._update_highlight)
+        self._refresh_btn.clicked.connect(self.refresh)
+        view.selectionModel().currentRowChanged.connect(self._update_highlight)
+
+    def refresh(self):
+        # type: () -> None
+        """
+        Preview the clip values again, with the current options of the tool.
+        """
+        self._restore_selection()
+
+        preview = self._get_preview()
+        if preview is None:
+            return
+
+        self._model.set_preview(preview)
+        self._view.resizeColumnToContents(ClipPreviewModel.NAME_COLUMN)
+
+        cutting = sum(1 for clipped, partial in zip(preview.clipped, preview.partial) if clipped or partial)
+        self._summary_label.setText("{} of {} camera(s) would clip geometry, {} geometry shape(s) counted".format(
+            cutting, len(preview), len(preview.geometry)))
+
+        if len(preview):
+            self._view.selectRow(0)
+
+    def done(self, result):
+        self._release()
+        super(ClipPreviewDialog, self).done(result)
+
+    def closeEvent(self, event):
+        self._release()
+        super(ClipPreviewDialog, self).closeEvent(event)
+
+    def _release(self):
+        # type: () -> None
+        """
+        Restore the selection, and drop the preview and the geometry bounds
+        it holds. Showing the dialog again previews anew.
+        """
+        self._restore_selection()
+        self._model.set_preview(None)
+        self._summary_label.clear()
+
+    def _current_geometry(self):
+        # type: () -> List[Str]
+        """
+        Return the geometry cut by the clip values of the current camera.
+        """
+        preview = self._model.preview
+        index = self._view.selectionModel().currentIndex()
+        if preview is None or not index.isValid():
+            return []
+
+        clipped, partial = preview.clipped_geometry(self._model.preview_row(index.row()))
+        return clipped + partial
+
+    def _update_highlight(self, *args):
+        if not self._highlight_check.isChecked():
+            self._restore_selection()
+            return
+
+        # "ls" of an empty list lists every node
+        geometry = self._current_geometry()
+        geometry = mc.ls(geometry, long=True) if geometry else []
+        if self._previous_selection is None:
+            self._previous_selection = mc.ls(selection=True, long=True) or []
+
+        if geometry:
+            mc.select(geometry, replace=True)
+        else:
+            mc.select(clear=True)
+        log.debug("Highlighted %d geometry shape(s)", len(geometry))
+
+    def _restore_selection(self):
+        previous = self._previous_selection
+        if previous is None:
+            return
+
+        self._previous_selection = None
+        # Nodes deleted since are left out
+        previous = mc.ls(previous, long=True) if previous else []
+        if previous:
+            mc.select(previous, replace=True)
+        else:
+            mc.select(clear=True)
@@ -0,0 +1,402 @@
+# coding=utf-8
+"""
+Per-camera clip values from an ordered list of rules, matched on the camera
+name, namespace, full path and attributes. It does not depend on Maya.
+
+A rule's conditions must all match, and the first matching rule wins. A
+rule either sets the camera's clip values or excludes the camera from the
+reset. Cameras matching no rule keep the default values.
+
+Rule sets are stored as JSON presets:
+
+    {
+        "rules": [
+            {"label": "Startup cameras", "name": "^(persp|top|front|side)$", "exclude": true},
+            {"label": "Game cameras", "attribute": "isGameCamera", "exclude": true},
+            {"label": "Previs", "namespace": "^previs", "near": 0.1, "far": 100000},
+            {"label": "Shots", "name": "^shot\\d+_cam$", "near": 1, "far": 50000}
+        ]
+    }
+
+Conditions:
+- "name": Regex searched in the camera transform name, without namespace.
+- "namespace": Regex searched in the namespace, empty for the root namespace.
+- "path": Regex searched in the full path of the camera shape.
+- "attribute": Attribute of the camera shape that must exist and be on.
+
+Each condition is searched in its own field only. The patterns of a field
+are combined into one regex, so a field costs one search per camera
+however many rules test it: each pattern is an optional lookahead from the
+start of the field, setting an empty named group when it matches. Patterns
+with groups of their own, which could clash or be renumbered, or with
+global inline flags, which only apply to a whole regex, are compiled on
+their own instead.
+
+The rules still matching a camera are tracked as bits of an int: the
+patterns compiled on their own are only searched for the rules not yet
+ruled out, and namespaces and attributes shared by many cameras are matched
+once per value.
+"""
+
+from collections import namedtuple
+from collections import OrderedDict
+from functools import reduce
+from itertools import compress
+from itertools import repeat
+import json
+import operator
+import re
+
+try:
+    from itertools import imap
+except ImportError:
+    # Python 3
+    imap = map
+
+# Type hinting in PyCharm
+try:
+    from typing import Callable, Dict, Iterable, List, Sequence, Str, Tuple, Union
+except ImportError:
+    pass
+
+from clip_planes import ClipPair
+
+
+# Fields of a camera key, one line each, in this order
+KEY_FIELDS = ("name", "namespace", "path", "attribute")
+
+# Order fields are matched in, by number of distinct values in a scene
+_FIELD_ORDER = ("attribute", "namespace", "name", "path")
+
+# Fields whose values are shared by many cameras, matched once per value
+_SHARED_FIELDS = ("attribute", "namespace")
+
+# Patterns per combined regex, Python 2 allows at most 100 named groups
+_PATTERNS_PER_REGEX = 90
+
+# Flags of a regex without inline flags
+_DEFAULT_FLAGS = re.compile("").flags
+
+# A rule of a rule set. Conditions left to None always match.
+#   clip_values: ClipPair set on the matching cameras, None to exclude them.
+ClipRule = namedtuple("ClipRule", "label name namespace path attribute clip_values")
+
+
+class ClipRulesError(ValueError):
+    pass
+
+
+def clip_rule(label="", name=None, namespace=None, path=None, attribute=None, clip_values=None):
+    # type: (Str, Str, Str, Str, Str, Union[ClipPair, None]) -> ClipRule
+    """
+    Return a ClipRule, with every condition optional.
+    """
+    return ClipRule(label, name, namespace, path, attribute, clip_values)
+
+
+def _match_field(value, free, combined, conditions, candidates):
+    # type: (Str, int, List[Tuple[Callable, Tuple[int], Dict]], List[Tuple[Callable, int]], int) -> int
+    """
+    Return the bits of the rules matching a field value.
+
+    :param value: Value of the field.
+    :param free: Bits of the rules without a condition on the field.
+    :param combined: (match function, rule bits per group, cache) per
+        combined regex, see "_combine_patterns".
+    :param conditions: (search function, rule bits) per pattern compiled on its own.
+    :param candidates: Bits of the rules to test, the patterns compiled on
+        their own for other rules are not searched.
+
+    """
+    matched = free
+    for match, group_bits, found_bits in combined:
+        # Groups of the patterns found are empty strings, the others None.
+        # Few sets of patterns are found in a scene, their bits are cached.
+        found = match(value).groups()
+        bits = found_bits.get(found)
+        if bits is None:
+            bits = found_bits[found] = reduce(
+                operator.or_, compress(group_bits, imap(operator.is_not, found, repeat(None))), 0)
+        matched |= bits
+    for search, bits in conditions:
+        if bits & candidates and search(value):
+            matched |= bits
+    return matched
+
+
+def _is_anchored(pattern):
+    # type: (Str) -> bool
+    """
+    Return if a pattern can only match at the start of the value.
+
+    Only patterns starting with "^" and without any "|" are taken as
+    anchored, an alternation could hold unanchored branches.
+    """
+    return pattern.startswith(("^", "\\A")) and "|" not in pattern
+
+
+def _combine_patterns(patterns):
+    # type: (List[Tuple[Str, int]]) -> List[Tuple[Callable, Tuple[int], Dict]]
+    """
+    Combine patterns into regexes matching all of them in one pass.
+
+    Each pattern becomes a lookahead, searched from the start of the value,
+    or only tried there when anchored, followed by an empty named group. The lookahead is in an alternation
+    with nothing, so a pattern not found leaves its group unset instead of
+    failing the match.
+
+    :param patterns: (pattern, rule bits) per pattern, with no group of its
+        own and no global inline flag.
+
+    :return: (match function, rule bits per group, cache of the rule bits
+        per "groups()" result) per combined regex.
+
+    """
+    combined = []
+    for start in range(0, len(patterns), _PATTERNS_PER_REGEX):
+        chunk = patterns[start:start + _PATTERNS_PER_REGEX]
+        regex = "".join(
+            r"(?:(?={}(?:{}))(?P<_r{}>)|)".format("" if _is_anchored(pattern) else ".*", pattern, ii)
+            for ii, (pattern, _) in enumerate(chunk))
+        combined.append((re.compile(regex).match, tuple(bits for _, bits in chunk), {}))
+    return combined
+
+
+def camera_key(path, attributes=()):
+    # type: (Str, Iterable[Str]) -> Str
+    """
+    Return the text the rules are matched against for a camera.
+
+    :param path: Full path of the camera shape.
+    :param attributes: Attributes of the camera shape that are on.
+
+    :return: One line per field of "KEY_FIELDS".
+
+    """
+    parts = path.rsplit("|", 2)
+    transform = parts[-2] if len(parts) > 2 and parts[-2] else parts[-1]
+    namespace, _, name = transform.rpartition(":")
+    return "\n".join((name, namespace, path, " {} ".format(" ".join(attributes))))
+
+
+class ClipRuleSet(object):
+    """
+    Ordered rules, with their conditions compiled per key field.
+
+    Attributes
+    ----------
+    rules: List[ClipRule]
+        Rules in priority order.
+    path: Str
+        Preset file the rules were loaded from, if any.
+    """
+
+    def __init__(self, rules, path=None):
+        # type: (Iterable[ClipRule], Union[Str, None]) -> None
+        """
+        :raise ClipRulesError: If a rule has an invalid regex.
+        """
+        self.rules = list(rules)
+        self.path = path
+        self._fields = self._compile(self.rules)
+
+    def __len__(self):
+        return len(self.rules)
+
+    @property
+    def attributes(self):
+        # type: () -> List[Str]
+        """
+        Attributes the rules test, to read for each camera.
+        """
+        return sorted(set(rule.attribute for rule in self.rules if rule.attribute))
+
+    @staticmethod
+    def _compile(rules):
+        # type: (List[ClipRule]) -> List[Tuple[int, int, List[Tuple[Callable, Tuple[int], Dict]], List[Tuple[Callable, int]]]]
+        """
+        Compile the conditions of the rules, grouped by key field.
+
+        Rules are tracked as bits of an int, bit "ii" for rule "ii". Each
+        distinct pattern of a field is kept once, with the bits of the rules
+        using it, and combined with the other patterns of the field when it
+        can be. Rules without a condition on a field always match it.
+
+        :return: Per field with conditions: its index in "KEY_FIELDS", the
+            bits of the rules without a condition on it, the combined
+            regexes, see "_combine_patterns", and (search function, rule
+            bits) per pattern compiled on its own.
+
+        :raise ClipRulesError: If a rule has an invalid regex.
+
+        """
+        fields = []
+        for index, field in enumerate(KEY_FIELDS):
+            free = 0
+            conditions = OrderedDict()  # pattern -> rule bits
+            compiled = {}  # pattern -> compiled regex
+            for ii, rule in enumerate(rules):
+                pattern = getattr(rule, field)
+                if not pattern:
+                    free |= 1 << ii
+                    continue
+
+                if field == "attribute":
+                    pattern = " {} ".format(re.escape(pattern))
+                if pattern not in compiled:
+                    try:
+                        compiled[pattern] = re.compile(pattern)
+                    except re.error as err:
+                        raise ClipRulesError('Rule {} "{}": invalid {} pattern "{}": {}'.format(
+                            ii, rule.label, field, pattern, err))
+
+                conditions[pattern] = conditions.get(pattern, 0) | 1 << ii
+
+            if not conditions:
+                continue
+
+            combinable = []
+            separate = []
+            for pattern, bits in conditions.items():
+                regex = compiled[pattern]
+                if regex.groups or regex.flags != _DEFAULT_FLAGS:
+                    separate.append((regex.search, bits))
+                else:
+                    combinable.append((pattern, bits))
+
+            fields.append((index, free, _combine_patterns(combinable), separate))
+
+        # Fields with few distinct values first, they rule out whole groups of rules
+        fields.sort(key=lambda item: _FIELD_ORDER.index(KEY_FIELDS[item[0]]))
+        return fields
+
+    def match(self, keys):
+        # type: (Iterable[Str]) -> List[int]
+        """
+        Return the index of the first rule matching each key, -1 for none.
+
+        Each field of a key is searched on its own, once with its combined
+        regexes, then with the patterns compiled on their own of the rules
+        not yet ruled out by the other fields.
+
+        :param keys: Camera keys, see "camera_key".
+
+        """
+        fields = self._fields
+        everything = (1 << len(self.rules)) - 1
+        # Rule bits matching each value of the fields shared by many cameras
+        cache = dict((index, {}) for index, _, _, _ in fields if KEY_FIELDS[index] in _SHARED_FIELDS)
+
+        matches = []
+        for key in keys:
+            values = key.split("\n")
+            candidates = everything
+            for index, free, combined, conditions in fields:
+                value = values[index]
+                field_cache = cache.get(index)
+                if field_cache is not None:
+                    matched = field_cache.get(value)
+                    if matched is None:
+                        matched = field_cache[value] = _match_field(value, free, combined, conditions, everything)
+                else:
+                    matched = _match_field(value, free, combined, conditions, candidates)
+
+                candidates &= matched
+                if not candidates:
+                    break
+
+            # Lowest bit left, -1 when none
+            matches.append((candidates & -candidates).bit_length() - 1)
+        return matches
+
+    def resolve(self, paths, attributes=None):
+        # type: (Sequence[Str], Union[Sequence[Iterable[Str]], None]) -> List[Union[ClipRule, None]]
+        """
+        Return the rule applying to each camera.
+
+        :param paths: Full paths of the camera shapes.
+        :param attributes: Per camera, its attributes among "self.attributes" that are on.
+
+        :return: The first matching rule per camera, None if no rule matches.
+
+        """
+        if attributes is None:
+            keys = [camera_key(path) for path in paths]
+        else:
+            keys = [camera_key(path, attrs) for path, attrs in zip(paths, attributes)]
+
+        rules = self.rules
+        return [rules[ii] if ii >= 0 else None for ii in self.match(keys)]
+
+    # Presets
+
+    @classmethod
+    def from_dict(cls, data, path=None):
+        # type: (Dict, Union[Str, None]) -> ClipRuleSet
+        """
+        Return the rule set described by a preset's data.
+
+        :raise ClipRulesError: If a rule is invalid.
+
+        """
+        rules = []
+        for ii, item in enumerate(data.get("rules", [])):
+            label = item.get("label", "")
+            exclude = item.get("exclude", False)
+
+            unknown = set(item) - set(KEY_FIELDS) - {"label", "exclude", "near", "far"}
+            if unknown:
+                raise ClipRulesError('Rule {} "{}": unknown keys: {}'.format(ii, label, ", ".join(sorted(unknown))))
+
+            if exclude:
+                clip_values = None
+            else:
+                try:
+                    clip_values = ClipPair(float(item["near"]), float(item["far"]))
+                except (KeyError, TypeError, ValueError):
+                    raise ClipRulesError('Rule {} "{}": needs numeric "near" and "far", or "exclude"'.format(
+                        ii, label))
+
+            rules.append(clip_rule(
+                label, item.get("name"), item.get("namespace"), item.get("path"), item.get("attribute"),
+                clip_values,
+            ))
+
+        return cls(rules, path)
+
+    def as_dict(self):
+        # type: () -> Dict
+        items = []
+        for rule in self.rules:
+            item = {"label": rule.label}
+            for field in KEY_FIELDS:
+                if getattr(rule, field):
+                    item[field] = getattr(rule, field)
+            if rule.clip_values is None:
+                item["exclude"] = True
+            else:
+                item["near"], item["far"] = rule.clip_values
+            items.append(item)
+        return {"rules": items}
+
+    @classmethod
+    def load(cls, path):
+        # type: (Str) -> ClipRuleSet
+        """
+        Load a JSON preset.
+
+        :raise ClipRulesError: If the file is not a valid preset.
+
+        """
+        with open(path) as f:
+            try:
+                data = json.load(f)
+            except ValueError as err:
+                raise ClipRulesError('Invalid rules preset "{}": {}'.format(path, err))
+        return cls.from_dict(data, path)
+
+    def save(self, path):
+        # type: (Str) -> None
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=4, sort_keys=True)
+        self.path = path
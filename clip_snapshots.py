@@ -0,0 +1,251 @@
+# coding=utf-8
+"""
+Snapshots of camera clip values, to revert a reset. It does not depend on Maya.
+
+A "ClipSnapshot" holds the full paths of the cameras written and their near
+and far clip values before the write, in two "array('d')" like a
+"CameraSet": 16 bytes of values per camera, plus its path. A snapshot
+taken from a "CameraSet" shares the path strings of the set, one decoded
+from the scene holds its own copies.
+
+A "ClipSnapshotHistory" keeps the last snapshots, evicting the oldest past
+a number of snapshots or a total number of cameras, so repeated resets of
+a 50k camera scene do not pile up in memory.
+
+Snapshots are encoded to a short ASCII string, to be stored with the scene:
+the paths as JSON and the values as little-endian doubles, compressed with
+zlib and base64 encoded.
+"""
+
+from array import array
+import base64
+from collections import deque
+import itertools
+import json
+import sys
+import time
+import zlib
+
+# Type hinting in PyCharm
+try:
+    from typing import Iterable, Iterator, List, Str, Union
+except ImportError:
+    pass
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+DEFAULT_MAX_SNAPSHOTS = 10
+
+# Cameras held over all the snapshots of a history, e.g. two resets of 50k cameras
+DEFAULT_MAX_CAMERAS = 100000
+
+# zlib level of encoded snapshots. Snapshots are encoded on every reset, the
+# fastest level is already within 2x of the smallest size on camera paths.
+COMPRESSION_LEVEL = 1
+
+# Separates the JSON header from the values in an encoded snapshot
+_HEADER_END = b"\0"
+
+_snapshot_ids = itertools.count(1)
+
+
+class ClipSnapshotError(ValueError):
+    pass
+
+
+class ClipSnapshot(object):
+    """
+    Clip values of cameras before they were written.
+
+    Attributes
+    ----------
+    id: Str
+        Unique id of the snapshot, the time it was taken plus a counter.
+    label: Str
+        Operation that wrote the cameras, e.g. "reset_cameras".
+    time: float
+        Time the snapshot was taken, in seconds since the epoch.
+    paths: Tuple[Str]
+        Full paths of the camera shapes.
+    near: array
+        Near clip value per camera.
+    far: array
+        Far clip value per camera.
+    """
+
+    __slots__ = ("id", "label", "time", "paths", "near", "far")
+
+    def __init__(self, paths, near, far, label="", snapshot_time=None, snapshot_id=None):
+        # type: (Iterable[Str], Iterable[float], Iterable[float], Str, Union[float, None], Union[Str, None]) -> None
+        self.paths = tuple(paths)
+        self.near = array("d", near)
+        self.far = array("d", far)
+        self.label = label
+        self.time = time.time() if snapshot_time is None else snapshot_time
+        if snapshot_id is None:
+            snapshot_id = "{:x}-{:x}".format(int(self.time * 1000), next(_snapshot_ids))
+        self.id = snapshot_id
+
+        if not len(self.paths) == len(self.near) == len(self.far):
+            raise ClipSnapshotError("Snapshot {}: {} path(s) for {} near and {} far value(s)".format(
+                self.id, len(self.paths), len(self.near), len(self.far)))
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __repr__(self):
+        return "{}({!r}, {} camera(s))".format(type(self).__name__, self.label, len(self.paths))
+
+    @property
+    def nbytes(self):
+        # type: () -> int
+        """
+        Memory held by the values and the path references, the path strings aside.
+        """
+        return (len(self.near) + len(self.far)) * self.near.itemsize + len(self.paths) * 8
+
+    def encode(self):
+        # type: () -> Str
+        """
+        Return the snapshot as an ASCII string, see "decode".
+        """
+        header = json.dumps({
+            "version": SNAPSHOT_FORMAT_VERSION,
+            "id": self.id,
+            "label": self.label,
+            "time": self.time,
+            "paths": self.paths,
+        }, separators=(",", ":"))
+        data = header.encode("utf-8") + _HEADER_END + _little_endian_bytes(self.near) + \
+            _little_endian_bytes(self.far)
+        return base64.b64encode(zlib.compress(data, COMPRESSION_LEVEL)).decode("ascii")
+
+    @classmethod
+    def decode(cls, text):
+        # type: (Str) -> ClipSnapshot
+        """
+        Return the snapshot encoded by "encode".
+
+        :raise ClipSnapshotError: If "text" is not an encoded snapshot.
+
+        """
+        try:
+            data = zlib.decompress(base64.b64decode(text))
+            header, _, values = data.partition(_HEADER_END)
+            header = json.loads(header.decode("utf-8"))
+            clip_values = _array_from_little_endian_bytes(values)
+        except (TypeError, ValueError, zlib.error) as err:
+            raise ClipSnapshotError("Invalid snapshot: {}".format(err))
+
+        if header.get("version") != SNAPSHOT_FORMAT_VERSION:
+            raise ClipSnapshotError("Unsupported snapshot version: {}".format(header.get("version")))
+
+        try:
+            paths = header["paths"]
+            return cls(
+                paths, clip_values[:len(paths)], clip_values[len(paths):],
+                label=header["label"], snapshot_time=header["time"], snapshot_id=header["id"],
+            )
+        except KeyError as err:
+            raise ClipSnapshotError("Invalid snapshot, missing {}".format(err))
+
+
+class ClipSnapshotHistory(object):
+    """
+    Last snapshots taken, oldest first.
+    """
+
+    def __init__(self, max_snapshots=DEFAULT_MAX_SNAPSHOTS, max_cameras=DEFAULT_MAX_CAMERAS):
+        # type: (int, int) -> None
+        """
+        :param max_snapshots: Number of snapshots kept.
+        :param max_cameras: Cameras kept over all the snapshots. The latest
+            snapshot is kept whatever its size.
+        """
+        self.max_snapshots = max_snapshots
+        self.max_cameras = max_cameras
+        self._snapshots = deque()
+        self._camera_count = 0
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def __iter__(self):
+        # type: () -> Iterator[ClipSnapshot]
+        return iter(self._snapshots)
+
+    @property
+    def camera_count(self):
+        # type: () -> int
+        return self._camera_count
+
+    @property
+    def nbytes(self):
+        # type: () -> int
+        return sum(snapshot.nbytes for snapshot in self._snapshots)
+
+    def latest(self):
+        # type: () -> Union[ClipSnapshot, None]
+        return self._snapshots[-1] if self._snapshots else None
+
+    def add(self, snapshot):
+        # type: (ClipSnapshot) -> List[ClipSnapshot]
+        """
+        Add a snapshot, evicting the oldest ones past the limits.
+
+        :return: The snapshots evicted.
+
+        """
+        self._snapshots.append(snapshot)
+        self._camera_count += len(snapshot)
+
+        evicted = []
+        while len(self._snapshots) > 1 and (
+                len(self._snapshots) > self.max_snapshots or self._camera_count > self.max_cameras):
+            oldest = self._snapshots.popleft()
+            self._camera_count -= len(oldest)
+            evicted.append(oldest)
+        return evicted
+
+    def remove(self, snapshot):
+        # type: (ClipSnapshot) -> bool
+        """
+        :return: If the snapshot was in the history.
+        """
+        try:
+            self._snapshots.remove(snapshot)
+        except ValueError:
+            return False
+        self._camera_count -= len(snapshot)
+        return True
+
+    def clear(self):
+        # type: () -> None
+        self._snapshots.clear()
+        self._camera_count = 0
+
+
+def _little_endian_bytes(values):
+    # type: (array) -> bytes
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    try:
+        return values.tobytes()
+    except AttributeError:
+        # Python 2
+        return values.tostring()
+
+
+def _array_from_little_endian_bytes(data):
+    # type: (bytes) -> array
+    values = array("d")
+    try:
+        values.frombytes(data)
+    except AttributeError:
+        # Python 2
+        values.fromstring(data)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
@@ -0,0 +1,188 @@
+# coding=utf-8
+"""
+Logging helpers of the tool. It does not depend on Maya.
+
+Camera lists are logged lazily, as a count and a short sample:
+
+    log.info("Reset %s", CameraSample(cameras))
+    log.debug("Reset cameras: %s", CameraList(cameras))
+
+Nothing is formatted unless a handler takes the record, and only a
+"CameraList" logged at DEBUG renders every camera, so resetting "all" the
+cameras does not turn the camera list into a megabyte log line.
+
+"LevelFormatter" formats each level with its own "logging.Formatter", built
+once, instead of swapping the format of a shared formatter per record.
+
+"RingBufferHandler" keeps the last formatted records in memory, for the UI
+to display.
+"""
+
+from collections import deque
+import itertools
+import logging
+
+# Type hinting in PyCharm
+try:
+    from typing import Dict, Iterable, List, Sized, Str, Union
+except ImportError:
+    pass
+
+
+# Loggers of the tool's modules
+LOGGER_NAMES = (
+    "reset_camera_clip_planes",
+    "reset_camera_clip_planes_core",
+    "reset_camera_clip_planes_ui",
+    "maya_cameras",
+    "camera_browser",
+    "clip_preview_dialog",
+    "clip_audit",
+    "clip_planes_batch",
+    "phase_stats",
+)
+
+# Number of cameras named by a "CameraSample"
+SAMPLE_SIZE = 5
+
+DEFAULT_BUFFER_CAPACITY = 1000
+
+DEFAULT_FMT = "[%(name)s] %(levelname)s: %(message)s"
+DEBUG_FMT = "[%(name)s] %(levelname)s: %(pathname)s.%(lineno)d: %(message)s"
+
+
+# --- Lazy Camera Lists
+
+class CameraSample(object):
+    """
+    Camera count and the first cameras, rendered only when formatted, e.g.
+    "1200 camera(s): |cam1|cam1Shape, ... (+1195)".
+    """
+
+    __slots__ = ("cameras", "limit")
+
+    def __init__(self, cameras, limit=SAMPLE_SIZE):
+        # type: (Union[Sized, Iterable], int) -> None
+        """
+        :param cameras: Camera paths, kept by reference.
+        :param limit: Number of cameras named.
+        """
+        self.cameras = cameras
+        self.limit = limit
+
+    def __str__(self):
+        count = len(self.cameras)
+        sample = [str(camera) for camera in itertools.islice(self.cameras, self.limit)]
+        text = "{} camera(s)".format(count)
+        if sample:
+            text += ": " + ", ".join(sample)
+        if count > len(sample):
+            text += ", ... (+{})".format(count - len(sample))
+        return text
+
+
+class CameraList(object):
+    """
+    Every camera path, rendered only when formatted. Log it at DEBUG.
+    """
+
+    __slots__ = ("cameras",)
+
+    def __init__(self, cameras):
+        # type: (Iterable) -> None
+        self.cameras = cameras
+
+    def __str__(self):
+        return ", ".join(str(camera) for camera in self.cameras)
+
+
+# --- Formatting
+
+class LevelFormatter(logging.Formatter):
+    """
+    Formatter picking a format per record level.
+
+    Each level gets its own formatter, built once, so formatting a record
+    changes no state and can run from several threads.
+    """
+
+    def __init__(self, fmt=DEFAULT_FMT, level_fmts=None, datefmt=None):
+        # type: (Str, Union[Dict[int, Str], None], Union[Str, None]) -> None
+        """
+        :param fmt: Format of the levels missing from "level_fmts".
+        :param level_fmts: Format per level, DEBUG records show their source by default.
+        :param datefmt: Date format of "%(asctime)s".
+        """
+        logging.Formatter.__init__(self, fmt, datefmt)
+        if level_fmts is None:
+            level_fmts = {logging.DEBUG: DEBUG_FMT}
+        self._level_formatters = dict(
+            (level, logging.Formatter(level_fmt, datefmt)) for level, level_fmt in level_fmts.items()
+        )
+
+    def format(self, record):
+        # type: (logging.LogRecord) -> Str
+        formatter = self._level_formatters.get(record.levelno)
+        if formatter is None:
+            return logging.Formatter.format(self, record)
+        return formatter.format(record)
+
+
+# --- In-Memory Handler
+
+class RingBufferHandler(logging.Handler):
+    """
+    Handler keeping the last formatted records in memory.
+
+    Records are formatted as they are emitted, so the buffer holds no
+    reference to the logged objects.
+    """
+
+    def __init__(self, capacity=DEFAULT_BUFFER_CAPACITY, level=logging.INFO):
+        # type: (int, int) -> None
+        logging.Handler.__init__(self, level)
+        self.buffer = deque(maxlen=capacity)
+        self.setFormatter(LevelFormatter())
+
+    def emit(self, record):
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def lines(self):
+        # type: () -> List[Str]
+        """
+        Return the buffered lines, oldest first.
+        """
+        self.acquire()
+        try:
+            return list(self.buffer)
+        finally:
+            self.release()
+
+    def clear(self):
+        # type: () -> None
+        self.acquire()
+        try:
+            self.buffer.clear()
+        finally:
+            self.release()
+
+
+def add_handler(handler, names=LOGGER_NAMES):
+    # type: (logging.Handler, Iterable[Str]) -> None
+    """
+    Add "handler" to the loggers of "names".
+
+    The loggers' levels are left as they are, so the handler only receives
+    the records the loggers let through.
+    """
+    for name in names:
+        logging.getLogger(name).addHandler(handler)
+
+
+def remove_handler(handler, names=LOGGER_NAMES):
+    # type: (logging.Handler, Iterable[Str]) -> None
+    for name in names:
+        logging.getLogger(name).removeHandler(handler)
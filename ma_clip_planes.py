@@ -0,0 +1,410 @@
+# coding=utf-8
+"""
+Reset camera clip planes in Maya ASCII (.ma) files, without Maya.
+
+The file is streamed line by line in one pass. Only the lines of camera
+"createNode" blocks are held in memory, so memory use does not grow with
+the file size. Every byte outside the edited ".ncp" / ".fcp" statements is
+written back unchanged, line endings included.
+
+Semantics follow "MayaResetCameraClipPlanes" in "all" mode: every camera
+node created in the file gets the clip values. Unlike Maya, locked clip
+plane attributes ("setAttr -l on") are left untouched and counted.
+Cameras coming from references are not created in the file itself and
+are not edited.
+"""
+
+from collections import namedtuple
+import io
+import os
+import re
+import shutil
+import tempfile
+
+# Type hinting in PyCharm
+try:
+    from typing import BinaryIO, Callable, List, Str, Tuple, Union
+except ImportError:
+    pass
+
+
+CAMERA_NODE_TYPES = (b"camera",)
+
+# First line of every Maya ASCII file, e.g. "//Maya ASCII 2020 scene"
+MA_HEADER = b"//Maya ASCII"
+
+# Values Maya leaves out of the file when an attribute is at its default
+MAYA_DEFAULT_NEAR = 0.1
+MAYA_DEFAULT_FAR = 10000.0
+
+# Read buffer size, lines are streamed so this bounds memory use
+READ_BUFFER_SIZE = 1 << 20
+
+TEMP_SUFFIX = ".tmp"
+
+# Result of a rewrite.
+#   cameras: Camera nodes found.
+#   written: Cameras with at least one clip plane statement edited or added.
+#   locked: Clip plane attributes left untouched because they are locked.
+MaRewriteResult = namedtuple("MaRewriteResult", "cameras written locked")
+
+# Camera attributes read from a file.
+#   near, far, orthographic, focal_length: Values, None when not stored in the file.
+MaCamera = namedtuple("MaCamera", "name parent near far orthographic focal_length")
+
+_CREATE_NODE_RE = re.compile(br'^createNode\s+(?P<type>\w+)\b(?P<flags>.*)$', re.S)
+_NAME_FLAG_RE = re.compile(br'\s-n\s+"(?P<value>[^"]*)"')
+_PARENT_FLAG_RE = re.compile(br'\s-p\s+"(?P<value>[^"]*)"')
+_SET_ATTR_RE = re.compile(
+    br'^(?P<head>\s*setAttr(?P<flags>(?:\s+-\w+(?:\s+[^\s"\-]\S*)?)*)\s+'
+    br'"\.(?P<attr>ncp|nearClipPlane|fcp|farClipPlane)"\s+)'
+    br'(?P<value>[^\s;]+)(?P<tail>\s*;.*)$',
+    re.S,
+)
+_LOCKED_FLAG_RE = re.compile(br'\s-l\s+(?:on|yes|true|1)\b')
+_SET_VALUE_RE = re.compile(
+    br'^\s*setAttr(?:\s+-\w+(?:\s+[^\s"\-]\S*)?)*\s+"\.(?P<attr>\w+)"\s+(?P<value>[^\s;]+)\s*;')
+
+# MaCamera fields read by "read_ma_cameras", by attribute short and long name
+_READ_ATTRS = {
+    b"ncp": "near", b"nearClipPlane": "near",
+    b"fcp": "far", b"farClipPlane": "far",
+    b"o": "orthographic", b"orthographic": "orthographic",
+    b"fl": "focal_length", b"focalLength": "focal_length",
+}
+_TRUE_VALUES = (b"yes", b"on", b"true", b"1")
+
+_NEAR_ATTRS = (b"ncp", b"nearClipPlane")
+_FAR_ATTRS = (b"fcp", b"farClipPlane")
+
+
+def format_ma_value(value):
+    # type: (float) -> bytes
+    """
+    Format a float the way Maya writes it in .ma files, e.g. 1 or 0.1.
+
+    :param value: Value to format.
+
+    :return: The formatted value.
+
+    """
+    text = repr(float(value))
+    if text.endswith(".0"):
+        text = text[:-2]
+    return text.encode("ascii")
+
+
+def _same_value(text, value):
+    # type: (bytes, Union[bytes, float]) -> bool
+    try:
+        return float(text) == float(value)
+    except ValueError:
+        return False
+
+
+def _is_continuation(line):
+    # type: (bytes) -> bool
+    """
+    Return if "line" continues the current statement block.
+
+    Statements inside a "createNode" block are indented, the next
+    top level statement is not.
+    """
+    return line[:1] in (b"\t", b" ")
+
+
+def _line_ending(line):
+    # type: (bytes) -> bytes
+    if line.endswith(b"\r\n"):
+        return b"\r\n"
+    return b"\n"
+
+
+class _CameraBlock(object):
+    """
+    Lines of a single camera "createNode" block, buffered until its end.
+    """
+
+    def __init__(self, line, create_match):
+        self.lines = [line]  # type: List[bytes]
+
+        flags = create_match.group("flags")
+        name = _NAME_FLAG_RE.search(flags)
+        parent = _PARENT_FLAG_RE.search(flags)
+        self.name = name.group("value").decode("utf-8") if name else ""
+        self.parent = parent.group("value").decode("utf-8") if parent else ""
+
+    def read(self):
+        # type: () -> MaCamera
+        """
+        Return the camera attributes set in the block.
+        """
+        values = {}
+        for line in self.lines[1:]:
+            match = _SET_VALUE_RE.match(line)
+            if not match:
+                continue
+
+            field = _READ_ATTRS.get(match.group("attr"))
+            if field is None:
+                continue
+
+            value = match.group("value")
+            if field == "orthographic":
+                values[field] = value in _TRUE_VALUES
+                continue
+            try:
+                values[field] = float(value)
+            except ValueError:
+                continue
+
+        return MaCamera(
+            self.name, self.parent, values.get("near"), values.get("far"),
+            values.get("orthographic"), values.get("focal_length"),
+        )
+
+    def rewrite(self, near, far):
+        # type: (bytes, bytes) -> Tuple[List[bytes], bool, int]
+        """
+        Return the block lines with the clip plane statements set.
+
+        :param near: Formatted near clip plane value.
+        :param far: Formatted far clip plane value.
+
+        :return: Lines, if anything was edited, number of locked attributes.
+
+        """
+        lines = list(self.lines)
+        edited = False
+        locked = 0
+        near_index = far_index = None
+
+        for ii, line in enumerate(lines):
+            match = _SET_ATTR_RE.match(line)
+            if not match:
+                continue
+
+            is_near = match.group("attr") in _NEAR_ATTRS
+            if is_near:
+                near_index = ii
+            else:
+                far_index = ii
+
+            if _LOCKED_FLAG_RE.search(match.group("flags")):
+                locked += 1
+                continue
+
+            value = near if is_near else far
+            if _same_value(match.group("value"), value):
+                continue
+
+            lines[ii] = match.group("head") + value + match.group("tail")
+            edited = True
+
+        newline = _line_ending(lines[0])
+
+        # Attributes at their default value are not written to the file,
+        # add them next to each other, in Maya's ncp, fcp order.
+        if near_index is None and not _same_value(near, MAYA_DEFAULT_NEAR):
+            near_index = far_index if far_index is not None else self._insert_index()
+            lines.insert(near_index, b'\tsetAttr ".ncp" ' + near + b";" + newline)
+            edited = True
+            if far_index is not None:
+                far_index += 1
+
+        if far_index is None and not _same_value(far, MAYA_DEFAULT_FAR):
+            if near_index is None:
+                near_index = self._insert_index() - 1
+            lines.insert(near_index + 1, b'\tsetAttr ".fcp" ' + far + b";" + newline)
+            edited = True
+
+        return lines, edited, locked
+
+    def _insert_index(self):
+        # type: () -> int
+        """
+        Return the index of the first "setAttr" statement, after the
+        "createNode" and "rename" statements.
+        """
+        for ii, line in enumerate(self.lines[1:], 1):
+            if line.lstrip().startswith(b"setAttr"):
+                return ii
+        return len(self.lines)
+
+
+def rewrite_ma_stream(src, dst, clip_values, camera_filter=None):
+    # type: (BinaryIO, BinaryIO, ClipPair, Union[Callable[[Str, Str], bool], None]) -> MaRewriteResult
+    """
+    Copy a .ma file from "src" to "dst", setting the camera clip planes.
+
+    :param src: Binary stream to read the .ma file from.
+    :param dst: Binary stream to write the .ma file to.
+    :param clip_values: The values to set the near and far clip planes to.
+    :param camera_filter: Optional callable taking a camera shape name and its
+        parent name, returning False for cameras to leave untouched.
+
+    :return: Counts of cameras found, written and locked attributes.
+
+    """
+    near = format_ma_value(clip_values.near)
+    far = format_ma_value(clip_values.far)
+
+    cameras = written = locked = 0
+    block = None  # type: Union[_CameraBlock, None]
+
+    def flush(block):
+        if camera_filter is not None and not camera_filter(block.name, block.parent):
+            dst.writelines(block.lines)
+            return False, 0
+
+        lines, edited, block_locked = block.rewrite(near, far)
+        dst.writelines(lines)
+        return edited, block_locked
+
+    for line in src:
+        if block is not None:
+            if _is_continuation(line):
+                block.lines.append(line)
+                continue
+
+            edited, block_locked = flush(block)
+            written += edited
+            locked += block_locked
+            block = None
+
+        match = _CREATE_NODE_RE.match(line)
+        if match and match.group("type") in CAMERA_NODE_TYPES:
+            cameras += 1
+            block = _CameraBlock(line, match)
+            continue
+
+        dst.write(line)
+
+    if block is not None:
+        edited, block_locked = flush(block)
+        written += edited
+        locked += block_locked
+
+    return MaRewriteResult(cameras, written, locked)
+
+
+def _read_header(src, path):
+    # type: (BinaryIO, Str) -> bytes
+    """
+    Read the first line of a .ma file.
+
+    :raises ValueError: If the file is not a Maya ASCII file.
+    """
+    header = src.readline()
+    if not header.startswith(MA_HEADER):
+        raise ValueError('Not a Maya ASCII file: "{}"'.format(path))
+    return header
+
+
+def _replace_file(src, dst):
+    # type: (Str, Str) -> None
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        # Python 2, "os.rename" does not overwrite on Windows
+        if os.name == "nt" and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def partial_output_paths(dst_path):
+    # type: (Str) -> List[Str]
+    """
+    Return the temporary files left next to "dst_path" by interrupted rewrites.
+
+    :param dst_path: Destination path of the rewrite.
+
+    :return: Paths of the temporary files.
+
+    """
+    dst_dir = os.path.dirname(os.path.abspath(dst_path))
+    prefix = "." + os.path.basename(dst_path) + "."
+    return [
+        os.path.join(dst_dir, name) for name in os.listdir(dst_dir)
+        if name.startswith(prefix) and name.endswith(TEMP_SUFFIX)
+    ]
+
+
+def rewrite_ma_file(src_path, clip_values, dst_path=None, camera_filter=None):
+    # type: (Str, ClipPair, Union[Str, None], Union[Callable[[Str, Str], bool], None]) -> MaRewriteResult
+    """
+    Set the camera clip planes of a .ma file.
+
+    The output is written to a temporary file next to the destination and
+    moved in place once complete, so an interrupted run never leaves a
+    truncated scene. When editing in place and no camera needed an edit,
+    the original file is left untouched.
+
+    :param src_path: Path of the .ma file to read.
+    :param clip_values: The values to set the near and far clip planes to.
+    :param dst_path: Path to write the result to, "src_path" if None.
+    :param camera_filter: See "rewrite_ma_stream".
+
+    :return: Counts of cameras found, written and locked attributes.
+
+    :raises ValueError: If "src_path" is not a Maya ASCII file.
+
+    """
+    dst_path = dst_path or src_path
+    dst_dir = os.path.dirname(os.path.abspath(dst_path))
+
+    fd, tmp_path = tempfile.mkstemp(
+        prefix="." + os.path.basename(dst_path) + ".", suffix=TEMP_SUFFIX, dir=dst_dir)
+    try:
+        with io.open(src_path, "rb", buffering=READ_BUFFER_SIZE) as src, \
+                io.open(fd, "wb", buffering=READ_BUFFER_SIZE) as dst:
+            dst.write(_read_header(src, src_path))
+            result = rewrite_ma_stream(src, dst, clip_values, camera_filter)
+
+        if result.written or os.path.abspath(dst_path) != os.path.abspath(src_path):
+            # "mkstemp" creates the file readable by its owner only
+            shutil.copymode(src_path, tmp_path)
+            _replace_file(tmp_path, dst_path)
+            tmp_path = None
+    finally:
+        if tmp_path is not None:
+            os.remove(tmp_path)
+
+    return result
+
+
+def read_ma_cameras(path):
+    # type: (Str) -> List[MaCamera]
+    """
+    Return the clip planes and view attributes of every camera node created in a .ma file.
+
+    The file is streamed like "rewrite_ma_stream", only camera blocks are kept.
+
+    :param path: Path of the .ma file.
+
+    :return: Attributes per camera.
+
+    :raises ValueError: If the file is not a Maya ASCII file.
+
+    """
+    cameras = []
+    block = None  # type: Union[_CameraBlock, None]
+
+    with io.open(path, "rb", buffering=READ_BUFFER_SIZE) as src:
+        _read_header(src, path)
+        for line in src:
+            if block is not None:
+                if _is_continuation(line):
+                    block.lines.append(line)
+                    continue
+                cameras.append(block.read())
+                block = None
+
+            match = _CREATE_NODE_RE.match(line)
+            if match and match.group("type") in CAMERA_NODE_TYPES:
+                block = _CameraBlock(line, match)
+
+    if block is not None:
+        cameras.append(block.read())
+
+    return cameras
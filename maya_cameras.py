@@ -0,0 +1,1646 @@
+# coding=utf-8
+"""
+Maya camera functions built only on "maya.cmds" and "maya.api.OpenMaya".
+
+Cameras are handled as full DAG path strings. Anywhere a node is expected,
+an "om.MObject" or "om.MDagPath" handle can be given instead of a path.
+
+Avoiding pymel keeps the first import of the tool cheap.
+"""
+
+from contextlib import contextmanager
+import itertools
+import logging
+import math
+import os
+import time
+
+# Type hinting in PyCharm
+try:
+    from typing import Callable, Dict, Float, Generator, Int, Iterable, List, Str, Tuple, Union
+except ImportError:
+    pass
+
+# Maya imports
+import maya.api.OpenMaya as om
+import maya.api.OpenMayaAnim as oma
+import maya.cmds as mc
+import maya.utils
+
+from clip_snapshots import ClipSnapshot
+from clip_snapshots import ClipSnapshotError
+from clip_snapshots import ClipSnapshotHistory
+from clip_snapshots import DEFAULT_MAX_CAMERAS
+from clip_snapshots import DEFAULT_MAX_SNAPSHOTS
+from log_utils import CameraList
+from log_utils import CameraSample
+
+
+log = logging.getLogger(__name__)
+
+UNDO_CHUNK_NAME = "resetCameraClipPlanes"
+
+# Plugin command recording the OpenMaya edits for undo
+UNDO_COMMAND_NAME = "resetCameraClipPlanesUndo"
+UNDO_PLUGIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reset_camera_clip_planes_undo.py")
+
+# Shape types counted as geometry when fitting clip planes to the scene
+GEOMETRY_TYPES = ("mesh", "nurbsSurface", "subdiv")
+
+# Depth of nested "suspended_refresh" contexts
+_refresh_suspend_depth = 0
+
+# Edits done, waiting for the undo command to take them
+_pending_undo = []
+
+
+class NothingSelectedError(Exception):
+    pass
+
+
+class FailedToResolveFromSelectionError(Exception):
+    pass
+
+
+# --- Maya Utility Functions
+
+def node_path(node):
+    # type: (Union[Str, om.MObject, om.MDagPath]) -> Str
+    """
+    Return the full path name of "node".
+
+    :param node: Path, MObject or MDagPath of the node.
+
+    :return: Full DAG path for DAG nodes, otherwise the node name.
+
+    """
+    if isinstance(node, om.MDagPath):
+        return node.fullPathName()
+
+    if isinstance(node, om.MObject):
+        if node.hasFn(om.MFn.kDagNode):
+            return om.MDagPath.getAPathTo(node).fullPathName()
+        return om.MFnDependencyNode(node).name()
+
+    return str(node)
+
+
+def dag_path(node):
+    # type: (Union[Str, om.MObject, om.MDagPath]) -> om.MDagPath
+    """
+    Return the MDagPath of "node".
+
+    :param node: Path, MObject or MDagPath of the DAG node.
+
+    :return: The MDagPath.
+
+    """
+    if isinstance(node, om.MDagPath):
+        return node
+    if isinstance(node, om.MObject):
+        return om.MDagPath.getAPathTo(node)
+
+    sel = om.MSelectionList()
+    sel.add(str(node))
+    return sel.getDagPath(0)
+
+
+def dag_paths(nodes):
+    # type: (Iterable[Union[Str, om.MObject, om.MDagPath]]) -> List[om.MDagPath]
+    """
+    Return the MDagPath of each of "nodes", in the same order.
+
+    "MSelectionList.add" skips the nodes already in the list, so with
+    duplicates the items of one list filled with all "nodes" would no
+    longer line up with them. Each name is mapped to the item it added,
+    and a name adding no item, another name of a node already added, is
+    resolved on its own.
+
+    :param nodes: Paths, MObjects or MDagPaths of DAG nodes.
+
+    :return: One MDagPath per node, duplicates included.
+
+    """
+    paths = []
+    items = {}  # type: Dict[Str, Int]
+    sel = om.MSelectionList()
+    for node in nodes:
+        if isinstance(node, (om.MDagPath, om.MObject)):
+            paths.append(dag_path(node))
+            continue
+
+        name = str(node)
+        item = items.get(name)
+        if item is None:
+            item = sel.length()
+            sel.add(name)
+            if sel.length() == item:
+                paths.append(dag_path(name))
+                continue
+            items[name] = item
+        paths.append(sel.getDagPath(item))
+
+    return paths
+
+
+def is_node_of_type(node, node_type):
+    # type: (Union[Str, om.MObject], str) -> bool
+    """
+    Return bool comparison if "node" is of "node type".
+
+    :param node: The node to compare.
+    :param node_type: The "node type" to compare with.
+
+    :return: If node is of type.
+
+    """
+    return mc.nodeType(node_path(node)) == node_type
+
+
+@contextmanager
+def undo_chunk(name=UNDO_CHUNK_NAME):
+    """
+    Context manager to record every command run inside it as a single undo step.
+
+    :param name: Name of the undo chunk shown in the undo queue.
+
+    """
+    mc.undoInfo(openChunk=True, chunkName=name)
+    try:
+        yield
+    finally:
+        mc.undoInfo(closeChunk=True)
+
+
+@contextmanager
+def suspended_refresh():
+    """
+    Context manager to suspend viewport refreshes, so a batch of edits
+    triggers a single redraw once it exits. Does nothing in batch mode.
+    """
+    global _refresh_suspend_depth
+
+    if mc.about(batch=True):
+        yield
+        return
+
+    if not _refresh_suspend_depth:
+        mc.refresh(suspend=True)
+    _refresh_suspend_depth += 1
+    try:
+        yield
+    finally:
+        _refresh_suspend_depth -= 1
+        if not _refresh_suspend_depth:
+            mc.refresh(suspend=False)
+
+
+def load_undo_command():
+    # type: () -> bool
+    """
+    Load the plugin of the undo command, if not loaded yet.
+
+    :return: If the command can be run.
+
+    """
+    if getattr(mc, UNDO_COMMAND_NAME, None) is None:
+        try:
+            mc.loadPlugin(UNDO_PLUGIN_PATH, quiet=True)
+        except RuntimeError as err:
+            log.warning('Unable to load the undo plugin "%s": %s', UNDO_PLUGIN_PATH, err)
+            return False
+    return getattr(mc, UNDO_COMMAND_NAME, None) is not None
+
+
+def record_undo(edits):
+    # type: (List) -> None
+    """
+    Record edits already done as one undo step.
+
+    Each edit has "doIt" and "undoIt" methods, like an "om.MDGModifier".
+    Undoing calls "undoIt" on every edit in reverse order, redoing calls
+    "doIt" on every edit in order.
+
+    :param edits: Edits done through OpenMaya.
+
+    """
+    edits = list(edits)
+    if not edits:
+        return
+    if not load_undo_command():
+        log.warning("The edits can not be undone")
+        return
+
+    _pending_undo[:] = edits
+    try:
+        getattr(mc, UNDO_COMMAND_NAME)()
+    finally:
+        del _pending_undo[:]
+
+
+class AnimCurveChangeEdit(object):
+    """
+    Edit of an "oma.MAnimCurveChange", for "record_undo".
+
+    The change is recorded while the keys are set, so "doIt" only redoes it.
+    """
+
+    def __init__(self, change):
+        # type: (oma.MAnimCurveChange) -> None
+        self.change = change
+
+    def doIt(self):
+        self.change.redoIt()
+
+    def undoIt(self):
+        self.change.undoIt()
+
+
+def take_pending_undo():
+    # type: () -> List
+    """
+    Return and clear the edits given to "record_undo", called by the undo command.
+    """
+    edits = list(_pending_undo)
+    del _pending_undo[:]
+    return edits
+
+
+# --- Maya Camera Functions
+
+def camera_manip_clipping_toggle(cameras, enable=True):
+    # type: (Iterable[Str], bool) -> None
+    """
+    Function to toggle the visibility of the defined cameras "clipping planes"
+    visibility.
+
+    https://help.autodesk.com/view/MAYAUL/2020/ENU/?guid=__CommandsPython_renderManip_html
+
+    :param cameras: Cameras to toggle the manipulator visibility.
+    :param enable: True, show the manipulators. False, hide manipulators.
+
+    :return: None
+
+    """
+    manipulators_state = _clipping_manip_state(enable)
+    with suspended_refresh():
+        for cam in cameras:
+            mc.renderManip(node_path(cam), e=True, camera=manipulators_state)
+
+
+def _clipping_manip_state(enable):
+    # type: (bool) -> List[bool]
+    """
+    Return the "renderManip" camera flag value showing only the "clipping planes" manipulator.
+    """
+    # sets the visibility of the camera component manipulator for "clipping planes"
+    # ["cycling index", "center of interest", "pivot", "clipping planes", "unused"]
+    return [False, False, False, bool(enable), False]
+
+
+class CameraManipState(object):
+    """
+    Clip planes manipulator visibility of the cameras, as last set through it.
+
+    Maya has no bulk query of the manipulator visibility, and querying a
+    camera costs as much as editing it. Instead, the visibility set on each
+    camera is remembered, and cameras already in the requested state are
+    skipped. Cameras never set are always edited.
+
+    Cameras are tracked by MObjectHandle, so renames and reparents keep
+    their state, and cameras of a previous scene are never matched.
+    Visibility changed outside the tool is not seen; "forget" clears the
+    state so the next toggle edits every camera again.
+    """
+
+    def __init__(self):
+        self._shown = {}  # type: Dict[Int, Tuple[om.MObjectHandle, bool]]
+
+    def __len__(self):
+        return len(self._shown)
+
+    def forget(self):
+        # type: () -> None
+        self._shown = {}
+
+    def set_clipping(self, cameras, enable=True):
+        # type: (Iterable[Union[Str, om.MObject]], bool) -> Int
+        """
+        Show or hide the clip planes manipulator of the cameras not already in that state.
+
+        The edits are made with the viewport refresh suspended.
+
+        :param cameras: Cameras to toggle the manipulator visibility.
+        :param enable: True, show the manipulators. False, hide manipulators.
+
+        :return: Number of cameras edited.
+
+        """
+        enable = bool(enable)
+        paths = [node_path(cam) for cam in cameras]
+
+        shown = self._shown
+        to_edit = []
+        queued = {}  # type: Dict[Int, om.MObjectHandle]
+        for path, camera_path in zip(paths, dag_paths(paths)):
+            handle = om.MObjectHandle(camera_path.node())
+            key = handle.hashCode()
+            known = shown.get(key)
+            if known is not None and known[1] == enable and known[0].isValid() and known[0] == handle:
+                continue
+            # The same camera given twice is edited once
+            if key in queued and queued[key] == handle:
+                continue
+            queued[key] = handle
+            to_edit.append((path, key, handle))
+
+        if not to_edit:
+            return 0
+
+        manipulators_state = _clipping_manip_state(enable)
+        with suspended_refresh():
+            for path, key, handle in to_edit:
+                mc.renderManip(path, e=True, camera=manipulators_state)
+                shown[key] = (handle, enable)
+
+        return len(to_edit)
+
+
+def resolve_cameras(nodes):
+    # type: (Iterable[Union[Str, om.MObject]]) -> Generator[Str]
+    """
+    From the sequence of nodes, return the full paths of the camera shapes.
+
+    Transforms resolve to their child camera shapes.
+
+    :param nodes: Sequence of nodes to filter.
+
+    :return: Full paths of nodes that are of "Camera Type".
+
+    """
+    for node in nodes:
+        path = node_path(node)
+
+        if is_node_of_type(path, "transform"):
+            for cam in mc.listRelatives(path, type="camera", fullPath=True) or []:
+                yield cam
+
+        elif is_node_of_type(path, "camera"):
+            yield mc.ls(path, long=True)[0]
+
+
+def resolve_cameras_bulk(nodes):
+    # type: (Iterable[Union[Str, om.MObject]]) -> List[Str]
+    """
+    From the sequence of nodes, return the full paths of the camera shapes.
+
+    Same resolution as "resolve_cameras", but made with two queries
+    however many nodes are given, instead of a few queries per node.
+    Duplicates are removed, and the order of "nodes" is kept.
+
+    :param nodes: Sequence of nodes to filter.
+
+    :return: Full paths of nodes that are of "Camera Type".
+
+    """
+    paths = [node_path(node) for node in nodes]
+    if not paths:
+        return []
+
+    # Alternating [path, node type, path, node type, ...]
+    typed = mc.ls(paths, long=True, showType=True) or []
+    typed = list(zip(typed[0::2], typed[1::2]))
+
+    transforms = [path for path, node_type in typed if node_type == "transform"]
+    children = {}
+    if transforms:
+        for cam in mc.listRelatives(transforms, type="camera", fullPath=True) or []:
+            children.setdefault(cam.rsplit("|", 1)[0], []).append(cam)
+
+    cameras = []
+    seen = set()
+    for path, node_type in typed:
+        if node_type == "transform":
+            resolved = children.get(path, [])
+        elif node_type == "camera":
+            resolved = [path]
+        else:
+            continue
+
+        for cam in resolved:
+            if cam not in seen:
+                seen.add(cam)
+                cameras.append(cam)
+
+    return cameras
+
+
+def set_cameras_clip_values(cameras, clip_values):
+    # type: (Iterable[Union[Str, om.MObject]], Iterable[Tuple[Float, Float]]) -> Int
+    """
+    Set each camera's clip plane values as one batch.
+
+    All the writes are queued in one "om.MDGModifier" and done at once,
+    recorded as a single undo step, and the viewport is redrawn once at
+    the end instead of after every camera.
+
+    :param cameras: Cameras to set clip plane values for.
+    :param clip_values: (near, far) pair for each of the "cameras".
+
+    :return: Number of cameras written.
+
+    """
+    return len(set_cameras_clip_values_rows(cameras, clip_values))
+
+
+def set_cameras_clip_values_rows(cameras, clip_values):
+    # type: (Iterable[Union[Str, om.MObject]], Iterable[Tuple[Float, Float]]) -> List[Int]
+    """
+    Like "set_cameras_clip_values", returning which cameras were written.
+
+    :return: Indices in "cameras" of the cameras written, the others failed.
+
+    """
+    with undo_chunk(), suspended_refresh():
+        written, modifier = _write_clip_values(cameras, clip_values)
+        if written:
+            record_undo([modifier])
+    return written
+
+
+def _write_clip_values(cameras, clip_values):
+    # type: (Iterable[Union[Str, om.MObject]], Iterable[Tuple[Float, Float]]) -> Tuple[List[Int], om.MDGModifier]
+    """
+    Set each camera's clip plane values through one "om.MDGModifier",
+    skipping the cameras that fail. The modifier is not recorded for undo.
+
+    :return: Indices of the cameras written, and the modifier, already done.
+
+    """
+    to_internal = om.MDistance.uiToInternal
+    modifier = om.MDGModifier()
+    written = []
+    for ii, (cam, (near, far)) in enumerate(zip(cameras, clip_values)):
+        try:
+            fn = om.MFnDependencyNode(dag_path(cam).node())
+            plugs = (fn.findPlug("nearClipPlane", False), fn.findPlug("farClipPlane", False))
+        except RuntimeError as err:
+            log.warning('Unable to set clip planes on "%s": %s', node_path(cam), err)
+            continue
+
+        # Locked or connected attributes should not abort the batch.
+        # The modifier would stop at the first one, leaving the rest unset.
+        blocked = [plug.name() for plug in plugs if plug.isFreeToChange() != om.MPlug.kFreeToChange]
+        if blocked:
+            log.warning('Unable to set clip planes on "%s": "%s" is locked or connected', node_path(cam), blocked[0])
+            continue
+
+        # The modifier takes internal units, "setAttr" takes UI units
+        modifier.newPlugValueDouble(plugs[0], to_internal(near))
+        modifier.newPlugValueDouble(plugs[1], to_internal(far))
+        written.append(ii)
+
+    if written:
+        modifier.doIt()
+    return written, modifier
+
+
+def get_cameras_clip_values(cameras):
+    # type: (Iterable[Union[Str, om.MObject]]) -> List[Tuple[Float, Float]]
+    """
+    Return each camera's current clip plane values, in one pass.
+
+    The values are read through OpenMaya rather than one "getAttr" command
+    per attribute, and returned in UI units like "getAttr".
+
+    :param cameras: Cameras to read the clip plane values of.
+
+    :return: (near, far) pair for each of the "cameras".
+
+    """
+    to_ui = om.MDistance.internalToUI
+    clip_values = []
+    for path in dag_paths(cameras):
+        fn = om.MFnCamera(path)
+        clip_values.append((to_ui(fn.nearClippingPlane), to_ui(fn.farClippingPlane)))
+
+    return clip_values
+
+
+def get_cameras_audit_data(cameras):
+    # type: (Iterable[Union[Str, om.MObject]]) -> List[Tuple[Float, Float, bool, Float]]
+    """
+    Return each camera's clip planes and lens, in one pass like "get_cameras_clip_values".
+
+    :param cameras: Cameras to read.
+
+    :return: (near, far, orthographic, focal length) per camera, clip
+        planes in UI units, focal length in millimeters.
+
+    """
+    to_ui = om.MDistance.internalToUI
+    data = []
+    for path in dag_paths(cameras):
+        fn = om.MFnCamera(path)
+        data.append((to_ui(fn.nearClippingPlane), to_ui(fn.farClippingPlane), fn.isOrtho(), fn.focalLength))
+
+    return data
+
+
+class ChunkedClipValuesWriter(object):
+    """
+    Set clip plane values over many calls to "step", each one limited in
+    time, so the Maya UI can process events in between.
+
+    The whole write is a single undo step, named "undo_name". An undo chunk
+    left open while Maya processes events would take in whatever the user
+    does meanwhile, so none is open between steps: each step writes its
+    cameras through an "om.MDGModifier", which is not recorded for undo,
+    and "finish" records all the modifiers as one undo step. "cancel"
+    undoes the modifiers instead, leaving nothing in the undo queue.
+
+    The values of every camera are read before it is written.
+
+    Usage:
+
+        writer = ChunkedClipValuesWriter(cameras, clip_values)
+        writer.start()
+        while writer.step():
+            ...  # Let Maya process events
+        writer.finish()
+    """
+
+    # Cameras written between two checks of the time budget
+    BATCH_SIZE = 64
+
+    def __init__(self, cameras, clip_values, undo_name=UNDO_CHUNK_NAME):
+        # type: (List[Union[Str, om.MObject]], List[Tuple[Float, Float]], Str) -> None
+        self.cameras = list(cameras)
+        self.clip_values = list(clip_values)
+        self.undo_name = undo_name
+
+        # Index of the next camera to write
+        self.done = 0
+        # (camera, original clip values) of the cameras written
+        self._originals = []  # type: List[Tuple[Union[Str, om.MObject], Tuple[Float, Float]]]
+        # Modifiers done by the steps, not recorded for undo yet
+        self._modifiers = []  # type: List[om.MDGModifier]
+        self._active = False
+
+    @property
+    def total(self):
+        # type: () -> Int
+        return len(self.cameras)
+
+    @property
+    def written(self):
+        # type: () -> Int
+        return len(self._originals)
+
+    @property
+    def originals(self):
+        # type: () -> List[Tuple[Union[Str, om.MObject], Tuple[Float, Float]]]
+        """
+        (camera, clip values before the write) of the cameras written so far.
+        """
+        return list(self._originals)
+
+    @property
+    def active(self):
+        # type: () -> bool
+        return self._active
+
+    def start(self):
+        # type: () -> None
+        self._active = True
+
+    def step(self, max_seconds=0.05):
+        # type: (float) -> bool
+        """
+        Write cameras until "max_seconds" have passed.
+
+        :param max_seconds: Time budget of this step, at least one batch of
+            cameras is written.
+
+        :return: If cameras remain to be written.
+
+        """
+        deadline = time.time() + max_seconds
+        with suspended_refresh():
+            while self.done < self.total:
+                stop = min(self.done + self.BATCH_SIZE, self.total)
+                cameras = self.cameras[self.done:stop]
+
+                originals = _read_clip_values_per_camera(cameras)
+                written, modifier = _write_clip_values(cameras, self.clip_values[self.done:stop])
+                if written:
+                    self._modifiers.append(modifier)
+                for ii in written:
+                    if originals[ii] is not None:
+                        self._originals.append((cameras[ii], originals[ii]))
+
+                self.done = stop
+                if time.time() >= deadline:
+                    break
+
+        return self.done < self.total
+
+    def finish(self):
+        # type: () -> None
+        """
+        Record the cameras written as one undo step.
+        """
+        modifiers, self._modifiers = self._modifiers, []
+        self._active = False
+        if modifiers:
+            with undo_chunk(self.undo_name):
+                record_undo(modifiers)
+
+    def cancel(self):
+        # type: () -> None
+        """
+        Undo the writes made so far, restoring the cameras' original values.
+        """
+        try:
+            if self._modifiers:
+                with suspended_refresh():
+                    for modifier in reversed(self._modifiers):
+                        modifier.undoIt()
+            self._modifiers = []
+            self._originals = []
+            self.done = 0
+        finally:
+            self.finish()
+
+
+def _read_clip_values_per_camera(cameras):
+    # type: (List[Union[Str, om.MObject]]) -> List[Union[Tuple[Float, Float], None]]
+    """
+    Return each camera's current clip plane values, None for the cameras
+    that can not be read.
+    """
+    try:
+        return get_cameras_clip_values(cameras)
+    except RuntimeError:
+        pass
+
+    clip_values = []
+    for cam in cameras:
+        try:
+            clip_values.extend(get_cameras_clip_values([cam]))
+        except RuntimeError:
+            clip_values.append(None)
+    return clip_values
+
+
+def set_cameras_clip_plane(cameras, near, far):
+    # type: (Iterable[Union[Str, om.MObject]], float, float) -> Int
+    """
+    Set defined cameras clip plane values.
+
+    :param cameras: Cameras to set clip plane values for.
+    :param near: Near clip plane value to set.
+    :param far: Far clip plane value to set.
+
+    :return: Number of cameras written.
+
+    """
+    return set_cameras_clip_values(cameras, itertools.repeat((near, far)))
+
+
+def get_cameras_view_data(cameras):
+    # type: (Iterable[Union[Str, om.MObject]]) -> Tuple[List, List, List, List]
+    """
+    Return what is needed to build each camera's view frustum.
+
+    See "clip_fit.fit_clip_planes" for the meaning of each value.
+
+    :param cameras: Camera shapes to query.
+
+    :return: World inverse matrices as 16 floats, orthographic flags,
+        half widths and half heights, one item per camera.
+
+    """
+    matrices = []
+    orthographic = []
+    half_widths = []
+    half_heights = []
+
+    for cam in cameras:
+        path = dag_path(cam)
+        fn = om.MFnCamera(path)
+
+        matrices.append(list(path.inclusiveMatrixInverse()))
+
+        is_ortho = fn.isOrtho()
+        orthographic.append(is_ortho)
+        if is_ortho:
+            half_width = fn.orthoWidth * 0.5
+            half_widths.append(half_width)
+            half_heights.append(half_width / fn.aspectRatio())
+        else:
+            half_widths.append(math.tan(fn.horizontalFieldOfView() * 0.5))
+            half_heights.append(math.tan(fn.verticalFieldOfView() * 0.5))
+
+    return matrices, orthographic, half_widths, half_heights
+
+
+def get_cameras_attributes_on(cameras, attributes):
+    # type: (Iterable[Union[Str, om.MObject]], Iterable[Str]) -> List[Tuple[Str]]
+    """
+    Return, per camera, which of "attributes" exist on it and are on.
+
+    Read through OpenMaya in one pass, rather than one "attributeQuery" and
+    "getAttr" command per camera and attribute. Attributes that are not
+    numeric count as on when they exist.
+
+    :param cameras: Camera shapes to query.
+    :param attributes: Attribute names to test.
+
+    :return: The attributes on, per camera.
+
+    """
+    attributes = list(attributes)
+
+    attributes_on = []
+    for path in dag_paths(cameras):
+        fn = om.MFnDependencyNode(path.node())
+        camera_on = []
+        for attr in attributes:
+            if not fn.hasAttribute(attr):
+                continue
+            try:
+                is_on = fn.findPlug(attr, False).asBool()
+            except RuntimeError:
+                is_on = True
+            if is_on:
+                camera_on.append(attr)
+        attributes_on.append(tuple(camera_on))
+
+    return attributes_on
+
+
+def get_geometry_paths(node_types=GEOMETRY_TYPES):
+    # type: (Iterable[Str]) -> List[Str]
+    """
+    Return the full paths of the visible geometry shapes in the scene.
+
+    :param node_types: Shape node types counted as geometry.
+
+    """
+    return mc.ls(type=list(node_types), noIntermediate=True, visible=True, long=True) or []
+
+
+def get_geometry_world_bounds(node_types=GEOMETRY_TYPES, paths=None):
+    # type: (Iterable[Str], Union[Iterable[Str], None]) -> Tuple[List, List]
+    """
+    Return the world bounding boxes of the visible geometry in the scene.
+
+    :param node_types: Shape node types counted as geometry.
+    :param paths: Geometry shapes to query, as returned by
+        "get_geometry_paths". None to list them from "node_types".
+
+    :return: Bounding box minimums and maximums, as (x, y, z) tuples, one
+        per shape.
+
+    """
+    if paths is None:
+        paths = get_geometry_paths(node_types)
+
+    bounds_min = []
+    bounds_max = []
+    for path in paths:
+        path = dag_path(path)
+        bbox = om.MFnDagNode(path).boundingBox
+        bbox.transformUsing(path.inclusiveMatrix())
+        bounds_min.append(tuple(bbox.min)[:3])
+        bounds_max.append(tuple(bbox.max)[:3])
+
+    return bounds_min, bounds_max
+
+
+# --- Context Evaluation
+
+def frame_range(start, end, step=1.0):
+    # type: (Float, Float, Float) -> List[Float]
+    """
+    Return the frames from "start" to "end" included, every "step" frames.
+    """
+    if step <= 0:
+        raise ValueError("Frame step must be positive, got {}".format(step))
+    count = int(math.floor((end - start) / step + 1e-6)) + 1
+    return [start + ii * step for ii in range(max(count, 0))]
+
+
+@contextmanager
+def evaluation_context(frame):
+    # type: (Float) -> Generator[Tuple, None, None]
+    """
+    Evaluate the plugs read at "frame", without changing the current time.
+
+    Only the plugs read are evaluated at that time, where setting
+    "currentTime" evaluates the whole scene on every frame.
+
+    :param frame: Time to evaluate at, in the current time unit.
+
+    :return: Arguments to pass to the plug reads. Empty when Maya has
+        "MDGContextGuard", else the MDGContext.
+
+    """
+    context = om.MDGContext(om.MTime(frame, om.MTime.uiUnit()))
+
+    guard_type = getattr(om, "MDGContextGuard", None)
+    if guard_type is None:
+        yield (context,)
+        return
+
+    guard = guard_type(context)
+    try:
+        yield ()
+    finally:
+        # Restores the previous context
+        del guard
+
+
+def _find_plugs(node, names):
+    # type: (Str, Iterable[Str]) -> List[om.MPlug]
+    """
+    Return the plugs of "node" named "names", the first element of array plugs.
+    """
+    sel = om.MSelectionList()
+    sel.add(node)
+    fn = om.MFnDependencyNode(sel.getDependNode(0))
+
+    plugs = []
+    for name in names:
+        plug = fn.findPlug(name, False)
+        if plug.isArray:
+            plug = plug.elementByLogicalIndex(0)
+        plugs.append(plug)
+    return plugs
+
+
+class ContextViewReader(object):
+    """
+    Reads the camera frusta and geometry bounding boxes at any frame.
+
+    The plugs are resolved once, so reading a frame costs one evaluation
+    per plug, in the context of that frame.
+
+    The lens is read from the film aperture and focal length, so lens
+    squeeze and film fit are not accounted for. The geometry set is the
+    visible geometry when the reader is created.
+
+    Attributes
+    ----------
+    cameras: List[Str]
+        Full paths of the camera shapes read.
+    geometry: List[Str]
+        Full paths of the geometry shapes read.
+    """
+
+    CAMERA_PLUGS = (
+        "worldInverseMatrix", "orthographic", "orthographicWidth",
+        "horizontalFilmAperture", "verticalFilmAperture", "focalLength",
+    )
+    GEOMETRY_PLUGS = ("boundingBoxMin", "boundingBoxMax", "worldMatrix")
+
+    # Film apertures are in inches, focal lengths in millimeters
+    INCH_TO_MM = 25.4
+
+    def __init__(self, cameras, node_types=GEOMETRY_TYPES):
+        # type: (Iterable[Union[Str, om.MObject]], Iterable[Str]) -> None
+        self.cameras = [node_path(cam) for cam in cameras]
+        self.geometry = mc.ls(type=list(node_types), noIntermediate=True, visible=True, long=True) or []
+
+        self._camera_plugs = [_find_plugs(cam, self.CAMERA_PLUGS) for cam in self.cameras]
+
+        self._geometry_plugs = []
+        for path in self.geometry:
+            bbox_min, bbox_max, world_matrix = _find_plugs(path, self.GEOMETRY_PLUGS)
+            self._geometry_plugs.append((
+                [bbox_min.child(ii) for ii in range(3)],
+                [bbox_max.child(ii) for ii in range(3)],
+                world_matrix,
+            ))
+
+    def read(self, frame):
+        # type: (Float) -> Tuple[Tuple[List, List, List, List], Tuple[List, List, List]]
+        """
+        Return the camera and geometry data at "frame".
+
+        :return: The cameras' data, as "get_cameras_view_data", and the
+            geometry's local bounding box minimums, maximums and world
+            matrices, see "clip_fit.transform_bounds".
+
+        """
+        matrices = []
+        orthographic = []
+        half_widths = []
+        half_heights = []
+
+        bounds_min = []
+        bounds_max = []
+        world_matrices = []
+
+        with evaluation_context(frame) as args:
+            for inverse, ortho, ortho_width, h_aperture, v_aperture, focal in self._camera_plugs:
+                matrices.append(list(om.MFnMatrixData(inverse.asMObject(*args)).matrix()))
+
+                is_ortho = ortho.asBool(*args)
+                orthographic.append(is_ortho)
+                h_aperture = h_aperture.asDouble(*args)
+                v_aperture = v_aperture.asDouble(*args)
+                if is_ortho:
+                    half_width = ortho_width.asDouble(*args) * 0.5
+                    half_widths.append(half_width)
+                    half_heights.append(half_width * v_aperture / h_aperture)
+                else:
+                    scale = 0.5 * self.INCH_TO_MM / focal.asDouble(*args)
+                    half_widths.append(h_aperture * scale)
+                    half_heights.append(v_aperture * scale)
+
+            for bbox_min, bbox_max, world_matrix in self._geometry_plugs:
+                bounds_min.append([plug.asDouble(*args) for plug in bbox_min])
+                bounds_max.append([plug.asDouble(*args) for plug in bbox_max])
+                world_matrices.append(list(om.MFnMatrixData(world_matrix.asMObject(*args)).matrix()))
+
+        return (matrices, orthographic, half_widths, half_heights), (bounds_min, bounds_max, world_matrices)
+
+
+def set_cameras_clip_keys(cameras, frames, near, far):
+    # type: (List[Union[Str, om.MObject]], List[Float], List[List[Float]], List[List[Float]]) -> Int
+    """
+    Key each camera's clip planes on "frames", replacing their existing keys.
+
+    Every edit goes through OpenMaya: the missing animation curves are
+    created by one "om.MDGModifier", then each curve gets all its keys from
+    a single "MFnAnimCurve.addKeys", recorded in one "oma.MAnimCurveChange".
+    Both are recorded by "record_undo", so undoing restores the previous
+    keys and redoing sets every key again.
+
+    :param cameras: Cameras to key.
+    :param frames: Frames to key, in the current time unit.
+    :param near: Per camera, its near clip value on each of "frames".
+    :param far: Per camera, its far clip value on each of "frames".
+
+    :return: Number of cameras keyed.
+
+    """
+    cameras = [node_path(cam) for cam in cameras]
+    if not cameras or not frames:
+        return 0
+
+    unit = om.MTime.uiUnit()
+    times = om.MTimeArray()
+    for frame in frames:
+        times.append(om.MTime(frame, unit))
+
+    # Curves of each camera to key: (camera, [(curve, values), (curve, values)])
+    modifier = om.MDGModifier()
+    keyable = []
+    for path, cam_near, cam_far in zip(cameras, near, far):
+        try:
+            fn = om.MFnDependencyNode(dag_path(path).node())
+            plugs = (fn.findPlug("nearClipPlane", False), fn.findPlug("farClipPlane", False))
+        except RuntimeError as err:
+            log.warning('Unable to key clip planes on "%s": %s', path, err)
+            continue
+
+        # Locked attributes get no animation curve, other inputs are kept
+        blocked = [plug.name() for plug in plugs if plug.isLocked or not _is_keyable_input(plug)]
+        if blocked:
+            log.warning('Unable to key clip planes on "%s": "%s" is locked or connected', path, blocked[0])
+            continue
+
+        curves = []
+        for plug, values in zip(plugs, (cam_near, cam_far)):
+            source = plug.source()
+            if source.isNull:
+                curve = oma.MFnAnimCurve().create(plug, modifier=modifier)
+            else:
+                curve = source.node()
+            curves.append((curve, values))
+        keyable.append((path, curves))
+
+    if not keyable:
+        return 0
+
+    keyed = 0
+    change = oma.MAnimCurveChange()
+    with undo_chunk(), suspended_refresh():
+        # Connects the new curves, they are keyed once connected
+        modifier.doIt()
+
+        for path, curves in keyable:
+            try:
+                for curve, values in curves:
+                    # Keys are set in internal units, "setAttr" takes UI units
+                    values = om.MDoubleArray([om.MDistance.uiToInternal(value) for value in values])
+                    oma.MFnAnimCurve(curve).addKeys(
+                        times, values,
+                        oma.MFnAnimCurve.kTangentLinear, oma.MFnAnimCurve.kTangentLinear,
+                        False, change,
+                    )
+            except RuntimeError as err:
+                log.warning('Unable to key clip planes on "%s": %s', path, err)
+                continue
+            keyed += 1
+
+        record_undo([modifier, AnimCurveChangeEdit(change)])
+
+    return keyed
+
+
+def _is_keyable_input(plug):
+    # type: (om.MPlug) -> bool
+    """
+    Return if "plug" has no input, or an animation curve as its input.
+    """
+    source = plug.source()
+    return source.isNull or source.node().hasFn(om.MFn.kAnimCurve)
+
+
+def get_selected_cameras():
+    # type: () -> List[Str]
+
+    sel = mc.ls(sl=True, long=True) or []
+
+    # Raise if nothing is selected in scene
+    if not sel:
+        msg = "Nothing Selected!"
+        log.error(msg)
+        raise NothingSelectedError(msg)
+
+    cameras = resolve_cameras_bulk(sel)
+
+    # Raise if unable to resolve cameras from selection
+    if not cameras:
+        log.error("Selection: %s", CameraSample(sel))
+        log.debug("Selection: %s", CameraList(sel))
+        msg = 'No cameras could be resolved from selection!'
+        log.error(msg)
+        raise FailedToResolveFromSelectionError(msg)
+
+    return cameras
+
+
+def get_all_cameras():
+    # type: () -> List[Str]
+    return mc.ls(cameras=True, long=True) or []
+
+
+# --- Maya Callbacks
+
+class MessageCallbacks(object):
+    """
+    Owns a set of Maya message callback ids, so they can be removed together.
+    """
+
+    def __init__(self):
+        self._ids = []  # type: List[Int]
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, callback_id):
+        # type: (Int) -> Int
+        self._ids.append(callback_id)
+        return callback_id
+
+    def remove_all(self):
+        # type: () -> None
+        if self._ids:
+            om.MMessage.removeCallbacks(self._ids)
+        self._ids = []
+
+
+class CameraRegistry(object):
+    """
+    Live index of the camera shapes in the scene.
+
+    The index is filled once with a scene scan, then kept up to date from
+    node added, node removed, rename and reparent callbacks. Reading it does
+    not walk the DG.
+
+    File new/open, import and reference load/unload mark the index as stale
+    instead of tracking every node they create. It is then rebuilt with a
+    single scan the next time it is read.
+
+    Attributes
+    ----------
+    SCENE_MESSAGES: Tuple
+        "om.MSceneMessage" messages after which the index is rebuilt.
+    """
+
+    SCENE_MESSAGES = (
+        "kBeforeNew", "kAfterNew",
+        "kBeforeOpen", "kAfterOpen",
+        "kBeforeImport", "kAfterImport",
+        "kBeforeCreateReference", "kAfterCreateReference",
+        "kBeforeLoadReference", "kAfterLoadReference",
+        "kBeforeUnloadReference", "kAfterUnloadReference",
+        "kBeforeRemoveReference", "kAfterRemoveReference",
+    )
+
+    def __init__(self):
+        self._handles = {}  # type: Dict[Int, om.MObjectHandle]
+        self._paths = None  # type: Union[Tuple[Str], None]
+        self._stale = True
+        self._callbacks = MessageCallbacks()
+
+    @property
+    def active(self):
+        # type: () -> bool
+        return bool(len(self._callbacks))
+
+    def start(self):
+        # type: () -> None
+        """
+        Register the callbacks and fill the index.
+        """
+        if self.active:
+            return
+
+        callbacks = self._callbacks
+        callbacks.add(om.MDGMessage.addNodeAddedCallback(self._on_node_added, "camera"))
+        callbacks.add(om.MDGMessage.addNodeRemovedCallback(self._on_node_removed, "camera"))
+        callbacks.add(om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, self._on_name_changed))
+        callbacks.add(om.MDagMessage.addParentAddedCallback(self._on_parent_changed))
+        for message in self.SCENE_MESSAGES:
+            callbacks.add(om.MSceneMessage.addCallback(getattr(om.MSceneMessage, message), self._on_scene_changed))
+
+        self.rebuild()
+        log.debug("Camera registry started, %d camera(s)", len(self._paths))
+
+    def stop(self):
+        # type: () -> None
+        """
+        Remove the callbacks and clear the index.
+        """
+        self._callbacks.remove_all()
+        self._handles = {}
+        self._paths = None
+        self._stale = True
+
+    def rebuild(self):
+        # type: () -> None
+        """
+        Refill the index from a single scan of the scene.
+        """
+        paths = get_all_cameras()
+
+        sel = om.MSelectionList()
+        for path in paths:
+            sel.add(path)
+
+        handles = {}
+        for ii in range(sel.length()):
+            handle = om.MObjectHandle(sel.getDependNode(ii))
+            handles[handle.hashCode()] = handle
+
+        self._handles = handles
+        self._paths = tuple(sorted(paths))
+        self._stale = False
+
+    def cameras(self):
+        # type: () -> Tuple[Str]
+        """
+        Return the full paths of every camera shape in the scene, sorted.
+        """
+        if not self.active:
+            return tuple(sorted(get_all_cameras()))
+
+        if self._stale:
+            self.rebuild()
+
+        elif self._paths is None:
+            paths = []
+            for handle in self._handles.values():
+                if handle.isValid():
+                    paths.append(om.MDagPath.getAPathTo(handle.object()).fullPathName())
+            self._paths = tuple(sorted(paths))
+
+        return self._paths
+
+    # Callbacks
+
+    def _on_node_added(self, node, *args):
+        if self._stale:
+            return
+        handle = om.MObjectHandle(node)
+        self._handles[handle.hashCode()] = handle
+        self._paths = None
+
+    def _on_node_removed(self, node, *args):
+        if self._stale:
+            return
+        self._handles.pop(om.MObjectHandle(node).hashCode(), None)
+        self._paths = None
+
+    def _on_name_changed(self, node, *args):
+        # Renaming any ancestor changes the full path of a camera
+        if node.hasFn(om.MFn.kDagNode):
+            self._paths = None
+
+    def _on_parent_changed(self, *args):
+        self._paths = None
+
+    def _on_scene_changed(self, *args):
+        self._stale = True
+
+
+class SelectionWatcher(object):
+    """
+    Track the cameras resolved from the active selection, to keep a UI in sync.
+
+    Outliner drags and marquee selections send "SelectionChanged" many
+    times per gesture. The callback only flags an update as pending, and
+    the update runs once, deferred to the next idle event.
+
+    Each update resolves cameras only for the nodes added to the selection
+    since the last update. Nodes still selected keep their resolved
+    cameras, and removed nodes are dropped. Renamed or reparented nodes
+    have a new path, so they resolve again. Cameras created or deleted
+    clear every resolution, as they can change what a selected transform
+    resolves to.
+
+    Attributes
+    ----------
+    on_change: Callable
+        Called with the list of selected cameras after an update changed it.
+    """
+
+    EVENT = "SelectionChanged"
+
+    def __init__(self, on_change=None, defer=maya.utils.executeDeferred):
+        # type: (Union[Callable[[List[Str]], None], None], Callable) -> None
+        """
+        :param on_change: Called with the list of selected cameras when it changes.
+        :param defer: Schedules a function to run on the next idle event.
+        """
+        self.on_change = on_change
+        self._defer = defer
+        self._pending = False
+        self._resolved = {}  # type: Dict[Str, Tuple[Str]]
+        self._cameras = []  # type: List[Str]
+        self._callbacks = MessageCallbacks()
+
+    @property
+    def active(self):
+        # type: () -> bool
+        return bool(len(self._callbacks))
+
+    @property
+    def cameras(self):
+        # type: () -> List[Str]
+        """
+        Cameras resolved from the selection at the last update.
+        """
+        return self._cameras
+
+    def start(self):
+        # type: () -> None
+        """
+        Register the callbacks and resolve the current selection.
+        """
+        if self.active:
+            return
+
+        callbacks = self._callbacks
+        callbacks.add(om.MEventMessage.addEventCallback(self.EVENT, self._on_selection_changed))
+        callbacks.add(om.MDGMessage.addNodeAddedCallback(self._on_cameras_changed, "camera"))
+        callbacks.add(om.MDGMessage.addNodeRemovedCallback(self._on_cameras_changed, "camera"))
+
+        self.update()
+
+    def stop(self):
+        # type: () -> None
+        """
+        Remove the callbacks. A pending update is dropped.
+        """
+        self._callbacks.remove_all()
+        self._pending = False
+        self._resolved = {}
+        self._cameras = []
+
+    def update(self):
+        # type: () -> bool
+        """
+        Resolve the cameras of the nodes added to the selection since the last update.
+
+        :return: True if the selected cameras changed.
+
+        """
+        self._pending = False
+
+        selection = mc.ls(sl=True, long=True) or []
+        previous = self._resolved
+
+        added = [path for path in selection if path not in previous]
+        resolved = {}
+        if added:
+            added_set = set(added)
+            # A camera resolves from its own shape or its parent transform
+            for cam in resolve_cameras_bulk(added):
+                parent = cam.rsplit("|", 1)[0]
+                if cam in added_set:
+                    resolved.setdefault(cam, []).append(cam)
+                if parent in added_set:
+                    resolved.setdefault(parent, []).append(cam)
+
+        current = {}
+        cameras = []
+        seen = set()
+        for path in selection:
+            path_cameras = previous.get(path)
+            if path_cameras is None:
+                path_cameras = tuple(resolved.get(path, ()))
+            current[path] = path_cameras
+
+            for cam in path_cameras:
+                if cam not in seen:
+                    seen.add(cam)
+                    cameras.append(cam)
+
+        self._resolved = current
+        if cameras == self._cameras:
+            return False
+
+        self._cameras = cameras
+        return True
+
+    # Callbacks
+
+    def _on_selection_changed(self, *args):
+        if self._pending:
+            return
+        self._pending = True
+        self._defer(self._run_pending)
+
+    def _on_cameras_changed(self, *args):
+        self._resolved = {}
+        self._on_selection_changed()
+
+    def _run_pending(self):
+        # Dropped if stopped, or already run by an explicit "update"
+        if not self._pending or not self.active:
+            return
+
+        if self.update() and self.on_change is not None:
+            self.on_change(self._cameras)
+
+
+class IncomingCameras(object):
+    """
+    Collect the cameras created or brought in the scene, and hand them over
+    in batches.
+
+    Cameras created one at a time are handed over once per burst, on the
+    next idle event. Cameras brought in by an import or a reference load
+    are held until the file operation ends, then handed over as one batch,
+    whatever their number.
+
+    Opening or creating a scene is not an arrival: the cameras it creates
+    are ignored.
+
+    Attributes
+    ----------
+    on_cameras: Callable
+        Called with the full paths of each batch of incoming cameras.
+    """
+
+    # Messages starting and ending a file operation bringing cameras in
+    BATCH_MESSAGES = (
+        ("kBeforeImport", "kAfterImport"),
+        ("kBeforeCreateReference", "kAfterCreateReference"),
+        ("kBeforeLoadReference", "kAfterLoadReference"),
+    )
+    # Messages starting and ending a file operation replacing the scene
+    IGNORE_MESSAGES = (
+        ("kBeforeNew", "kAfterNew"),
+        ("kBeforeOpen", "kAfterOpen"),
+    )
+
+    def __init__(self, on_cameras=None, defer=maya.utils.executeDeferred):
+        # type: (Union[Callable[[List[Str]], None], None], Callable) -> None
+        """
+        :param on_cameras: Called with the full paths of each batch of incoming cameras.
+        :param defer: Schedules a function to run on the next idle event.
+        """
+        self.on_cameras = on_cameras
+        self._defer = defer
+        self._pending = False
+        self._incoming = []  # type: List[om.MObjectHandle]
+        self._batch_depth = 0
+        self._ignore_depth = 0
+        self._callbacks = MessageCallbacks()
+
+    @property
+    def active(self):
+        # type: () -> bool
+        return bool(len(self._callbacks))
+
+    def start(self):
+        # type: () -> None
+        """
+        Register the callbacks. Cameras already in the scene are not handed over.
+        """
+        if self.active:
+            return
+
+        callbacks = self._callbacks
+        callbacks.add(om.MDGMessage.addNodeAddedCallback(self._on_node_added, "camera"))
+        for before, after in self.BATCH_MESSAGES:
+            callbacks.add(om.MSceneMessage.addCallback(getattr(om.MSceneMessage, before), self._on_batch_begin))
+            callbacks.add(om.MSceneMessage.addCallback(getattr(om.MSceneMessage, after), self._on_batch_end))
+        for before, after in self.IGNORE_MESSAGES:
+            callbacks.add(om.MSceneMessage.addCallback(getattr(om.MSceneMessage, before), self._on_ignore_begin))
+            callbacks.add(om.MSceneMessage.addCallback(getattr(om.MSceneMessage, after), self._on_ignore_end))
+
+    def stop(self):
+        # type: () -> None
+        """
+        Remove the callbacks. Cameras not handed over yet are dropped.
+        """
+        self._callbacks.remove_all()
+        self._pending = False
+        self._incoming = []
+        self._batch_depth = 0
+        self._ignore_depth = 0
+
+    def flush(self):
+        # type: () -> List[Str]
+        """
+        Return the incoming cameras collected so far, and forget them.
+
+        Cameras deleted since they arrived are left out.
+
+        """
+        self._pending = False
+        incoming = self._incoming
+        self._incoming = []
+
+        paths = []
+        seen = set()
+        for handle in incoming:
+            if not handle.isValid() or handle.hashCode() in seen:
+                continue
+            seen.add(handle.hashCode())
+            paths.append(om.MDagPath.getAPathTo(handle.object()).fullPathName())
+        return paths
+
+    def _schedule(self):
+        if self._pending or not self._incoming:
+            return
+        self._pending = True
+        self._defer(self._run_pending)
+
+    # Callbacks
+
+    def _on_node_added(self, node, *args):
+        if self._ignore_depth:
+            return
+        self._incoming.append(om.MObjectHandle(node))
+        if not self._batch_depth:
+            self._schedule()
+
+    def _on_batch_begin(self, *args):
+        self._batch_depth += 1
+
+    def _on_batch_end(self, *args):
+        self._batch_depth = max(self._batch_depth - 1, 0)
+        if not self._batch_depth:
+            self._schedule()
+
+    def _on_ignore_begin(self, *args):
+        self._ignore_depth += 1
+        self._incoming = []
+
+    def _on_ignore_end(self, *args):
+        self._ignore_depth = max(self._ignore_depth - 1, 0)
+        self._incoming = []
+
+    def _run_pending(self):
+        # Dropped if stopped, or already flushed
+        if not self._pending or not self.active:
+            return
+
+        # Handed over when the file operation ends
+        if self._batch_depth:
+            self._pending = False
+            return
+
+        cameras = self.flush()
+        if cameras and self.on_cameras is not None:
+            self.on_cameras(cameras)
+
+
+# --- Scene Snapshots
+
+def get_file_info(key):
+    # type: (Str) -> Union[Str, None]
+    """
+    Return the value of a "fileInfo" key of the scene, None if not set.
+    """
+    values = mc.fileInfo(key, q=True)
+    return values[0] if values else None
+
+
+class SceneClipSnapshots(object):
+    """
+    History of clip value snapshots, stored in the scene's "fileInfo" so it
+    is saved and reopened with the scene.
+
+    Each snapshot is encoded once, when added, under its own key. An index
+    key lists the ids of the snapshots. The history in memory is reloaded
+    when the index of the scene differs from the one last read or written,
+    e.g. after another scene was opened, which costs one "fileInfo" query.
+
+    Usage:
+
+        snapshots = SceneClipSnapshots()
+        snapshots.add(ClipSnapshot(paths, near, far, "reset_cameras"))
+        snapshot = snapshots.latest()
+    """
+
+    INDEX_KEY = "resetCameraClipPlanesSnapshots"
+    KEY_PREFIX = "resetCameraClipPlanesSnapshot_"
+
+    def __init__(self, max_snapshots=DEFAULT_MAX_SNAPSHOTS, max_cameras=DEFAULT_MAX_CAMERAS):
+        # type: (int, int) -> None
+        self.history = ClipSnapshotHistory(max_snapshots, max_cameras)
+        # Index the history was loaded from or last written, None to load it
+        self._index = None  # type: Union[Str, None]
+
+    def __len__(self):
+        self.sync()
+        return len(self.history)
+
+    def snapshots(self):
+        # type: () -> List[ClipSnapshot]
+        """
+        Return the snapshots of the scene, oldest first.
+        """
+        self.sync()
+        return list(self.history)
+
+    def latest(self):
+        # type: () -> Union[ClipSnapshot, None]
+        self.sync()
+        return self.history.latest()
+
+    def sync(self):
+        # type: () -> None
+        """
+        Reload the history if the scene's snapshots changed.
+        """
+        index = get_file_info(self.INDEX_KEY) or ""
+        if index == self._index:
+            return
+
+        self.history.clear()
+        for snapshot_id in index.split():
+            text = get_file_info(self.KEY_PREFIX + snapshot_id)
+            if text is None:
+                continue
+            try:
+                self.history.add(ClipSnapshot.decode(text))
+            except ClipSnapshotError as err:
+                log.warning('Unable to read clip values snapshot "%s": %s', snapshot_id, err)
+        self._index = index
+
+    def add(self, snapshot):
+        # type: (ClipSnapshot) -> None
+        """
+        Add a snapshot to the scene, evicting the oldest past the history limits.
+        """
+        self.sync()
+        evicted = self.history.add(snapshot)
+        for old in evicted:
+            mc.fileInfo(remove=self.KEY_PREFIX + old.id)
+        mc.fileInfo(self.KEY_PREFIX + snapshot.id, snapshot.encode())
+        self._write_index()
+
+    def remove(self, snapshot):
+        # type: (ClipSnapshot) -> None
+        self.sync()
+        if self.history.remove(snapshot):
+            mc.fileInfo(remove=self.KEY_PREFIX + snapshot.id)
+            self._write_index()
+
+    def clear(self):
+        # type: () -> None
+        self.sync()
+        for snapshot in self.history:
+            mc.fileInfo(remove=self.KEY_PREFIX + snapshot.id)
+        self.history.clear()
+        self._write_index()
+
+    def _write_index(self):
+        index = " ".join(snapshot.id for snapshot in self.history)
+        if index:
+            mc.fileInfo(self.INDEX_KEY, index)
+        elif get_file_info(self.INDEX_KEY) is not None:
+            mc.fileInfo(remove=self.INDEX_KEY)
+        self._index = index
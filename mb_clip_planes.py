@@ -0,0 +1,371 @@
+# coding=utf-8
+"""
+Read and patch camera clip planes in Maya binary (.mb) files, without Maya.
+
+Maya binary files are IFF files: nested chunks of (tag, size, data),
+grouped by "FOR4" / "FOR8" forms. Each node is a form tagged with its node
+type id ("DCAM" for cameras). A node form holds a "CREA" chunk with the node
+and parent names, then one chunk per attribute set in the file.
+
+The file is memory-mapped, and the chunk tree is walked with
+"struct.unpack_from" on the map, so nothing but names is copied. Clip plane
+values are stored as big-endian doubles, so a new value has the same size
+and is patched in place, in a temporary copy of the file that is then
+moved over the original.
+
+Attributes at their default value are not stored in the file. Cameras
+missing a clip plane chunk cannot be patched in place, they are counted as
+"missing" and need to be processed in Maya.
+
+Layout of the chunks used here:
+- 32-bit files ("FOR4"): header is tag (4 bytes) and size (4 bytes), chunk
+  data is padded to 4 bytes.
+- 64-bit files ("FOR8"): header is tag (4 bytes), 4 padding bytes and size
+  (8 bytes), chunk data is padded to 8 bytes.
+- Form data starts with the form type, padded to the same alignment.
+- "CREA" data: a flags byte, the node name, then the parent name, as
+  NUL terminated strings.
+- "DBLE" data: the attribute name, NUL terminated, then the values. The
+  value of a single double attribute is the last 8 bytes of the chunk.
+"""
+
+from collections import namedtuple
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+
+# Type hinting in PyCharm
+try:
+    from typing import Callable, Generator, List, Str, Tuple, Union
+except ImportError:
+    pass
+
+from ma_clip_planes import _replace_file
+from ma_clip_planes import MAYA_DEFAULT_FAR
+from ma_clip_planes import MAYA_DEFAULT_NEAR
+from ma_clip_planes import TEMP_SUFFIX
+
+
+CAMERA_TYPE_IDS = (b"DCAM",)
+
+_IffFormat = namedtuple("_IffFormat", "header alignment")
+
+_IFF_FORMATS = {
+    b"FOR4": _IffFormat(struct.Struct(">4sI"), 4),
+    b"FOR8": _IffFormat(struct.Struct(">4s4xQ"), 8),
+}
+
+_GROUP_TAGS = (
+    b"FOR4", b"LIS4", b"CAT4",
+    b"FOR8", b"LIS8", b"CAT8",
+)
+
+_CREATE_TAG = b"CREA"
+_DOUBLE_TAG = b"DBLE"
+
+_DOUBLE = struct.Struct(">d")
+
+_NEAR_ATTRS = (b"ncp", b"nearClipPlane")
+_FAR_ATTRS = (b"fcp", b"farClipPlane")
+
+# Clip planes of a camera node.
+#   near, far: Values, None when not stored in the file.
+#   near_offset, far_offset: File offset of the values, None when not stored.
+MbCameraClipPlanes = namedtuple(
+    "MbCameraClipPlanes", "name parent near far near_offset far_offset")
+
+# Result of a patch.
+#   cameras: Camera nodes found.
+#   written: Cameras with at least one clip plane value patched.
+#   missing: Cameras with a clip plane not stored in the file, that could not
+#       be patched in place.
+MbPatchResult = namedtuple("MbPatchResult", "cameras written missing")
+
+
+class MayaBinaryFile(object):
+    """
+    Memory-mapped Maya binary file, walked as an IFF chunk tree.
+
+    Use as a context manager:
+
+        with MayaBinaryFile(path) as mb:
+            for camera in mb.cameras():
+                ...
+    """
+
+    def __init__(self, path, writable=False):
+        # type: (Str, bool) -> None
+        self.path = path
+        self.writable = writable
+        self._file = None
+        self._map = None
+        self._format = None  # type: Union[_IffFormat, None]
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open(self):
+        # type: () -> None
+        self._file = open(self.path, "r+b" if self.writable else "rb")
+        if not os.fstat(self._file.fileno()).st_size:
+            self.close()
+            raise ValueError('Not a Maya binary file: "{}"'.format(self.path))
+
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self._map = mmap.mmap(self._file.fileno(), 0, access=access)
+
+        self._format = _IFF_FORMATS.get(self._map[:4])
+        if self._format is None:
+            self.close()
+            raise ValueError('Not a Maya binary file: "{}"'.format(self.path))
+
+    def close(self):
+        # type: () -> None
+        if self._map is not None:
+            if self.writable:
+                self._map.flush()
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # Chunk tree
+
+    def iter_chunks(self, start, end):
+        # type: (int, int) -> Generator[Tuple[bytes, int, int]]
+        """
+        Yield the chunks between two offsets, without descending into groups.
+
+        :param start: Offset of the first chunk header.
+        :param end: Offset where the chunks end.
+
+        :return: (tag, data start offset, data end offset) per chunk.
+
+        """
+        header = self._format.header
+        alignment = self._format.alignment
+        offset = start
+        while offset + header.size <= end:
+            tag, size = header.unpack_from(self._map, offset)
+            data_start = offset + header.size
+            data_end = data_start + size
+            yield tag, data_start, data_end
+            offset = data_end + (-data_end % alignment)
+
+    def group_type(self, data_start):
+        # type: (int) -> Tuple[bytes, int]
+        """
+        Return the type of a group chunk, and the offset of its first child.
+        """
+        return self._map[data_start:data_start + 4], data_start + self._format.alignment
+
+    def iter_nodes(self, start=0, end=None):
+        # type: (int, Union[int, None]) -> Generator[Tuple[bytes, int, int]]
+        """
+        Yield the node forms of the file, at any depth.
+
+        :return: (node type id, first child offset, data end offset) per node.
+
+        """
+        if end is None:
+            end = len(self._map)
+
+        for tag, data_start, data_end in self.iter_chunks(start, end):
+            if tag not in _GROUP_TAGS:
+                continue
+
+            type_id, children_start = self.group_type(data_start)
+            first_child = next(self.iter_chunks(children_start, data_end), None)
+            if first_child and first_child[0] == _CREATE_TAG:
+                yield type_id, children_start, data_end
+            else:
+                for node in self.iter_nodes(children_start, data_end):
+                    yield node
+
+    # Cameras
+
+    def _read_string(self, start, end):
+        # type: (int, int) -> Tuple[Str, int]
+        """
+        Return the NUL terminated string at "start", and the offset after it.
+        """
+        nul = self._map.find(b"\0", start, end)
+        if nul < 0:
+            nul = end
+        return self._map[start:nul].decode("utf-8"), nul + 1
+
+    def cameras(self):
+        # type: () -> Generator[MbCameraClipPlanes]
+        """
+        Yield the clip planes of every camera node in the file.
+        """
+        for type_id, children_start, data_end in self.iter_nodes():
+            if type_id not in CAMERA_TYPE_IDS:
+                continue
+
+            name = parent = ""
+            near = far = near_offset = far_offset = None
+
+            for tag, chunk_start, chunk_end in self.iter_chunks(children_start, data_end):
+                if tag == _CREATE_TAG:
+                    # Skip the flags byte
+                    name, offset = self._read_string(chunk_start + 1, chunk_end)
+                    if offset < chunk_end:
+                        parent, _ = self._read_string(offset, chunk_end)
+
+                elif tag == _DOUBLE_TAG:
+                    nul = self._map.find(b"\0", chunk_start, chunk_end)
+                    value_offset = chunk_end - _DOUBLE.size
+                    if nul < 0 or value_offset <= nul:
+                        continue
+
+                    attr = self._map[chunk_start:nul].lstrip(b".")
+
+                    if attr in _NEAR_ATTRS:
+                        near_offset = value_offset
+                        near = _DOUBLE.unpack_from(self._map, value_offset)[0]
+                    elif attr in _FAR_ATTRS:
+                        far_offset = value_offset
+                        far = _DOUBLE.unpack_from(self._map, value_offset)[0]
+
+            yield MbCameraClipPlanes(name, parent, near, far, near_offset, far_offset)
+
+    def write_double(self, offset, value):
+        # type: (int, float) -> None
+        """
+        Overwrite the big-endian double at "offset".
+        """
+        if not self.writable:
+            raise IOError('"{}" was not opened for writing'.format(self.path))
+        _DOUBLE.pack_into(self._map, offset, value)
+
+
+def read_mb_clip_planes(path):
+    # type: (Str) -> List[MbCameraClipPlanes]
+    """
+    Return the clip planes of every camera node in a Maya binary file.
+
+    :param path: Path of the .mb file.
+
+    :return: Clip planes per camera.
+
+    """
+    with MayaBinaryFile(path) as mb:
+        return list(mb.cameras())
+
+
+def patch_mb_clip_planes(path, clip_values, camera_filter=None):
+    # type: (Str, ClipPair, Union[Callable[[Str, Str], bool], None]) -> MbPatchResult
+    """
+    Set the camera clip planes of a Maya binary file, in place.
+
+    :param path: Path of the .mb file to patch.
+    :param clip_values: The values to set the near and far clip planes to.
+    :param camera_filter: Optional callable taking a camera shape name and its
+        parent name, returning False for cameras to leave untouched.
+
+    :return: Counts of cameras found, written and missing a clip plane.
+
+    """
+    with MayaBinaryFile(path, writable=True) as mb:
+        edits, result = _find_mb_edits(mb, clip_values, camera_filter)
+        for offset, value in edits:
+            mb.write_double(offset, value)
+
+    return result
+
+
+def _find_mb_edits(mb, clip_values, camera_filter=None):
+    # type: (MayaBinaryFile, ClipPair, Union[Callable[[Str, Str], bool], None]) -> Tuple[List[Tuple[int, float]], MbPatchResult]
+    """
+    Return the clip plane values to write to set the camera clip planes of
+    an open .mb file, without writing them.
+
+    :return: (offset, value) of each double to write, and the counts of
+        cameras found, to write and missing a clip plane.
+
+    """
+    near = float(clip_values.near)
+    far = float(clip_values.far)
+
+    edits = []
+    cameras = written = missing = 0
+    for camera in mb.cameras():
+        cameras += 1
+        if camera_filter is not None and not camera_filter(camera.name, camera.parent):
+            continue
+
+        edited = is_missing = False
+        for offset, current, value, default in (
+            (camera.near_offset, camera.near, near, MAYA_DEFAULT_NEAR),
+            (camera.far_offset, camera.far, far, MAYA_DEFAULT_FAR),
+        ):
+            if offset is None:
+                # Not stored, the attribute is at its default value
+                is_missing |= value != default
+            elif current != value:
+                edits.append((offset, value))
+                edited = True
+
+        written += edited
+        missing += is_missing
+
+    return edits, MbPatchResult(cameras, written, missing)
+
+
+def patch_mb_file(src_path, clip_values, dst_path=None, camera_filter=None):
+    # type: (Str, ClipPair, Union[Str, None], Union[Callable[[Str, Str], bool], None]) -> MbPatchResult
+    """
+    Set the camera clip planes of a .mb file.
+
+    The file is first scanned read-only. When editing in place and no
+    camera needs an edit, it is left untouched and nothing is copied.
+    Otherwise it is copied to a temporary file next to the destination,
+    patched there and moved in place once complete, like "rewrite_ma_file",
+    so an interrupted run never leaves a half patched scene.
+
+    :param src_path: Path of the .mb file to read.
+    :param clip_values: The values to set the near and far clip planes to.
+    :param dst_path: Path to write the result to, "src_path" if None.
+    :param camera_filter: See "patch_mb_clip_planes".
+
+    :return: Counts of cameras found, written and missing a clip plane.
+
+    :raises ValueError: If "src_path" is not a Maya binary file.
+
+    """
+    dst_path = dst_path or src_path
+
+    with MayaBinaryFile(src_path) as mb:
+        edits, result = _find_mb_edits(mb, clip_values, camera_filter)
+
+    if not edits and os.path.abspath(dst_path) == os.path.abspath(src_path):
+        return result
+
+    dst_dir = os.path.dirname(os.path.abspath(dst_path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix="." + os.path.basename(dst_path) + ".", suffix=TEMP_SUFFIX, dir=dst_dir)
+    os.close(fd)
+    try:
+        shutil.copyfile(src_path, tmp_path)
+        shutil.copymode(src_path, tmp_path)
+        if edits:
+            # The copy has the same layout, the offsets found still apply
+            with MayaBinaryFile(tmp_path, writable=True) as mb:
+                for offset, value in edits:
+                    mb.write_double(offset, value)
+
+        _replace_file(tmp_path, dst_path)
+        tmp_path = None
+    finally:
+        if tmp_path is not None:
+            os.remove(tmp_path)
+
+    return result
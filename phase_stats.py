@@ -0,0 +1,287 @@
+# coding=utf-8
+"""
+Per-phase timing of the tool's operations. It does not depend on Maya.
+
+Each operation (e.g. a reset) records its wall time and, per phase (e.g.
+"resolve", "read", "write", "notify"), the time spent, the number of times
+the phase ran and the number of items it processed. The last runs are kept
+in a ring buffer.
+
+Phases are recorded against the current operation, so code deep in a call
+can be timed without passing the timing object down:
+
+    stats = PhaseStats()
+    with stats.operation("reset_cameras"):
+        with stats.phase("resolve"):
+            ...
+
+Outside an operation, "phase" does nothing.
+
+An operation can also span several calls, e.g. steps run from a timer, with
+"begin", "resume" and "end".
+
+When "profile_dir" is set, every operation is also profiled with cProfile
+and the profile dumped there, to be opened with "pstats" or snakeviz.
+"""
+
+from collections import deque
+from collections import OrderedDict
+from contextlib import contextmanager
+import cProfile
+import datetime
+import itertools
+import logging
+import os
+import time
+
+# Type hinting in PyCharm
+try:
+    from typing import Dict, Generator, Int, List, Str, Union
+except ImportError:
+    pass
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HISTORY = 50
+
+PROFILE_SUFFIX = ".prof"
+
+
+class PhaseTiming(object):
+    """
+    Time spent in a phase of an operation.
+    """
+
+    __slots__ = ("seconds", "calls", "items")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.items = 0
+
+
+class OperationTiming(object):
+    """
+    Timing of a single run of an operation.
+
+    Attributes
+    ----------
+    name: Str
+        Name of the operation.
+    started: float
+        Time the operation began, as from "time.time".
+    seconds: float
+        Wall time spent in the operation, excluding the time between steps
+        of an operation spanning several calls.
+    elapsed: float
+        Wall time from the beginning to the end of the operation.
+    phases: OrderedDict
+        PhaseTiming per phase name, in the order they first ran.
+    profile_path: Str
+        Path the cProfile capture was dumped to, None unless profiled.
+    """
+
+    def __init__(self, name):
+        # type: (Str) -> None
+        self.name = name
+        self.started = time.time()
+        self.seconds = 0.0
+        self.elapsed = 0.0
+        self.phases = OrderedDict()  # type: Dict[Str, PhaseTiming]
+        self.profile_path = None  # type: Union[Str, None]
+        self._profile = None  # type: Union[cProfile.Profile, None]
+
+    def add(self, phase, seconds, items=None):
+        # type: (Str, float, Union[Int, None]) -> None
+        """
+        Record a run of "phase".
+
+        :param phase: Name of the phase.
+        :param seconds: Wall time of the run.
+        :param items: Number of items processed by the run, if relevant.
+
+        """
+        timing = self.phases.get(phase)
+        if timing is None:
+            timing = self.phases[phase] = PhaseTiming()
+        timing.seconds += seconds
+        timing.calls += 1
+        if items is not None:
+            timing.items += items
+
+    def as_dict(self):
+        # type: () -> OrderedDict
+        result = OrderedDict()
+        result["name"] = self.name
+        result["started"] = self.started
+        result["seconds"] = self.seconds
+        result["elapsed"] = self.elapsed
+        result["phases"] = OrderedDict(
+            (name, {"seconds": t.seconds, "calls": t.calls, "items": t.items})
+            for name, t in self.phases.items()
+        )
+        result["profile_path"] = self.profile_path
+        return result
+
+    def format(self):
+        # type: () -> Str
+        """
+        Return a readable report of the run, one line per phase.
+        """
+        started = datetime.datetime.fromtimestamp(self.started).strftime("%H:%M:%S")
+        lines = ["{} at {}: {:.2f} ms".format(self.name, started, self.seconds * 1000.0)]
+        if self.elapsed > self.seconds * 1.01:
+            lines[0] += " ({:.2f} ms elapsed)".format(self.elapsed * 1000.0)
+
+        for name, t in self.phases.items():
+            line = "    {:<10} {:>10.2f} ms  x{}".format(name, t.seconds * 1000.0, t.calls)
+            if t.items:
+                line += "  {} item(s)".format(t.items)
+            lines.append(line)
+
+        if self.profile_path:
+            lines.append("    profile: {}".format(self.profile_path))
+        return "\n".join(lines)
+
+
+class PhaseStats(object):
+    """
+    Ring buffer of the last operation timings, and the current operation.
+
+    Attributes
+    ----------
+    runs: deque
+        OperationTiming of the last "history" operations, oldest first.
+    profile_dir: Str
+        If set, profile every operation with cProfile, dumped in this folder.
+    """
+
+    def __init__(self, history=DEFAULT_HISTORY):
+        # type: (Int) -> None
+        self.runs = deque(maxlen=history)
+        self.profile_dir = None  # type: Union[Str, None]
+        self._current = None  # type: Union[OperationTiming, None]
+        self._profile_ids = itertools.count()
+
+    def __len__(self):
+        return len(self.runs)
+
+    def __iter__(self):
+        return iter(self.runs)
+
+    def clear(self):
+        # type: () -> None
+        self.runs.clear()
+
+    def last(self):
+        # type: () -> Union[OperationTiming, None]
+        return self.runs[-1] if self.runs else None
+
+    # Operations
+
+    def begin(self, name):
+        # type: (Str) -> OperationTiming
+        """
+        Begin an operation, to be run with "resume" and recorded with "end".
+        """
+        timing = OperationTiming(name)
+        if self.profile_dir:
+            timing._profile = cProfile.Profile()
+        return timing
+
+    @contextmanager
+    def resume(self, timing):
+        # type: (OperationTiming) -> Generator[OperationTiming]
+        """
+        Context manager making "timing" the current operation.
+        """
+        previous = self._current
+        self._current = timing
+        if timing._profile is not None:
+            timing._profile.enable()
+        start = timer()
+        try:
+            yield timing
+        finally:
+            timing.seconds += timer() - start
+            if timing._profile is not None:
+                timing._profile.disable()
+            self._current = previous
+
+    def end(self, timing):
+        # type: (OperationTiming) -> None
+        """
+        Record the operation in the ring buffer, and dump its profile.
+        """
+        timing.elapsed = time.time() - timing.started
+        if timing._profile is not None:
+            timing.profile_path = self._dump_profile(timing)
+            timing._profile = None
+            log.info('Profile of "%s" written to "%s"', timing.name, timing.profile_path)
+        self.runs.append(timing)
+
+    @contextmanager
+    def operation(self, name):
+        # type: (Str) -> Generator[OperationTiming]
+        """
+        Context manager timing an operation run in a single call.
+        """
+        timing = self.begin(name)
+        try:
+            with self.resume(timing):
+                yield timing
+        finally:
+            self.end(timing)
+
+    @contextmanager
+    def phase(self, name, items=None):
+        # type: (Str, Union[Int, None]) -> Generator[None]
+        """
+        Context manager timing a phase of the current operation.
+
+        :param name: Name of the phase.
+        :param items: Number of items processed by the phase, if relevant.
+
+        """
+        timing = self._current
+        if timing is None:
+            yield
+            return
+
+        start = timer()
+        try:
+            yield
+        finally:
+            timing.add(name, timer() - start, items)
+
+    # Reports
+
+    def format(self):
+        # type: () -> Str
+        """
+        Return a readable report of the runs, newest first.
+        """
+        if not self.runs:
+            return "No operation recorded yet."
+        return "\n\n".join(timing.format() for timing in reversed(self.runs))
+
+    def as_list(self):
+        # type: () -> List[OrderedDict]
+        return [timing.as_dict() for timing in self.runs]
+
+    def _dump_profile(self, timing):
+        # type: (OperationTiming) -> Str
+        if not os.path.isdir(self.profile_dir):
+            os.makedirs(self.profile_dir)
+
+        stamp = datetime.datetime.fromtimestamp(timing.started).strftime("%Y%m%d_%H%M%S")
+        name = "{}_{}_{}{}".format(timing.name, stamp, next(self._profile_ids), PROFILE_SUFFIX)
+        path = os.path.join(self.profile_dir, name)
+        timing._profile.dump_stats(path)
+        return path
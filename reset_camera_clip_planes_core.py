@@ -0,0 +1,1062 @@
+# coding=utf-8
+"""
+Headless core of the reset camera clip planes tool: "MayaResetCameraClipPlanes"
+and the jobs it returns.
+
+It imports no Qt and no Maya UI modules, so batch scripts and "mayapy -batch"
+can use it without the cost of the UI. The UI lives in
+"reset_camera_clip_planes_ui".
+"""
+
+__VERSION__ = "0.0.3"
+
+from collections import namedtuple
+from collections import OrderedDict
+from itertools import compress
+import logging
+
+# Type hinting in PyCharm
+try:
+    from typing import Callable, Float, Iterable, Int, List, Str, Tuple, Union
+except ImportError:
+    pass
+
+# Maya imports
+import maya.cmds as mc
+
+from camera_set import CameraSet
+from clip_audit import audit_cameras
+from clip_audit import AuditCamera
+from clip_audit import DEFAULT_DEPTH_FORMAT
+from clip_audit import DEFAULT_DISTANCES
+from clip_audit import DEFAULT_MAX_RELATIVE_ERROR
+from clip_fit import BoxClusters
+from clip_fit import clip_masks
+from clip_fit import count_clipped
+from clip_fit import DEFAULT_MIN_NEAR
+from clip_fit import DEFAULT_PADDING
+from clip_fit import fit_clip_planes
+from clip_fit import transform_bounds
+from clip_planes import CLIP_VALUE_TOLERANCE
+from clip_planes import ClipPair
+from clip_planes import DEFAULT_CLIP_PLANE_FAR
+from clip_planes import DEFAULT_CLIP_PLANE_NEAR
+from clip_snapshots import ClipSnapshot
+from log_utils import CameraList
+from log_utils import CameraSample
+from maya_cameras import CameraManipState
+from maya_cameras import CameraRegistry
+from maya_cameras import ChunkedClipValuesWriter
+from maya_cameras import ContextViewReader
+from maya_cameras import FailedToResolveFromSelectionError
+from maya_cameras import frame_range
+from maya_cameras import get_all_cameras
+from maya_cameras import get_cameras_attributes_on
+from maya_cameras import get_cameras_audit_data
+from maya_cameras import get_cameras_view_data
+from maya_cameras import get_geometry_paths
+from maya_cameras import get_geometry_world_bounds
+from maya_cameras import get_selected_cameras
+from maya_cameras import NothingSelectedError
+from maya_cameras import SceneClipSnapshots
+from maya_cameras import set_cameras_clip_keys
+from maya_cameras import set_cameras_clip_values
+from maya_cameras import set_cameras_clip_values_rows
+from phase_stats import PhaseStats
+
+
+log = logging.getLogger(__name__)
+
+# If Maya runs without UI, queried on the first message
+_batch_mode = None  # type: Union[bool, None]
+
+
+# --- Maya Utility Functions
+
+def _in_view_msg(msg):
+    # type: (Str) -> None
+    global _batch_mode
+    if _batch_mode is None:
+        _batch_mode = mc.about(batch=True)
+
+    # There is no viewport to show messages in under "mayapy -batch"
+    if _batch_mode:
+        return
+    mc.inViewMessage(assistMessage=msg, pos='topRight', fade=True, fontSize=8)
+
+
+def _in_view_msg_info(msg):
+    prefix = "<span style=\"color:green;\">Info: </span>"
+    _in_view_msg(prefix + msg)
+
+
+def _in_view_msg_warn(msg):
+    prefix = "<span style=\"color:#F05A5A;\">Warning: </span>"
+    _in_view_msg(prefix + msg)
+
+
+def _in_view_msg_error(msg):
+    prefix = "<span style=\"color:red;\">Error: </span>"
+    _in_view_msg(prefix + msg)
+
+
+# Cameras and clip values a reset writes.
+#   resolved: Every camera resolved for the mode, less the excluded ones.
+#   skipped: Resolved cameras left out because their values are unchanged.
+#   excluded: Number of cameras excluded by the rules.
+ResetPlan = namedtuple("ResetPlan", "cameras clip_values resolved skipped excluded")
+
+
+# Encapsulate "Maya Reset Camera Clip Planes" behaviour as it's own object.
+# This is so it can be easily augmented with a different UI Frame work.
+class MayaResetCameraClipPlanes(object):
+    """
+    Class to handle resetting cameras clip planes in a Maya scene.
+
+    Attributes
+    ----------
+    action_map: Dict
+        Used to resolve the set of cameras to reset depending
+        on the "mode" value which is used as the key.
+
+    mode: Str
+        Property to define which cameras to resolve for "self.get_cameras()".
+
+    clip_values: ClipPair
+        The values to set the near and far clip planes for the camera(s).
+
+    auto_fit: bool
+        If True, fit each camera's clip planes to the geometry it sees.
+        "clip_values" is used for cameras that see no geometry.
+
+    audit_distances: Tuple[Float]
+        Distances "audit_cameras" checks the depth precision at, see "clip_audit".
+
+    audit_max_relative_error: Float
+        Largest depth resolution relative to the distance before a camera is flagged.
+
+    audit_depth_format: Str
+        Depth buffer format cameras are flagged against, a key of "clip_audit.DEPTH_FORMATS".
+
+    rules: ClipRuleSet
+        Per-camera clip values or exclusions, matched by name, namespace,
+        path or attribute. Cameras matching no rule get "clip_values", or
+        are fitted with "auto_fit". None to treat every camera the same.
+
+    skip_unchanged: bool
+        If True, read the current clip values first and only write the
+        cameras whose values differ by more than "tolerance". Unchanged
+        cameras are not dirtied and get no reference edits.
+
+    camera_registry: CameraRegistry
+        Live index of the scene cameras used by the "all" mode,
+        None unless enabled with "use_camera_registry".
+
+    stats: PhaseStats
+        Wall time and call counts per phase of the last operations run.
+        Set "stats.profile_dir" to also capture them with cProfile.
+
+    manip_state: CameraManipState
+        Clip planes manipulator visibility set on the cameras, so toggles
+        only edit the cameras not already in the requested state.
+
+    take_snapshots: bool
+        If True, record the clip values the cameras had before each reset
+        wrote them, for "restore_snapshot". Resets of "enforce_clip_values"
+        are not recorded.
+
+    snapshots: SceneClipSnapshots
+        Last snapshots of clip values, saved with the scene.
+    """
+
+    # Map to resolve which set of cameras will be acted upon.
+    action_map = OrderedDict()
+    action_map["selected"] = get_selected_cameras
+    action_map["all"] = get_all_cameras
+
+    DEFAULT_NEAR = DEFAULT_CLIP_PLANE_NEAR
+    DEFAULT_FAR = DEFAULT_CLIP_PLANE_FAR
+
+    def __init__(self, use_camera_registry=False):
+
+        self.mode = list(self.action_map.keys())[0]  # type: Str
+        self.clip_values = ClipPair(near=self.DEFAULT_NEAR, far=self.DEFAULT_FAR)
+
+        self.auto_fit = False
+        self.auto_fit_min_near = DEFAULT_MIN_NEAR
+        self.auto_fit_padding = DEFAULT_PADDING
+
+        self.rules = None  # type: Union[ClipRuleSet, None]
+
+        self.audit_distances = DEFAULT_DISTANCES
+        self.audit_max_relative_error = DEFAULT_MAX_RELATIVE_ERROR
+        self.audit_depth_format = DEFAULT_DEPTH_FORMAT
+
+        self.skip_unchanged = False
+        self.tolerance = CLIP_VALUE_TOLERANCE
+
+        self.stats = PhaseStats()
+
+        self.manip_state = CameraManipState()
+
+        self.take_snapshots = True
+        self.snapshots = SceneClipSnapshots()
+
+        self.camera_registry = None  # type: Union[CameraRegistry, None]
+        if use_camera_registry:
+            self.camera_registry = CameraRegistry()
+            self.camera_registry.start()
+
+            # "all" reads the live registry instead of scanning the scene
+            self.set_mode("all", self.camera_registry.cameras)
+
+    def set_mode(self, mode, get_cameras_func):
+        # type: (Str, Callable[[], Iterable[Str]]) -> None
+        """
+        Add or replace a mode, for this instance only.
+
+        :param mode: Name of the mode, a key of "action_map".
+        :param get_cameras_func: Callable returning the cameras the mode resolves.
+
+        """
+        if self.action_map is type(self).action_map:
+            self.action_map = OrderedDict(self.action_map)
+        self.action_map[mode] = get_cameras_func
+
+    def close(self):
+        # type: () -> None
+        """
+        Release the Maya callbacks held by this object.
+        """
+        if self.camera_registry:
+            self.camera_registry.stop()
+
+    def open(self):
+        # type: () -> None
+        """
+        Register again the Maya callbacks released by "close".
+        """
+        if self.camera_registry:
+            self.camera_registry.start()
+
+    def reset_cameras(self):
+        # type: () -> None
+
+        with self.stats.operation("reset_cameras"):
+            plan = self.plan_reset()
+            if plan is None:
+                return
+
+            self.apply_reset(plan)
+
+    def enforce_clip_values(self, cameras):
+        # type: (List[Str]) -> Int
+        """
+        Reset the clip planes of cameras that just arrived in the scene,
+        e.g. a batch from "maya_cameras.IncomingCameras".
+
+        Rules, "auto_fit" and "skip_unchanged" apply as for a reset of "mode".
+        No snapshot is taken: batches arrive on every import or reference
+        load, and would evict the snapshots of the user's own resets.
+
+        :param cameras: Camera shapes to reset.
+
+        :return: Number of cameras written.
+
+        """
+        with self.stats.operation("enforce_clip_values"):
+            plan = self.plan_reset(cameras)
+            if plan is None:
+                return 0
+
+            return self.apply_reset(plan, label=None)
+
+    def apply_reset(self, plan, label="reset_cameras"):
+        # type: (ResetPlan, Str) -> Int
+        """
+        Write the clip values of a reset in one go, and report it.
+
+        The values are read before the write, and the cameras written are
+        recorded with them in a snapshot once it is done. Cameras whose
+        write failed kept their values and are left out.
+
+        :param plan: The reset, as returned by "plan_reset".
+        :param label: Operation named in the snapshot of the previous values,
+            None to take no snapshot.
+
+        :return: Number of cameras written.
+
+        """
+        cameras = plan.cameras
+        snapshot = label is not None and self.take_snapshots
+        if snapshot and not cameras.clip_values_read:
+            with self.stats.phase("read", len(cameras)):
+                cameras.read_clip_values()
+
+        with self.stats.phase("write", len(cameras)):
+            rows = set_cameras_clip_values_rows(cameras, plan.clip_values)
+
+        if snapshot:
+            self.snapshot_clip_values(cameras if len(rows) == len(cameras) else cameras.take(rows), label)
+        self.report_reset(plan, len(rows))
+        return len(rows)
+
+    def snapshot_clip_values(self, cameras, label):
+        # type: (CameraSet, Str) -> Union[ClipSnapshot, None]
+        """
+        Record the clip values of cameras, if "take_snapshots".
+
+        Values already read, e.g. before a write or for "skip_unchanged",
+        are not read again.
+
+        :param cameras: Cameras written, with the values they had before.
+        :param label: Operation writing them.
+
+        :return: The snapshot added to "snapshots", None if none was taken.
+
+        """
+        if not self.take_snapshots or not cameras:
+            return None
+
+        with self.stats.phase("snapshot", len(cameras)):
+            if not cameras.clip_values_read:
+                cameras.read_clip_values()
+            snapshot = ClipSnapshot(cameras.paths, cameras.near, cameras.far, label)
+            self.snapshots.add(snapshot)
+        return snapshot
+
+    def restore_snapshot(self, snapshot=None):
+        # type: (Union[ClipSnapshot, None]) -> Int
+        """
+        Write back the clip values of a snapshot in one batch, as one undo
+        step, and remove it from "snapshots". Cameras no longer in the
+        scene are skipped.
+
+        :param snapshot: Snapshot to restore, None for the latest.
+
+        :return: Number of cameras written.
+
+        """
+        cls_name = self.__class__.__name__
+
+        with self.stats.operation("restore_snapshot"):
+            with self.stats.phase("resolve"):
+                if snapshot is None:
+                    snapshot = self.snapshots.latest()
+                if snapshot is None:
+                    msg = "[{}] no clip values snapshot to restore".format(cls_name)
+                    log.warning(msg)
+                    _in_view_msg_warn(msg)
+                    return 0
+
+                cameras = CameraSet(snapshot.paths, snapshot.near, snapshot.far)
+                cameras = cameras.intersection(self.action_map["all"]())
+
+            with self.stats.phase("write", len(cameras)):
+                written = set_cameras_clip_values(cameras.paths, zip(cameras.near, cameras.far))
+            self.snapshots.remove(snapshot)
+
+            with self.stats.phase("notify"):
+                log.info(
+                    "Restored clip values snapshot %s of %s, written: %d, missing: %d",
+                    snapshot.id, CameraSample(cameras), written, len(snapshot) - len(cameras),
+                )
+                msg = "[{}] restore complete, {} of {} camera(s) written".format(
+                    cls_name, written, len(snapshot))
+                if written < len(snapshot):
+                    _in_view_msg_warn(msg)
+                else:
+                    _in_view_msg_info(msg)
+
+        return written
+
+    def reset_cameras_incremental(self):
+        # type: () -> Union[IncrementalReset, None]
+        """
+        Resolve the cameras to reset, and return a job setting their clip
+        values over many time-limited steps. See "IncrementalReset".
+
+        :return: The job, not started yet. None if nothing can be reset.
+
+        """
+        timing = self.stats.begin("reset_cameras_incremental")
+        with self.stats.resume(timing):
+            plan = self.plan_reset()
+
+        if plan is None:
+            self.stats.end(timing)
+            return None
+
+        return IncrementalReset(self, plan, timing)
+
+    def plan_reset(self, cameras=None):
+        # type: (Union[List[Str], None]) -> Union[ResetPlan, None]
+        """
+        Resolve the cameras to reset and the clip values to write them.
+
+        Errors are reported to the user in the viewport.
+
+        :param cameras: Camera shapes to reset, None for the cameras of "mode".
+
+        :return: The cameras and values to write, None if nothing can be reset.
+
+        """
+        if cameras is None:
+            cameras = self.resolve_mode_cameras()
+            if cameras is None:
+                return None
+        elif not isinstance(cameras, CameraSet):
+            cameras = CameraSet(cameras)
+
+        resolved = self.resolve_clip_values(cameras)
+        if resolved is None:
+            return None
+        cameras, clip_values, excluded = resolved
+
+        if self.skip_unchanged:
+            cameras_to_write, clip_values = self.changed_clip_values(cameras, clip_values)
+        else:
+            cameras_to_write = cameras
+
+        return ResetPlan(
+            cameras=cameras_to_write, clip_values=clip_values, resolved=cameras,
+            skipped=len(cameras) - len(cameras_to_write), excluded=excluded,
+        )
+
+    def resolve_clip_values(self, cameras, bounds=None):
+        # type: (CameraSet, Union[Tuple, None]) -> Union[Tuple[CameraSet, List[ClipPair], Int], None]
+        """
+        Resolve the clip values a reset would write to cameras: the values
+        of their rule, else fitted with "auto_fit", else "clip_values".
+
+        Errors are reported to the user in the viewport.
+
+        :param cameras: Camera shapes to resolve the values of.
+        :param bounds: Geometry bounds "auto_fit" fits to, see "fit_clip_values".
+
+        :return: The cameras not excluded by the rules, their clip values,
+            and the number of cameras excluded. None if the values could not
+            be resolved.
+
+        """
+        cls_name = self.__class__.__name__
+
+        excluded = 0
+        if self.rules:
+            resolved_count = len(cameras)
+            cameras, rule_values = self.rule_clip_values(cameras)
+            excluded = resolved_count - len(cameras)
+        else:
+            rule_values = [None] * len(cameras)
+
+        # Cameras no rule matched get the default values
+        default_cameras = cameras.compress(values is None for values in rule_values)
+        if self.auto_fit and default_cameras:
+            try:
+                default_values = self.fit_clip_values(default_cameras, bounds)
+            except ImportError as err:
+                msg = "[{}] {}".format(cls_name, err)
+                log.error(msg)
+                _in_view_msg_error(msg)
+                return None
+
+        else:
+            near = float(self.clip_values.near)
+            far = float(self.clip_values.far)
+            default_values = [ClipPair(near, far)] * len(default_cameras)
+
+        if len(default_cameras) == len(cameras):
+            clip_values = default_values
+        else:
+            default_values = iter(default_values)
+            clip_values = [next(default_values) if values is None else values for values in rule_values]
+
+        return cameras, clip_values, excluded
+
+    def resolve_mode_cameras(self):
+        # type: () -> Union[CameraSet, None]
+        """
+        Resolve the cameras of "mode".
+
+        Errors are reported to the user in the viewport.
+
+        :return: Camera shapes, None if they could not be resolved.
+
+        """
+        cls_name = self.__class__.__name__
+
+        get_cameras_func = self.action_map.get(self.mode)  # type: Callable
+        log.debug('get_cameras_func: "%s"', get_cameras_func.__name__)
+        try:
+            with self.stats.phase("resolve"):
+                return CameraSet(get_cameras_func())
+
+        except NothingSelectedError as err:
+            msg = "[{}] {}".format(cls_name, err)
+            _in_view_msg_error(msg)
+            return None
+        except FailedToResolveFromSelectionError as err:
+            msg = "[{}] {}".format(cls_name, err)
+            _in_view_msg_error(msg)
+            return None
+
+    def audit_cameras(self):
+        # type: () -> Union[List[OrderedDict], None]
+        """
+        Audit the depth precision given by the clip planes of the cameras of "mode".
+
+        See "clip_audit.audit_cameras" for the report rows. The number of
+        cameras flagged is reported in the viewport.
+
+        :return: Report row per camera, None if nothing could be audited.
+
+        """
+        cls_name = self.__class__.__name__
+
+        with self.stats.operation("audit_cameras"):
+            cameras = self.resolve_mode_cameras()
+            if cameras is None:
+                return None
+
+            with self.stats.phase("read", len(cameras)):
+                data = get_cameras_audit_data(cameras)
+                scene = mc.file(q=True, sceneName=True) or ""
+
+            audit_cams = [
+                AuditCamera(scene, cam, near, far, orthographic, focal_length)
+                for cam, (near, far, orthographic, focal_length) in zip(cameras, data)
+            ]
+            try:
+                with self.stats.phase("audit", len(cameras)):
+                    rows = list(audit_cameras(
+                        audit_cams, self.audit_distances, self.audit_max_relative_error, self.audit_depth_format))
+            except ImportError as err:
+                msg = "[{}] {}".format(cls_name, err)
+                log.error(msg)
+                _in_view_msg_error(msg)
+                return None
+
+            with self.stats.phase("notify"):
+                flagged = [row for row in rows if row["flagged"]]
+                for row in flagged:
+                    log.warning(
+                        'Poor depth precision on "%s": near %g, far %g, suggested near %s',
+                        row["camera"], row["near"], row["far"], row["suggested_near"])
+
+                msg = "[{}] audit complete, {} of {} camera(s) flagged".format(cls_name, len(flagged), len(rows))
+                log.info(msg)
+                if flagged:
+                    _in_view_msg_warn(msg)
+                else:
+                    _in_view_msg_info(msg)
+
+        return rows
+
+    def preview_clip_values(self):
+        # type: () -> Union[ClipPreview, None]
+        """
+        Count, per camera of "mode", the visible geometry that the clip
+        values a reset would write would cut, without writing anything.
+
+        The clip values are resolved as for a reset: rules and "auto_fit"
+        apply, "skip_unchanged" does not. Errors are reported to the user
+        in the viewport.
+
+        :return: The preview, None if nothing could be previewed.
+
+        """
+        cls_name = self.__class__.__name__
+
+        with self.stats.operation("preview_clip_values"):
+            cameras = self.resolve_mode_cameras()
+            if cameras is None:
+                return None
+
+            with self.stats.phase("read"):
+                geometry = get_geometry_paths()
+                bounds_min, bounds_max = get_geometry_world_bounds(paths=geometry)
+
+            try:
+                boxes = None
+                if geometry:
+                    with self.stats.phase("preview"):
+                        boxes = BoxClusters(bounds_min, bounds_max)
+                    bounds = (boxes, None)
+                else:
+                    bounds = (bounds_min, bounds_max)
+
+                resolved = self.resolve_clip_values(cameras, bounds)
+                if resolved is None:
+                    return None
+                cameras, clip_values, _ = resolved
+
+                with self.stats.phase("read", len(cameras)):
+                    matrices, orthographic, half_widths, half_heights = get_cameras_view_data(cameras)
+
+                with self.stats.phase("preview", len(cameras)):
+                    if boxes is None or not cameras:
+                        clipped = partial = [0] * len(cameras)
+                    else:
+                        clipped, partial = count_clipped(
+                            matrices, orthographic, half_widths, half_heights, boxes, None,
+                            [float(values.near) for values in clip_values],
+                            [float(values.far) for values in clip_values],
+                        )
+                        clipped = clipped.tolist()
+                        partial = partial.tolist()
+
+            except ImportError as err:
+                msg = "[{}] {}".format(cls_name, err)
+                log.error(msg)
+                _in_view_msg_error(msg)
+                return None
+
+            preview = ClipPreview(
+                cameras, clip_values, clipped, partial, geometry, boxes,
+                (matrices, orthographic, half_widths, half_heights),
+            )
+
+            with self.stats.phase("notify"):
+                cutting = sum(1 for cam_clipped, cam_partial in zip(clipped, partial) if cam_clipped or cam_partial)
+                log.info(
+                    "Previewed clip values on %s, geometry: %d, cameras cutting geometry: %d",
+                    CameraSample(cameras), len(geometry), cutting,
+                    extra={"camera_count": len(cameras)},
+                )
+                msg = "[{}] preview complete, {} of {} camera(s) would clip geometry".format(
+                    cls_name, cutting, len(cameras))
+                if cutting:
+                    _in_view_msg_warn(msg)
+                else:
+                    _in_view_msg_info(msg)
+
+        return preview
+
+    def rule_clip_values(self, cameras):
+        # type: (CameraSet) -> Tuple[CameraSet, List[Union[ClipPair, None]]]
+        """
+        Match "rules" against the cameras, in one pass.
+
+        :param cameras: Camera shapes to match.
+
+        :return: The cameras not excluded, and for each the clip values of
+            its rule, None when no rule matched.
+
+        """
+        rules = self.rules
+
+        attributes = None
+        if rules.attributes:
+            with self.stats.phase("read", len(cameras)):
+                attributes = get_cameras_attributes_on(cameras, rules.attributes)
+
+        with self.stats.phase("rules", len(cameras)):
+            matched = rules.resolve(cameras.paths, attributes)
+
+            kept = [rule is None or rule.clip_values is not None for rule in matched]
+            rule_values = [rule and rule.clip_values for rule in compress(matched, kept)]
+
+        return cameras.compress(kept), rule_values
+
+    def report_reset(self, plan, written, cancelled=False):
+        # type: (ResetPlan, Int, bool) -> None
+        """
+        Log the outcome of a reset and show it in the viewport.
+
+        :param plan: The reset, as returned by "plan_reset".
+        :param written: Number of cameras written.
+        :param cancelled: If the reset was cancelled and rolled back.
+
+        """
+        with self.stats.phase("notify"):
+            cls_name = self.__class__.__name__
+            cameras = plan.resolved
+            skipped = plan.skipped
+
+            if cancelled:
+                msg = "[{}] reset cameras cancelled, {} camera(s) restored".format(cls_name, written)
+                log.info(msg)
+                _in_view_msg_warn(msg)
+                return
+
+            extra = {"camera_count": len(cameras), "written": written, "skipped": skipped}
+            if self.auto_fit:
+                log.info(
+                    "Auto fit camera clip planes on %s, written: %d, skipped: %d",
+                    CameraSample(cameras), written, skipped, extra=extra,
+                )
+            else:
+                log.info(
+                    "Reset camera clip planes on %s, with params: near: %1.2f, far: %1.2f, "
+                    "written: %d, skipped: %d",
+                    CameraSample(cameras), float(self.clip_values.near), float(self.clip_values.far),
+                    written, skipped, extra=extra,
+                )
+            log.debug("Reset cameras: %s", CameraList(cameras))
+
+            msg = "[{}] reset cameras complete, {} of {} camera(s) written".format(
+                cls_name, written, len(cameras))
+            if self.skip_unchanged:
+                msg += ", {} unchanged".format(skipped)
+            if plan.excluded:
+                msg += ", {} excluded by rules".format(plan.excluded)
+            if written + skipped < len(cameras):
+                _in_view_msg_warn(msg)
+            else:
+                _in_view_msg_info(msg)
+
+    def changed_clip_values(self, cameras, clip_values):
+        # type: (CameraSet, List[ClipPair]) -> Tuple[CameraSet, List[ClipPair]]
+        """
+        Return only the cameras whose current clip values differ from the
+        values to set.
+
+        :param cameras: Camera shapes to compare, their current clip values
+            are read into the set.
+        :param clip_values: Clip values to set, per camera.
+
+        :return: The cameras that differ, and their clip values to set.
+
+        """
+        with self.stats.phase("read", len(cameras)):
+            cameras.read_clip_values()
+
+        changed = cameras.changed(clip_values, self.tolerance)
+        return cameras.compress(changed), list(compress(clip_values, changed))
+
+    def fit_clip_values(self, cameras, bounds=None):
+        # type: (List[Str], Union[Tuple, None]) -> List[ClipPair]
+        """
+        Return the tightest clip values containing the geometry each camera sees.
+
+        :param cameras: Camera shapes to fit the clip values for.
+        :param bounds: World bounding box minimums and maximums of the
+            geometry, as returned by "get_geometry_world_bounds", or a
+            "clip_fit.BoxClusters" and None. None to read them.
+
+        :return: Clip values per camera, "self.clip_values" for cameras
+            that see no geometry.
+
+        """
+        with self.stats.phase("read", len(cameras)):
+            matrices, orthographic, half_widths, half_heights = get_cameras_view_data(cameras)
+            if bounds is None:
+                bounds = get_geometry_world_bounds()
+            bounds_min, bounds_max = bounds
+
+        with self.stats.phase("fit", len(cameras)):
+            near, far = fit_clip_planes(
+                matrices, orthographic, half_widths, half_heights, bounds_min, bounds_max,
+                min_near=self.auto_fit_min_near, padding=self.auto_fit_padding,
+            )
+
+        fallback = ClipPair(float(self.clip_values.near), float(self.clip_values.far))
+        clip_values = []
+        for cam_near, cam_far in zip(near.tolist(), far.tolist()):
+            # NaN when the camera sees no geometry
+            if cam_near != cam_near:
+                clip_values.append(fallback)
+            else:
+                clip_values.append(ClipPair(cam_near, cam_far))
+
+        return clip_values
+
+    def key_clip_planes(self, start, end, step=1.0):
+        # type: (Float, Float, Float) -> Int
+        """
+        Key the clip planes of the cameras of "mode" on every frame from
+        "start" to "end", fitted to the geometry they see on that frame.
+
+        Rules apply as for a reset: excluded cameras are not keyed, and the
+        cameras a rule matches are keyed to its values. Errors are reported
+        to the user in the viewport.
+
+        :param start: First frame to key.
+        :param end: Last frame to key.
+        :param step: Frames between keys.
+
+        :return: Number of cameras keyed.
+
+        """
+        cls_name = self.__class__.__name__
+
+        with self.stats.operation("key_clip_planes"):
+            cameras = self.resolve_mode_cameras()
+            if cameras is None:
+                return 0
+
+            if self.rules:
+                cameras, rule_values = self.rule_clip_values(cameras)
+            else:
+                rule_values = [None] * len(cameras)
+
+            frames = frame_range(start, end, step)
+            fit_cameras = cameras.compress(values is None for values in rule_values)
+            try:
+                fit_near, fit_far = self.fit_clip_keys(fit_cameras, frames)
+            except ImportError as err:
+                msg = "[{}] {}".format(cls_name, err)
+                log.error(msg)
+                _in_view_msg_error(msg)
+                return 0
+
+            fitted = iter(zip(fit_near, fit_far))
+            near = []
+            far = []
+            for values in rule_values:
+                if values is None:
+                    cam_near, cam_far = next(fitted)
+                else:
+                    cam_near = [float(values.near)] * len(frames)
+                    cam_far = [float(values.far)] * len(frames)
+                near.append(cam_near)
+                far.append(cam_far)
+
+            with self.stats.phase("write", len(cameras)):
+                keyed = set_cameras_clip_keys(cameras, frames, near, far)
+
+            with self.stats.phase("notify"):
+                log.info(
+                    "Keyed camera clip planes on %s, frames: %g to %g, keyed: %d",
+                    CameraSample(cameras), start, end, keyed,
+                    extra={"camera_count": len(cameras), "written": keyed},
+                )
+                log.debug("Keyed cameras: %s", CameraList(cameras))
+
+                msg = "[{}] key clip planes complete, {} of {} camera(s) keyed on {} frame(s)".format(
+                    cls_name, keyed, len(cameras), len(frames))
+                if keyed < len(cameras):
+                    _in_view_msg_warn(msg)
+                else:
+                    _in_view_msg_info(msg)
+
+        return keyed
+
+    def fit_clip_keys(self, cameras, frames):
+        # type: (List[Str], List[Float]) -> Tuple[List[List[Float]], List[List[Float]]]
+        """
+        Return the tightest clip values containing the geometry each camera
+        sees, on each of "frames".
+
+        The cameras and geometry are evaluated at each frame without
+        changing the current time, see "maya_cameras.ContextViewReader".
+
+        :param cameras: Camera shapes to fit the clip values for.
+        :param frames: Frames to fit the clip values on.
+
+        :return: Near and far values per camera, one per frame. The values
+            of "self.clip_values" on frames a camera sees no geometry.
+
+        """
+        if not cameras:
+            return [], []
+
+        fallback_near = float(self.clip_values.near)
+        fallback_far = float(self.clip_values.far)
+
+        reader = ContextViewReader(cameras)
+        frames_near = []
+        frames_far = []
+        for frame in frames:
+            with self.stats.phase("read", len(cameras)):
+                view_data, geometry_data = reader.read(frame)
+
+            with self.stats.phase("fit", len(cameras)):
+                matrices, orthographic, half_widths, half_heights = view_data
+                bounds_min, bounds_max = transform_bounds(*geometry_data)
+                near, far = fit_clip_planes(
+                    matrices, orthographic, half_widths, half_heights, bounds_min, bounds_max,
+                    min_near=self.auto_fit_min_near, padding=self.auto_fit_padding,
+                )
+
+            # NaN when the camera sees no geometry
+            frames_near.append([fallback_near if v != v else v for v in near.tolist()])
+            frames_far.append([fallback_far if v != v else v for v in far.tolist()])
+
+        # Per frame rows to per camera rows
+        return [list(row) for row in zip(*frames_near)], [list(row) for row in zip(*frames_far)]
+
+    # TODO: Add documentation...
+    # TODO: Handle if unable to resolve cameras from selection...
+    def camera_manip_show_selected(self):
+        self._camera_manip_toggle("selected", enable=True)
+
+    def camera_manip_hide_selected(self):
+        self._camera_manip_toggle("selected", enable=False)
+
+    def camera_manip_show_all(self):
+        self._camera_manip_toggle("all", enable=True)
+
+    def camera_manip_hide_all(self):
+        self._camera_manip_toggle("all", enable=False)
+
+    def _camera_manip_toggle(self, mode, enable):
+        # type: (Str, bool) -> None
+        name = "camera_manip_{}_{}".format("show" if enable else "hide", mode)
+        with self.stats.operation(name):
+            with self.stats.phase("resolve"):
+                cameras = CameraSet(self.action_map[mode]())
+            with self.stats.phase("write", len(cameras)):
+                edited = self.manip_state.set_clipping(cameras, enable=enable)
+
+        log.debug(
+            "Clip planes manipulator %s on %d of %d camera(s)", "shown" if enable else "hidden", edited, len(cameras))
+
+
+class IncrementalReset(object):
+    """
+    A reset applied over many time-limited steps, so the Maya UI can process
+    events in between. Returned by
+    "MayaResetCameraClipPlanes.reset_cameras_incremental".
+
+    The whole reset is one undo step, recorded when it finishes, "cancel"
+    restores the cameras already written. See "ChunkedClipValuesWriter".
+    The cameras written are recorded in a snapshot when it finishes, with
+    the values the writer read before writing them.
+
+    Usage:
+
+        job = actions.reset_cameras_incremental()
+        job.start()
+        while job.step(0.03):
+            ...  # Let Maya process events
+        job.finish()
+    """
+
+    def __init__(self, actions, plan, timing):
+        # type: (MayaResetCameraClipPlanes, ResetPlan, OperationTiming) -> None
+        self.actions = actions
+        self.plan = plan
+        self.writer = ChunkedClipValuesWriter(plan.cameras, plan.clip_values)
+        self._timing = timing
+
+    @property
+    def total(self):
+        # type: () -> Int
+        return self.writer.total
+
+    @property
+    def done(self):
+        # type: () -> Int
+        return self.writer.done
+
+    def run(self):
+        # type: () -> None
+        """
+        Apply the whole reset at once, instead of stepping it.
+        """
+        stats = self.actions.stats
+        try:
+            with stats.resume(self._timing):
+                self.actions.apply_reset(self.plan)
+        finally:
+            stats.end(self._timing)
+
+    def start(self):
+        # type: () -> None
+        self.writer.start()
+
+    def step(self, max_seconds):
+        # type: (float) -> bool
+        """
+        Write cameras until "max_seconds" have passed.
+
+        :return: If cameras remain to be written.
+
+        """
+        stats = self.actions.stats
+        done = self.writer.done
+        with stats.resume(self._timing), stats.phase("write"):
+            remaining = self.writer.step(max_seconds)
+        self._timing.phases["write"].items += self.writer.done - done
+        return remaining
+
+    def finish(self):
+        # type: () -> None
+        stats = self.actions.stats
+        self.writer.finish()
+        try:
+            with stats.resume(self._timing):
+                originals = self.writer.originals
+                written = CameraSet(
+                    [camera for camera, _ in originals],
+                    [near for _, (near, _) in originals],
+                    [far for _, (_, far) in originals],
+                )
+                self.actions.snapshot_clip_values(written, "reset_cameras")
+                self.actions.report_reset(self.plan, self.writer.written)
+        finally:
+            stats.end(self._timing)
+
+    def cancel(self):
+        # type: () -> None
+        """
+        Restore the cameras written so far.
+        """
+        stats = self.actions.stats
+        restored = self.writer.written
+        try:
+            with stats.resume(self._timing):
+                with stats.phase("write", restored):
+                    self.writer.cancel()
+                self.actions.report_reset(self.plan, restored, cancelled=True)
+        finally:
+            stats.end(self._timing)
+
+
+class ClipPreview(object):
+    """
+    Visible geometry the clip values of a reset would cut, per camera, as
+    returned by "MayaResetCameraClipPlanes.preview_clip_values".
+
+    Attributes
+    ----------
+    cameras: CameraSet
+        Cameras previewed.
+    clip_values: List[ClipPair]
+        Clip values a reset would write, per camera.
+    clipped: List[Int]
+        Number of visible geometry shapes fully clipped, per camera.
+    partial: List[Int]
+        Number of visible geometry shapes crossing a clip plane, per camera.
+    geometry: List[Str]
+        Full paths of the geometry shapes counted.
+    """
+
+    def __init__(self, cameras, clip_values, clipped, partial, geometry, boxes, view_data):
+        # type: (CameraSet, List[ClipPair], List[Int], List[Int], List[Str], Union[BoxClusters, None], Tuple) -> None
+        """
+        :param boxes: World bounding boxes of "geometry", None if there is none.
+        :param view_data: View data of the cameras, see "get_cameras_view_data".
+        """
+        self.cameras = cameras
+        self.clip_values = clip_values
+        self.clipped = clipped
+        self.partial = partial
+        self.geometry = geometry
+        self._boxes = boxes
+        self._view_data = view_data
+
+    def __len__(self):
+        return len(self.cameras)
+
+    def clipped_geometry(self, row):
+        # type: (Int) -> Tuple[List[Str], List[Str]]
+        """
+        Return the geometry shapes cut by the clip values of one camera.
+
+        :param row: Index of the camera in "cameras".
+
+        :return: The shapes fully clipped, and the shapes partially clipped.
+
+        """
+        if self._boxes is None:
+            return [], []
+
+        matrices, orthographic, half_widths, half_heights = self._view_data
+        near, far = self.clip_values[row]
+        clipped, partial = clip_masks(
+            matrices[row:row + 1], orthographic[row:row + 1], half_widths[row:row + 1],
+            half_heights[row:row + 1], self._boxes, None, float(near), float(far),
+        )
+        return list(compress(self.geometry, clipped[0])), list(compress(self.geometry, partial[0]))
@@ -0,0 +1,1123 @@
+# coding=utf-8
+"""
+Dockable Qt UI of the reset camera clip planes tool.
+
+Imported on demand by "reset_camera_clip_planes.show", so the headless core
+in "reset_camera_clip_planes_core" never pulls in Qt.
+"""
+
+from functools import wraps
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Type hinting in PyCharm
+try:
+    from typing import List, Str, Union
+except ImportError:
+    pass
+
+# Maya imports
+import maya.OpenMayaUI as omui
+from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
+
+import maya.cmds as mc
+
+from camera_browser import CameraBrowser
+from clip_audit import FORMAT_CSV
+from clip_audit import FORMAT_JSON
+from clip_audit import write_report
+from clip_planes import ClipPair
+from clip_planes import DEFAULT_CLIP_PLANE_FAR
+from clip_planes import DEFAULT_CLIP_PLANE_NEAR
+from clip_preview_dialog import ClipPreviewDialog
+from clip_rules import ClipRuleSet
+from clip_rules import ClipRulesError
+from log_utils import add_handler
+from log_utils import CameraSample
+from log_utils import remove_handler
+from log_utils import RingBufferHandler
+from maya_cameras import IncomingCameras
+from maya_cameras import NothingSelectedError
+from maya_cameras import SelectionWatcher
+from reset_camera_clip_planes_core import __VERSION__
+from reset_camera_clip_planes_core import MayaResetCameraClipPlanes
+
+# Qt imports
+from PySide2 import QtCore
+from PySide2 import QtGui
+from PySide2 import QtWidgets
+from shiboken2 import isValid
+from shiboken2 import wrapInstance
+
+
+log = logging.getLogger(__name__)
+
+QWidget = QtWidgets.QWidget
+
+
+# --- Qt Utility Functions
+
+def maya_main_window():
+    # type: () -> QWidget
+    """
+    Return the Maya main window widget as a Python object
+
+    :return: The Main Maya Window.
+    """
+    main_window_ptr = omui.MQtUtil.mainWindow()
+    return wrapInstance(int(main_window_ptr), QWidget)
+
+
+def destroy_child_widget(parent, child_name):
+    # type: (QWidget, str) -> None
+    """
+    Destroy a child widget of the specified parent widget.
+
+    :param parent: Parent widget to resolve child widgets from.
+    :param child_name: Name of the child widget to destroy.
+
+    :return: None
+
+    """
+    for widget in parent.children():  # type: QWidget
+
+        if widget.objectName() == child_name:
+            log.info('Closing previous instance of "%s"', child_name)
+            widget.close()
+            widget.deleteLater()
+
+
+def get_widgets_upstream(widget):
+    yield widget
+
+    parent = widget.parent()
+    if parent:
+        for w in get_widgets_upstream(parent):
+            yield w
+
+
+def set_return_widget_tooltip_from_docstring(func):
+    """
+    Decorator to inject the function docstring into it's returned object tooltip.
+
+    Assumes that the returning object is of type QtWidgets.QWidget
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        widget = func(*args, **kwargs)
+        tooltip = func.__doc__  # type: QtWidgets.QWidget
+
+        widget.setToolTip(tooltip)
+
+        return widget
+
+    return wrapper
+
+
+# Encapsulate "Reset Camera Clip Planes UI" behaviour as it's own object.
+# This is so it can be easily augmented with a different  DCC such as
+# Houdini, 3DsMax, etc.
+class ResetCameraClipPlanesUI(MayaQWidgetDockableMixin, QWidget):
+
+    _VERSION_ = __VERSION__
+
+    DISPLAY_NAME = 'BI - Reset Camera Clip Planes'
+    INTERNAL_NAME = 'ResetCameraClipPlanesUIa'
+
+    WIDTH = 640
+    HEIGHT = 180
+    BROWSER_HEIGHT = 320
+
+    # Selected cameras listed in the tooltip of the "Selected" camera context
+    SELECTED_TOOLTIP_CAMERAS = 20
+
+    ResetCameraClipPlanes = MayaResetCameraClipPlanes
+    DEFAULT_NEAR = DEFAULT_CLIP_PLANE_NEAR
+    DEFAULT_FAR = DEFAULT_CLIP_PLANE_FAR
+
+    DOCUMENTATION_PATH = "https://github.com/uncojohnco/task-2020-BI/blob/main/README.md"
+
+    PROFILE_DIR = os.path.join(tempfile.gettempdir(), "reset_camera_clip_planes", "profiles")
+
+    # Last instance built, kept alive when closed so it can be shown again, see "instance"
+    _instance = None  # type: Union[ResetCameraClipPlanesUI, None]
+
+    # Resets writing at least this many cameras are applied incrementally,
+    # in steps of "INCREMENTAL_STEP_SECONDS", with a progress bar.
+    INCREMENTAL_APPLY_THRESHOLD = 500
+    INCREMENTAL_STEP_SECONDS = 0.03
+
+    def __init__(self, parent=None, *args, **kwargs):
+
+        self.destroy_previous_instance()
+
+        parent = parent or maya_main_window()
+        super(ResetCameraClipPlanesUI, self).__init__(parent, *args, **kwargs)
+
+        self.setWindowTitle("{} - v{}".format(self.DISPLAY_NAME, self._VERSION_))
+        self.setObjectName(self.INTERNAL_NAME)
+
+        self._actions = self.ResetCameraClipPlanes(use_camera_registry=True)
+        self._actions.set_mode("picked", self._picked_cameras)
+
+        # Widgets
+        self._camera_context_options_grp = None  # type: Union[QtWidgets.QButtonGroup, None]
+        self._clip_edit_near = None  # type: Union[QtWidgets.QLineEdit, None]
+        self._clip_edit_far = None  # type: Union[QtWidgets.QLineEdit, None]
+        self._clip_auto_fit_check = None  # type: Union[QtWidgets.QCheckBox, None]
+        self._clip_skip_unchanged_check = None  # type: Union[QtWidgets.QCheckBox, None]
+        self._clip_animated_check = None  # type: Union[QtWidgets.QCheckBox, None]
+        self._clip_enforce_check = None  # type: Union[QtWidgets.QCheckBox, None]
+
+        self._preview_btn = None  # type: Union[QtWidgets.QPushButton, None]
+        self._apply_btn = None  # type: Union[QtWidgets.QPushButton, None]
+        self._apply_progress = None  # type: Union[QtWidgets.QProgressBar, None]
+        self._cancel_btn = None  # type: Union[QtWidgets.QPushButton, None]
+        self._revert_btn = None  # type: Union[QtWidgets.QPushButton, None]
+        self._snapshots_menu = None  # type: Union[QtWidgets.QMenu, None]
+        self._stats_dialog = None  # type: Union[QtWidgets.QDialog, None]
+        self._stats_text = None  # type: Union[QtWidgets.QPlainTextEdit, None]
+        self._log_dialog = None  # type: Union[QtWidgets.QDialog, None]
+        self._log_text = None  # type: Union[QtWidgets.QPlainTextEdit, None]
+        self._preview_dialog = None  # type: Union[ClipPreviewDialog, None]
+        self._camera_browser = None  # type: Union[CameraBrowser, None]
+        self._rules_current_action = None  # type: Union[QtWidgets.QAction, None]
+        self._dock_widget = None  # type: Union[QtWidgets.QWidget, None]
+
+        # Keeps the "Selected" camera context label in sync with the scene selection
+        self._selection_watcher = SelectionWatcher(self._on_selected_cameras_changed)
+
+        # Resets the cameras created or brought in the scene while "Enforce" is checked
+        self._incoming_cameras = IncomingCameras(self._on_incoming_cameras)
+
+        # Last log records of the tool, shown by "Log > Show Log...", added
+        # to the loggers while the UI is open
+        self._log_buffer = RingBufferHandler()
+
+        # Incremental apply, stepped on idle by the timer
+        self._apply_job = None  # type: Union[IncrementalReset, None]
+        self._apply_timer = QtCore.QTimer(self)
+        self._apply_timer.setInterval(0)
+        self._apply_timer.timeout.connect(self._step_apply_job)
+
+        # Set once "display" built the widgets, later calls only show them again
+        self._ui_built = False
+
+        type(self)._instance = self
+
+    def dockCloseEventTriggered(self):
+        self._stop_callbacks()
+        super(ResetCameraClipPlanesUI, self).dockCloseEventTriggered()
+
+    def closeEvent(self, event):
+        self._stop_callbacks()
+        super(ResetCameraClipPlanesUI, self).closeEvent(event)
+
+    @classmethod
+    def instance(cls):
+        # type: () -> Union[ResetCameraClipPlanesUI, None]
+        """
+        Return the last instance built, None if there is none or Qt deleted it.
+        """
+        instance = cls._instance
+        if instance is None or not isValid(instance):
+            return None
+        return instance
+
+    @classmethod
+    def destroy_previous_instance(cls):
+
+        previous = cls.instance()
+        cls._instance = None
+        if previous is not None:
+            log.info('Closing previous instance of "%s"', cls.INTERNAL_NAME)
+            previous.close()
+            previous.deleteLater()
+            return
+
+        # e.g. the module was reloaded, and lost track of the instance
+        root = maya_main_window()
+        destroy_child_widget(root, cls.INTERNAL_NAME)
+
+    def _start_callbacks(self):
+        # type: () -> None
+        """
+        Register the Maya callbacks of the UI, and catch up with the scene.
+        """
+        self._actions.open()
+        add_handler(self._log_buffer)
+
+        self._selection_watcher.start()
+        self._on_selected_cameras_changed(self._selection_watcher.cameras)
+
+        if self._clip_enforce_check.isChecked():
+            self._incoming_cameras.start()
+        if self._camera_browser.isVisible():
+            self._camera_browser.refresh()
+
+    def _stop_callbacks(self):
+        # type: () -> None
+        """
+        Release the Maya callbacks of the UI while it is closed.
+        """
+        self._cancel_apply_job()
+        self._selection_watcher.stop()
+        self._incoming_cameras.stop()
+        self._actions.close()
+        remove_handler(self._log_buffer)
+        if self._preview_dialog is not None:
+            self._preview_dialog.close()
+
+    # Build UI behaviour
+
+    @set_return_widget_tooltip_from_docstring
+    def _init_ui_clip_edits(self):
+        # type: () -> QtWidgets.QWidget
+        """
+        <nobr>
+            <b>Near Clip Plane</b>: Value to set the camera(s) "<i>nearClipPlane</i>"<br>
+            <b> Far Clip Plane</b>: Value to set the camera(s) "<i>farClipPlane</i>"<br>
+            <b>Auto Fit</b>: Fit each camera's clip planes to the geometry it sees,
+            cameras seeing no geometry get the values above<br>
+            <b>Skip Unchanged</b>: Only write the cameras whose clip planes differ
+            from the values to set<br>
+            <b>Animated</b>: Key the clip planes fitted on every frame of the
+            playback range, cameras seeing no geometry get the values above<br>
+            <b>Enforce</b>: While the tool is open, reset the cameras created,
+            imported or referenced afterwards, one batch per import
+        </nobr>
+
+        """
+
+        # Setup
+
+        grp_box = QtWidgets.QGroupBox("Clip Plane values")
+
+        layout = QtWidgets.QFormLayout()
+        layout.setContentsMargins(1, 20, 1, 1)
+        layout.setSpacing(2)
+
+        # Build
+
+        validator = QtGui.QDoubleValidator()
+        validator.setBottom(0)
+        validator.setDecimals(3)
+
+        def _create_line_edit(value):
+            line_edit = QtWidgets.QLineEdit(str(value))
+            line_edit.setValidator(validator)
+            line_edit.setMinimumWidth(100)
+            return line_edit
+
+        near_edit = _create_line_edit(self.DEFAULT_NEAR)
+        far_edit = _create_line_edit(self.DEFAULT_FAR)
+
+        auto_fit_check = QtWidgets.QCheckBox("Auto Fit")
+        skip_unchanged_check = QtWidgets.QCheckBox("Skip Unchanged")
+        animated_check = QtWidgets.QCheckBox("Animated")
+        enforce_check = QtWidgets.QCheckBox("Enforce")
+        enforce_check.toggled.connect(self._toggle_enforce)
+
+        layout.addRow("Near Clip Plane", near_edit)
+        layout.addRow("Far Clip Plane", far_edit)
+        layout.addRow(auto_fit_check, skip_unchanged_check)
+        layout.addRow(animated_check, enforce_check)
+
+        # Finally
+
+        self._clip_edit_near = near_edit
+        self._clip_edit_far = far_edit
+        self._clip_auto_fit_check = auto_fit_check
+        self._clip_skip_unchanged_check = skip_unchanged_check
+        self._clip_animated_check = animated_check
+        self._clip_enforce_check = enforce_check
+
+        grp_box.setLayout(layout)
+
+        return grp_box
+
+    @set_return_widget_tooltip_from_docstring
+    def _init_ui_camera_context_options(self):
+        # type: () -> QtWidgets.QWidget
+        """
+        <nobr>
+            <b>selected</b>: 'If checked, will set <b>selected cameras</b> clip values'<br>
+            <b>     all</b>: 'If checked, will set <b>all cameras</b> in the scene clip values'<br>
+            <b>  picked</b>: 'If checked, will set the clip values of the cameras
+            <b>picked in the Camera Browser</b>'
+        </nobr>
+
+        """
+
+        modes = self._actions.action_map.keys()
+
+        # Setup
+
+        grp_box = QtWidgets.QGroupBox("Camera Context")
+        layout = QtWidgets.QVBoxLayout()
+        # layout.setContentsMargins(1, 1, 1, 1)
+        layout.addSpacing(10)
+        # Build
+
+        button_grp = QtWidgets.QButtonGroup()
+
+        for ii, mode in enumerate(modes):  # type: Str
+            rb = QtWidgets.QRadioButton(mode.capitalize())
+            layout.addWidget(rb)
+            button_grp.addButton(rb, ii)
+
+        layout.itemAt(1).wid.setChecked(True)
+        layout.addSpacing(10)
+        # Finally
+
+        self._camera_context_options_grp = button_grp
+
+        grp_box.setLayout(layout)
+
+        return grp_box
+
+    @set_return_widget_tooltip_from_docstring
+    def _init_ui_action_buttons(self):
+        # type: () -> QtWidgets.QWidget
+        """
+        <nobr>
+            <b>Preview button</b>: Click this button to count, per camera, the visible
+            geometry the clip values of Apply would cut, without setting them<br>
+            <b>Apply button</b>: Click this button to set the clip plane values
+            for the cameras defined by the "Camera Context"<br>
+            <b>Cancel button</b>: Shown while many cameras are being set, click it
+            to stop and restore the cameras already set<br>
+            <b>Revert button</b>: Click this button to restore the clip values the
+            cameras had before the last Apply, saved with the scene
+        </nobr>
+
+        """
+
+        # Build
+
+        grp_box = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout()
+
+        preview_btn = QtWidgets.QPushButton("Preview...")
+
+        apply_btn = QtWidgets.QPushButton("Apply")
+
+        apply_progress = QtWidgets.QProgressBar()
+        apply_progress.setTextVisible(True)
+        apply_progress.setFormat("%v / %m")
+        apply_progress.hide()
+
+        cancel_btn = QtWidgets.QPushButton("Cancel")
+        cancel_btn.hide()
+
+        revert_btn = QtWidgets.QPushButton("Revert")
+
+        layout.addStretch()
+        layout.addWidget(apply_progress)
+        layout.addWidget(cancel_btn)
+        layout.addWidget(preview_btn)
+        layout.addWidget(apply_btn)
+        layout.addWidget(revert_btn)
+
+        # Finally
+
+        self._preview_btn = preview_btn
+        self._apply_btn = apply_btn
+        self._apply_progress = apply_progress
+        self._cancel_btn = cancel_btn
+        self._revert_btn = revert_btn
+
+        grp_box.setLayout(layout)
+
+        return grp_box
+
+    def _init_ui_reset_clip_planes(self):
+        # type: () -> QtWidgets.QWidget
+
+        # Compose Widgets
+
+        clip_edit_wgt = self._init_ui_clip_edits()
+        camera_context_wgt = self._init_ui_camera_context_options()
+        actions_wgt = self._init_ui_action_buttons()
+
+        # Compose Tool Layout
+
+        grp_box = QtWidgets.QGroupBox("Reset Camera Clip Planes")
+        layout = QtWidgets.QHBoxLayout()
+        layout.setContentsMargins(5, 20, 5, 5)
+        layout.setSpacing(1)
+        grp_box.setLayout(layout)
+
+        layout.addWidget(clip_edit_wgt)
+        layout.addWidget(camera_context_wgt)
+        layout.addWidget(actions_wgt)
+
+        # Compose connections
+
+        self._preview_btn.clicked.connect(self._show_clip_preview)
+        self._apply_btn.clicked.connect(self._reset_cameras_clip_planes)
+        self._cancel_btn.clicked.connect(self._cancel_apply_job)
+        self._revert_btn.clicked.connect(self._restore_last_snapshot)
+
+        return grp_box
+
+    # TODO: Perhaps should have implemented QMainWindow...
+    def _init_ui_menubar(self):
+        # type: () -> QtWidgets.QMenuBar()
+
+        menu_bar = QtWidgets.QMenuBar()
+
+        action_reset_ui = QtWidgets.QAction("Reset UI", self)
+        action_open_doc = QtWidgets.QAction("Open Documentation", self)
+        action_browser = QtWidgets.QAction("Camera Browser", self)
+        action_browser.setCheckable(True)
+        action_browser.setToolTip("Show a filterable list of the scene cameras, to pick cameras from")
+
+        menu_bar.addAction(action_reset_ui)
+        menu_bar.addAction(action_open_doc)
+        menu_bar.addAction(action_browser)
+
+        action_reset_ui.triggered.connect(self._reset_ui)
+        action_open_doc.triggered.connect(self._open_help)
+        action_browser.toggled.connect(self._toggle_camera_browser)
+
+        menu_bar.addMenu(self._init_ui_rules_menu())
+        menu_bar.addMenu(self._init_ui_snapshots_menu())
+        menu_bar.addMenu(self._init_ui_audit_menu())
+        menu_bar.addMenu(self._init_ui_stats_menu())
+        menu_bar.addMenu(self._init_ui_log_menu())
+
+        return menu_bar
+
+    def _init_ui_rules_menu(self):
+        # type: () -> QtWidgets.QMenu()
+
+        menu = QtWidgets.QMenu("Rules", self)
+        menu.setToolTipsVisible(True)
+
+        action_current = menu.addAction("No rules loaded")
+        action_current.setEnabled(False)
+        menu.addSeparator()
+        action_load = menu.addAction("Load Rules Preset...")
+        action_load.setToolTip(
+            "Load a JSON preset of per-camera clip values and exclusions,\n"
+            "matched by camera name, namespace, path or attribute")
+        action_clear = menu.addAction("Clear Rules")
+
+        action_load.triggered.connect(self._load_rules)
+        action_clear.triggered.connect(self._clear_rules)
+
+        self._rules_current_action = action_current
+
+        return menu
+
+    def _init_ui_snapshots_menu(self):
+        # type: () -> QtWidgets.QMenu()
+
+        # Filled when shown, the snapshots follow the scene
+        menu = QtWidgets.QMenu("Snapshots", self)
+        menu.setToolTipsVisible(True)
+        menu.aboutToShow.connect(self._update_snapshots_menu)
+
+        self._snapshots_menu = menu
+
+        return menu
+
+    def _update_snapshots_menu(self):
+
+        menu = self._snapshots_menu
+        menu.clear()
+
+        snapshots = self._actions.snapshots.snapshots()
+
+        action_restore = menu.addAction("Restore Last Snapshot")
+        action_restore.setToolTip("Restore the clip values the cameras had before the last Apply")
+        action_restore.setEnabled(bool(snapshots))
+        action_restore.triggered.connect(self._restore_last_snapshot)
+
+        if snapshots:
+            menu.addSeparator()
+        for snapshot in reversed(snapshots):
+            action = menu.addAction("{}  {}  ({} camera(s))".format(
+                time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(snapshot.time)), snapshot.label, len(snapshot)))
+            action.setToolTip("Restore the clip values of these cameras before this operation")
+            action.triggered.connect(lambda checked=False, snapshot=snapshot: self._restore_snapshot(snapshot))
+
+        menu.addSeparator()
+        action_take = menu.addAction("Take Snapshots")
+        action_take.setCheckable(True)
+        action_take.setChecked(self._actions.take_snapshots)
+        action_take.setToolTip(
+            "Record the clip values of the cameras before each Apply,\n"
+            "keeping the last {} snapshots with the scene".format(self._actions.snapshots.history.max_snapshots))
+        action_clear = menu.addAction("Clear Snapshots")
+        action_clear.setEnabled(bool(snapshots))
+
+        action_take.toggled.connect(self._set_take_snapshots)
+        action_clear.triggered.connect(self._actions.snapshots.clear)
+
+    def _init_ui_audit_menu(self):
+        # type: () -> QtWidgets.QMenu()
+
+        menu = QtWidgets.QMenu("Audit", self)
+        menu.setToolTipsVisible(True)
+
+        action_audit = menu.addAction("Audit Depth Precision...")
+        action_audit.setToolTip(
+            "Check the depth buffer precision given by the clip planes of the cameras\n"
+            "of the \"Camera Context\", and save the report as CSV or JSON")
+        action_audit.triggered.connect(self._audit_cameras)
+
+        return menu
+
+    def _init_ui_stats_menu(self):
+        # type: () -> QtWidgets.QMenu()
+
+        menu = QtWidgets.QMenu("Stats", self)
+
+        action_show_stats = menu.addAction("Show Stats...")
+        action_clear_stats = menu.addAction("Clear Stats")
+        menu.addSeparator()
+        action_profile = menu.addAction("Capture cProfile")
+        action_profile.setCheckable(True)
+        action_profile.setToolTip(
+            "Profile every operation with cProfile, dumped in:\n{}".format(self.PROFILE_DIR))
+        action_open_profiles = menu.addAction("Open Profile Folder")
+
+        action_show_stats.triggered.connect(self._show_stats)
+        action_clear_stats.triggered.connect(self._actions.stats.clear)
+        action_profile.toggled.connect(self._set_profiling)
+        action_open_profiles.triggered.connect(self._open_profile_dir)
+
+        return menu
+
+    def _init_ui_log_menu(self):
+        # type: () -> QtWidgets.QMenu()
+
+        menu = QtWidgets.QMenu("Log", self)
+        menu.setToolTipsVisible(True)
+
+        action_show_log = menu.addAction("Show Log...")
+        action_show_log.setToolTip(
+            "Show the last {} messages of the tool, at the level of its loggers".format(
+                self._log_buffer.buffer.maxlen))
+        action_clear_log = menu.addAction("Clear Log")
+
+        action_show_log.triggered.connect(self._show_log)
+        action_clear_log.triggered.connect(self._clear_log)
+
+        return menu
+
+    @set_return_widget_tooltip_from_docstring
+    def _init_ui_toolbar(self):
+        # type: () -> QtWidgets.QToolBar()
+        """
+        <nobr>
+            Tools to toggle the visibility of the Camera clip planes manipulators
+            for the selected cameras.
+        </nobr>
+
+        """
+
+        grp_box = QtWidgets.QGroupBox("Camera manip")
+        layout = QtWidgets.QGridLayout()
+        layout.setContentsMargins(5, 20, 5, 5)
+
+        # TODO: Change these into icons...
+        action_show_clip_manip = QtWidgets.QPushButton("show sel", self)
+        action_hide_clip_manip = QtWidgets.QPushButton("hide sel", self)
+        action_show_clip_manip_all = QtWidgets.QPushButton("show all", self)
+        action_hide_clip_manip_all = QtWidgets.QPushButton("hide all", self)
+
+        action_show_clip_manip.setToolTip("Show the camera clip planes manipulator for selected cameras")
+        action_hide_clip_manip.setToolTip("Hide the camera clip planes manipulator for selected cameras")
+        action_show_clip_manip.setToolTip("Show the camera clip planes manipulator for all cameras")
+        action_hide_clip_manip.setToolTip("Hide the camera clip planes manipulator for all cameras")
+
+        layout.addWidget(action_show_clip_manip, 0, 0)
+        layout.addWidget(action_hide_clip_manip, 1, 0)
+
+        layout.addWidget(action_show_clip_manip_all, 0, 1)
+        layout.addWidget(action_hide_clip_manip_all, 1, 1)
+
+        action_show_clip_manip.clicked.connect(self._camera_manip_show_selected)
+        action_hide_clip_manip.clicked.connect(self._camera_manip_hide_selected)
+        action_show_clip_manip_all.clicked.connect(self._camera_manip_show_all)
+        action_hide_clip_manip_all.clicked.connect(self._camera_manip_hide_all)
+
+        grp_box.setLayout(layout)
+
+        return grp_box
+
+    def _init_ui(self):
+        # type: () -> QtWidgets.QLayout()
+
+        main_layout = QtWidgets.QVBoxLayout()
+        main_layout.setMargin(2)
+        main_layout.setSpacing(2)
+
+        menu_bar = self._init_ui_menubar()
+
+        # Tools Section
+        set_clip_planes_grpbox = self._init_ui_reset_clip_planes()
+        tool_bar = self._init_ui_toolbar()
+
+        tools_layout = QtWidgets.QHBoxLayout()
+        tools_layout.addWidget(set_clip_planes_grpbox)
+        tools_layout.addWidget(tool_bar)
+
+        line = QtWidgets.QFrame()
+        line.setFixedHeight(1)
+        line.setFrameShape(QtWidgets.QFrame.HLine)
+
+        menu_bar.setFixedHeight(30)
+
+        # Hidden until toggled from the menu bar, listing cameras is not free
+        camera_browser = CameraBrowser(self._actions.action_map["all"])
+        camera_browser.hide()
+        self._camera_browser = camera_browser
+
+        main_layout.addWidget(menu_bar)
+        main_layout.addWidget(line)
+        main_layout.addLayout(tools_layout)
+        main_layout.addWidget(camera_browser)
+
+        self.setLayout(main_layout)
+
+        return main_layout
+
+    # Primary entry method
+
+    def display(self):
+        """
+        Show the UI. The widgets are built on the first call, later calls show
+        them again as they were left, e.g. after the UI was closed.
+        """
+        control = "{}WorkspaceControl".format(self.INTERNAL_NAME)
+
+        if self._ui_built:
+            # Closing the workspace control only hid it
+            if mc.workspaceControl(control, q=True, exists=True):
+                mc.workspaceControl(control, e=True, restore=True)
+            else:
+                self._show_docked()
+            self._start_callbacks()
+
+            log.info('Display of UI complete, reopened')
+            return
+
+        self._init_ui()
+        self._ui_built = True
+
+        if mc.workspaceControl(control, q=True, exists=True):
+            mc.workspaceControl(control, e=True, close=True)
+            mc.deleteUI(control, control=True)
+
+        # TODO: A proper style sheet should be implemented...
+        # TODO: Improve QGroupBox margins...
+        self.setStyleSheet(
+            "QToolTip { color: #ffffff; background-color: #2a82da; border: 1px solid white; font-size:10pt }"
+            # TODO: not sure why font weight isn't being set for the title...
+            "QGroupBox::title { background-color: transparent; font-weight: bold; color: grey }"
+            "QGroupBox { padding: 2px 5px; border-width: 1px; border-style: solid; }"
+            # TODO: reduce sie of buttons
+            # "QPushButton { margin 0px; padding 0px 20px; border-width: 1px; }"
+        )
+
+        self._show_docked()
+        self._start_callbacks()
+
+        log.info('Display of UI complete')
+
+    def _show_docked(self):
+        # type: () -> None
+
+        self.show(dockable=True, floating=True)
+
+        # last item is MayaWindow. The child of MayaWindow
+        # is the widget we want to resize
+        parent_widgets = list(get_widgets_upstream(self))
+        self._dock_widget = parent_widgets[-2]
+        self._update_dock_size()
+
+    def _update_dock_size(self):
+        if self._dock_widget is None:
+            return
+
+        height = self.HEIGHT
+        if self._camera_browser is not None and self._camera_browser.isVisible():
+            height += self.BROWSER_HEIGHT
+        self._dock_widget.setFixedSize(self.WIDTH, height)
+
+    # UI Actions commands
+
+    def _reset_ui(self):
+
+        self._clip_edit_near.setText(str(self.DEFAULT_NEAR))
+        self._clip_edit_far.setText(str(self.DEFAULT_FAR))
+        self._clip_auto_fit_check.setChecked(False)
+        self._clip_skip_unchanged_check.setChecked(False)
+        self._clip_animated_check.setChecked(False)
+        self._clip_enforce_check.setChecked(False)
+
+        # Manipulators may have been toggled outside the tool since
+        self._actions.manip_state.forget()
+
+    def _apply_clip_options(self):
+        # type: () -> bool
+        """
+        Set the clip values and options of the UI on the camera actions.
+
+        :return: False, setting nothing, if a clip value is empty or still
+            being typed.
+
+        """
+        camera_actions = self._actions
+
+        near_text = self._clip_edit_near.text()
+        far_text = self._clip_edit_far.text()
+        values = None
+        if self._clip_edit_near.hasAcceptableInput() and self._clip_edit_far.hasAcceptableInput():
+            try:
+                values = ClipPair(float(near_text), float(far_text))
+            except ValueError:
+                # Accepted by the validator in a locale with a decimal comma
+                pass
+        if values is None:
+            log.warning('Invalid clip plane values: "%s", "%s"', near_text, far_text)
+            return False
+
+        camera_actions.clip_values = values
+        camera_actions.auto_fit = self._clip_auto_fit_check.isChecked()
+        camera_actions.skip_unchanged = self._clip_skip_unchanged_check.isChecked()
+        return True
+
+    def _reset_cameras_clip_planes(self):
+
+        camera_actions = self._actions
+
+        mode = self._checked_mode()
+        camera_actions.mode = mode
+        if not self._apply_clip_options():
+            return
+
+        log.debug('Camera context resolved from UI: "%s", "%s"', mode, camera_actions.clip_values)
+
+        if self._clip_animated_check.isChecked():
+            start = mc.playbackOptions(q=True, minTime=True)
+            end = mc.playbackOptions(q=True, maxTime=True)
+            camera_actions.key_clip_planes(start, end)
+            self._refresh_camera_browser_clip_values()
+            return
+
+        job = camera_actions.reset_cameras_incremental()
+        if job is None:
+            return
+
+        if job.total < self.INCREMENTAL_APPLY_THRESHOLD:
+            job.run()
+            self._refresh_camera_browser_clip_values()
+        else:
+            self._start_apply_job(job)
+
+    def _preview_clip_values(self):
+        # type: () -> Union[ClipPreview, None]
+
+        camera_actions = self._actions
+        camera_actions.mode = self._checked_mode()
+        if not self._apply_clip_options():
+            return None
+        return camera_actions.preview_clip_values()
+
+    def _show_clip_preview(self):
+
+        if self._preview_dialog is None:
+            dialog = ClipPreviewDialog(self._preview_clip_values, self)
+            dialog.setWindowTitle("{} - Clip Preview".format(self.DISPLAY_NAME))
+            dialog.resize(640, 400)
+            self._preview_dialog = dialog
+
+        self._preview_dialog.refresh()
+        self._preview_dialog.show()
+        self._preview_dialog.raise_()
+
+    def _checked_mode(self):
+        # type: () -> Str
+        mode_id = self._camera_context_options_grp.checkedId()
+        return list(self._actions.action_map.keys())[mode_id]
+
+    def _audit_cameras(self):
+
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Depth Precision Audit", "", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+
+        self._actions.mode = self._checked_mode()
+        rows = self._actions.audit_cameras()
+        if rows is None:
+            return
+
+        report_format = FORMAT_JSON if path.lower().endswith(".json") else FORMAT_CSV
+        kwargs = {"newline": ""} if sys.version_info[0] >= 3 else {}
+        with open(path, "w" if kwargs else "wb", **kwargs) as stream:
+            write_report(rows, stream, report_format, self._actions.audit_distances)
+        log.info('Depth precision audit written to "%s"', path)
+
+    def _start_apply_job(self, job):
+        # type: (IncrementalReset) -> None
+
+        log.debug("Applying incrementally to %d camera(s)", job.total)
+
+        self._apply_job = job
+        job.start()
+
+        self._apply_btn.setEnabled(False)
+        self._revert_btn.setEnabled(False)
+        self._apply_progress.setRange(0, job.total)
+        self._apply_progress.setValue(0)
+        self._apply_progress.show()
+        self._cancel_btn.show()
+
+        self._apply_timer.start()
+
+    def _step_apply_job(self):
+        job = self._apply_job
+        if job is None:
+            self._apply_timer.stop()
+            return
+
+        try:
+            remaining = job.step(self.INCREMENTAL_STEP_SECONDS)
+        except Exception:
+            self._end_apply_job()
+            job.cancel()
+            raise
+
+        self._apply_progress.setValue(job.done)
+        if remaining:
+            return
+
+        self._end_apply_job()
+        job.finish()
+        self._refresh_camera_browser_clip_values()
+
+    def _cancel_apply_job(self):
+        job = self._apply_job
+        if job is None:
+            return
+
+        self._end_apply_job()
+        job.cancel()
+        self._refresh_camera_browser_clip_values()
+
+    def _end_apply_job(self):
+        self._apply_timer.stop()
+        self._apply_job = None
+
+        self._apply_progress.hide()
+        self._cancel_btn.hide()
+        self._apply_btn.setEnabled(True)
+        self._revert_btn.setEnabled(True)
+
+    def _restore_last_snapshot(self):
+        self._restore_snapshot(None)
+
+    def _restore_snapshot(self, snapshot):
+        # type: (Union[ClipSnapshot, None]) -> None
+        if self._apply_job is not None:
+            return
+
+        self._actions.restore_snapshot(snapshot)
+        self._refresh_camera_browser_clip_values()
+
+    def _set_take_snapshots(self, enabled):
+        # type: (bool) -> None
+        self._actions.take_snapshots = enabled
+
+    def _toggle_enforce(self, checked):
+        # type: (bool) -> None
+        if checked:
+            self._incoming_cameras.start()
+        else:
+            self._incoming_cameras.stop()
+
+    def _on_incoming_cameras(self, cameras):
+        # type: (List[Str]) -> None
+
+        log.debug("Enforcing clip values on %s", CameraSample(cameras))
+
+        # The values currently in the UI, not those of the last apply.
+        # Cameras arriving while a value is being typed are left as they are.
+        if not self._apply_clip_options():
+            return
+        self._actions.enforce_clip_values(cameras)
+        self._refresh_camera_browser_clip_values()
+
+    def _on_selected_cameras_changed(self, cameras):
+        # type: (List[Str]) -> None
+
+        modes = list(self._actions.action_map.keys())
+        button = self._camera_context_options_grp.button(modes.index("selected"))
+
+        button.setText("{} ({})".format("selected".capitalize(), len(cameras)))
+        if cameras:
+            names = [cam.rsplit("|", 1)[-1] for cam in cameras[:self.SELECTED_TOOLTIP_CAMERAS]]
+            if len(cameras) > len(names):
+                names.append("... {} more".format(len(cameras) - len(names)))
+            button.setToolTip("\n".join(names))
+        else:
+            button.setToolTip("No cameras selected")
+
+    def _toggle_camera_browser(self, visible):
+        # type: (bool) -> None
+
+        browser = self._camera_browser
+        if browser is None:
+            return
+
+        if visible:
+            browser.refresh()
+        browser.setVisible(visible)
+        self._update_dock_size()
+
+    def _refresh_camera_browser_clip_values(self):
+        browser = self._camera_browser
+        if browser is not None and browser.isVisible():
+            browser.refresh_clip_values()
+
+    def _picked_cameras(self):
+        # type: () -> List[Str]
+        """
+        Return the cameras picked in the Camera Browser, for the "picked" mode.
+        """
+        browser = self._camera_browser
+        if browser is None or not browser.isVisible():
+            raise NothingSelectedError("Open the Camera Browser to pick cameras")
+        return browser.picked_cameras()
+
+    def _camera_manip_show_selected(self):
+        self._actions.camera_manip_show_selected()
+
+    def _camera_manip_hide_selected(self):
+        self._actions.camera_manip_hide_selected()
+
+    def _camera_manip_show_all(self):
+        self._actions.camera_manip_show_all()
+
+    def _camera_manip_hide_all(self):
+        self._actions.camera_manip_hide_all()
+
+    def _load_rules(self):
+
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Load Rules Preset", os.path.dirname(self._actions.rules.path) if self._actions.rules else "",
+            "Rules Presets (*.json)")
+        if not path:
+            return
+
+        try:
+            rules = ClipRuleSet.load(path)
+        except (IOError, ClipRulesError) as err:
+            log.error(str(err))
+            QtWidgets.QMessageBox.warning(self, self.DISPLAY_NAME, str(err))
+            return
+
+        self._set_rules(rules)
+
+    def _clear_rules(self):
+        self._set_rules(None)
+
+    def _set_rules(self, rules):
+        # type: (Union[ClipRuleSet, None]) -> None
+
+        self._actions.rules = rules
+        if rules is None:
+            self._rules_current_action.setText("No rules loaded")
+            return
+
+        name = os.path.basename(rules.path) if rules.path else "Unsaved rules"
+        self._rules_current_action.setText("{} ({} rule(s))".format(name, len(rules)))
+        log.info('Loaded %d rule(s) from "%s"', len(rules), rules.path)
+
+    def _show_stats(self):
+
+        if self._stats_dialog is None:
+            dialog = QtWidgets.QDialog(self)
+            dialog.setWindowTitle("{} - Stats".format(self.DISPLAY_NAME))
+            dialog.resize(520, 400)
+
+            text = QtWidgets.QPlainTextEdit()
+            text.setReadOnly(True)
+            text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+
+            refresh_btn = QtWidgets.QPushButton("Refresh")
+            refresh_btn.clicked.connect(self._refresh_stats)
+
+            layout = QtWidgets.QVBoxLayout()
+            layout.addWidget(text)
+            layout.addWidget(refresh_btn)
+            dialog.setLayout(layout)
+
+            self._stats_dialog = dialog
+            self._stats_text = text
+
+        self._refresh_stats()
+        self._stats_dialog.show()
+        self._stats_dialog.raise_()
+
+    def _refresh_stats(self):
+        self._stats_text.setPlainText(self._actions.stats.format())
+
+    def _show_log(self):
+
+        if self._log_dialog is None:
+            dialog = QtWidgets.QDialog(self)
+            dialog.setWindowTitle("{} - Log".format(self.DISPLAY_NAME))
+            dialog.resize(640, 400)
+
+            text = QtWidgets.QPlainTextEdit()
+            text.setReadOnly(True)
+            text.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+            text.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.FixedFont))
+
+            refresh_btn = QtWidgets.QPushButton("Refresh")
+            refresh_btn.clicked.connect(self._refresh_log)
+
+            layout = QtWidgets.QVBoxLayout()
+            layout.addWidget(text)
+            layout.addWidget(refresh_btn)
+            dialog.setLayout(layout)
+
+            self._log_dialog = dialog
+            self._log_text = text
+
+        self._refresh_log()
+        self._log_dialog.show()
+        self._log_dialog.raise_()
+
+    def _refresh_log(self):
+        self._log_text.setPlainText("\n".join(self._log_buffer.lines()))
+        self._log_text.moveCursor(QtGui.QTextCursor.End)
+
+    def _clear_log(self):
+        self._log_buffer.clear()
+        if self._log_text is not None:
+            self._log_text.clear()
+
+    def _set_profiling(self, enabled):
+        self._actions.stats.profile_dir = self.PROFILE_DIR if enabled else None
+        log.info("cProfile capture %s", "enabled" if enabled else "disabled")
+
+    def _open_profile_dir(self):
+        if not os.path.isdir(self.PROFILE_DIR):
+            os.makedirs(self.PROFILE_DIR)
+        QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(self.PROFILE_DIR))
+
+    def _open_help(self):
+
+        import webbrowser
+        webbrowser.open(self.DOCUMENTATION_PATH)
@@ -0,0 +1,66 @@
+# coding=utf-8
+"""
+Maya plugin registering the undoable command of the tool.
+
+Edits made through OpenMaya (an "MDGModifier", an "MAnimCurveChange") are
+not recorded in the undo queue by themselves. The tool applies them, then
+runs "resetCameraClipPlanesUndo", which takes them from
+"maya_cameras.take_pending_undo" and records them as one undo step.
+
+Loaded by "maya_cameras.load_undo_command", nothing to load by hand.
+"""
+
+# Type hinting in PyCharm
+try:
+    from typing import List
+except ImportError:
+    pass
+
+# Maya imports
+import maya.api.OpenMaya as om
+
+
+# Tells Maya the plugin uses "maya.api.OpenMaya"
+maya_useNewAPI = True
+
+COMMAND_NAME = "resetCameraClipPlanesUndo"
+
+
+class ResetCameraClipPlanesUndoCommand(om.MPxCommand):
+    """
+    Record the pending edits as one undo step. The edits are already done
+    when the command runs: "doIt" only takes them, "redoIt" does them again.
+    """
+
+    def __init__(self):
+        om.MPxCommand.__init__(self)
+        self._edits = []  # type: List
+
+    @staticmethod
+    def creator():
+        return ResetCameraClipPlanesUndoCommand()
+
+    def isUndoable(self):
+        return True
+
+    def doIt(self, args):
+        # Imported here, the tool's modules are not needed to load the plugin
+        from maya_cameras import take_pending_undo
+
+        self._edits = take_pending_undo()
+
+    def redoIt(self):
+        for edit in self._edits:
+            edit.doIt()
+
+    def undoIt(self):
+        for edit in reversed(self._edits):
+            edit.undoIt()
+
+
+def initializePlugin(plugin):
+    om.MFnPlugin(plugin).registerCommand(COMMAND_NAME, ResetCameraClipPlanesUndoCommand.creator)
+
+
+def uninitializePlugin(plugin):
+    om.MFnPlugin(plugin).deregisterCommand(COMMAND_NAME)
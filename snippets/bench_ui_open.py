@@ -0,0 +1,118 @@
+# coding=utf-8
+"""
+Benchmark opening the tool UI, first open against reopen.
+
+A first open builds a new UI, "show(reuse=False)". A reopen shows again the
+UI kept alive from the previous open, "show()". Every sample closes the UI
+first, the way the user closes its panel, and includes the Qt events
+processed until the UI is drawn.
+
+The stand-in packages of "benchmarks/stubs" do not draw anything, so this
+is not a headless benchmark: it runs in an interactive Maya session only.
+From the Python tab of the Script Editor, with the repo and its "snippets"
+folder on "sys.path":
+
+    import bench_ui_open
+    bench_ui_open.main(["--samples", "20"])
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(HERE)
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+try:
+    timer = time.perf_counter
+except AttributeError:
+    timer = time.time
+
+
+def close_ui(tool_ui):
+    """
+    Close the UI's workspace control, as its close button does.
+    """
+    import maya.cmds as mc
+    from PySide2 import QtWidgets
+
+    control = "{}WorkspaceControl".format(tool_ui.INTERNAL_NAME)
+    if mc.workspaceControl(control, q=True, exists=True):
+        mc.workspaceControl(control, e=True, close=True)
+    else:
+        tool_ui.close()
+    QtWidgets.QApplication.processEvents()
+
+
+def time_open(samples, reuse):
+    """
+    Open the UI "samples" times, closing it before each.
+
+    :param samples: Number of opens to time.
+    :param reuse: Reopen the UI kept alive, instead of building a new one.
+
+    :return: Dict of the timing summary.
+
+    """
+    from PySide2 import QtWidgets
+    from reset_camera_clip_planes import show
+
+    tool_ui = show()
+    QtWidgets.QApplication.processEvents()
+
+    timings = []
+    for _ in range(samples):
+        close_ui(tool_ui)
+
+        start = timer()
+        tool_ui = show(reuse=reuse)
+        QtWidgets.QApplication.processEvents()
+        timings.append(timer() - start)
+
+    timings.sort()
+    return {
+        "case": "reopen" if reuse else "first_open",
+        "samples": samples,
+        "min_ms": timings[0] * 1000.0,
+        "median_ms": timings[len(timings) // 2] * 1000.0,
+        "max_ms": timings[-1] * 1000.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--json", help="Write the results to this file.")
+    args = parser.parse_args(argv)
+
+    try:
+        import maya.cmds as mc
+    except ImportError:
+        mc = None
+    if mc is None or mc.about(batch=True):
+        print("The UI can not be shown outside of Maya or in batch mode, run this in an interactive Maya session")
+        return 1
+
+    results = []
+    for reuse in (False, True):
+        result = time_open(args.samples, reuse)
+        results.append(result)
+        print("%(case)-12s min %(min_ms)8.2f ms  median %(median_ms)8.2f ms  max %(max_ms)8.2f ms" % result)
+
+    first_open, reopen = results
+    if reopen["median_ms"]:
+        print("reopen is %.1fx faster" % (first_open["median_ms"] / reopen["median_ms"]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+# coding=utf-8
+"""
+Run the tests against the tool's modules and, in place of Maya and Qt, the
+stand-in packages from "benchmarks/stubs".
+"""
+
+import os
+import sys
+
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TESTS_DIR)
+STUBS_DIR = os.path.join(REPO_ROOT, "benchmarks", "stubs")
+
+for path in (STUBS_DIR, REPO_ROOT):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,60 @@
+# coding=utf-8
+"""
+Write the Maya binary fixtures of "test_mb_clip_planes.py".
+
+The files are minimal IFF trees with the chunks "mb_clip_planes" reads,
+in the 32-bit ("FOR4") and 64-bit ("FOR8") layouts:
+
+- "shotCamShape": near and far clip planes stored.
+- "topShape": far clip plane at its default value, not stored.
+- "boxShape": a mesh with a "ncp" attribute, left untouched.
+
+Run from this directory to regenerate them:
+
+    python make_mb_fixtures.py
+"""
+
+import struct
+
+
+_HEADERS = {
+    b"FOR4": (struct.Struct(">4sI"), 4),
+    b"FOR8": (struct.Struct(">4s4xQ"), 8),
+}
+
+
+def _pad(data, alignment):
+    return data + b"\0" * (-len(data) % alignment)
+
+
+def chunk(form, tag, data):
+    header, alignment = _HEADERS[form]
+    return _pad(header.pack(tag, len(data)) + data, alignment)
+
+
+def group(form, type_id, children):
+    _, alignment = _HEADERS[form]
+    return chunk(form, form, _pad(type_id, alignment) + b"".join(children))
+
+
+def node(form, type_id, name, parent, doubles):
+    children = [chunk(form, b"CREA", b"\0" + name + b"\0" + parent + b"\0")]
+    for attr, value in doubles:
+        children.append(chunk(form, b"DBLE", attr + b"\0" + struct.pack(">d", value)))
+    return group(form, type_id, children)
+
+
+def scene(form):
+    return group(form, b"Maya", [
+        group(form, b"HEAD", [chunk(form, b"VERS", b"2020\0")]),
+        node(form, b"XFRM", b"shotCam", b"", []),
+        node(form, b"DCAM", b"shotCamShape", b"shotCam", [(b".ncp", 0.5), (b".fcp", 2000.0)]),
+        node(form, b"DCAM", b"topShape", b"top", [(b".ncp", 0.5)]),
+        node(form, b"DMSH", b"boxShape", b"box", [(b".ncp", 0.5)]),
+    ])
+
+
+if __name__ == "__main__":
+    for form, name in ((b"FOR4", "cameras_for4.mb"), (b"FOR8", "cameras_for8.mb")):
+        with open(name, "wb") as f:
+            f.write(scene(form))
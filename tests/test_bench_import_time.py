@@ -0,0 +1,50 @@
+# coding=utf-8
+"""
+Cold import checks of the headless modules, run by
+"benchmarks/bench_import_time.py" against the stand-in "maya" package.
+
+The import time budget is left to the benchmark script: timings of a
+shared test machine vary too much to fail the suite on.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.join(REPO_ROOT, "benchmarks")
+SCRIPT = os.path.join(BENCHMARKS_DIR, "bench_import_time.py")
+
+if BENCHMARKS_DIR not in sys.path:
+    sys.path.insert(0, BENCHMARKS_DIR)
+
+from bench_import_time import HEADLESS_MODULES  # noqa: E402
+
+
+def run_bench(*args):
+    proc = subprocess.Popen(
+        [sys.executable, SCRIPT] + list(args), stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    out, _ = proc.communicate()
+    return proc.returncode, out.decode("utf-8")
+
+
+def test_headless_modules_without_ui(tmpdir):
+    results_path = str(tmpdir.join("import_time.json"))
+    returncode, out = run_bench("--samples", "3", "--budget-ms", "0", "--json", results_path)
+
+    assert returncode == 0, out
+    with open(results_path) as f:
+        results = dict((result["module"], result) for result in json.load(f))
+
+    assert sorted(results) == sorted(HEADLESS_MODULES)
+    for module, result in results.items():
+        assert result["ui_modules"] == [], module
+        assert not result["pymel_loaded"], module
+
+
+def test_unimportable_module_fails():
+    returncode, out = run_bench("--samples", "1", "no_such_module")
+
+    assert returncode == 1
+    assert "FAIL: no_such_module is not importable" in out
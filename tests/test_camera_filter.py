@@ -0,0 +1,127 @@
+# coding=utf-8
+
+import random
+import re
+
+import camera_filter
+from camera_filter import CameraNameIndex
+
+
+NAMES = [
+    "|shots|sh010|shotCam|shotCamShape",
+    "|shots|sh020|shotCam|shotCamShape",
+    "|previs|previsCam|previsCamShape",
+    "|persp|perspShape",
+    "|top|topShape",
+    "|CAMS|ShotCAM|ShotCAMShape",
+    "|rig:cam_grp|rig:renderCam|rig:renderCamShape",
+]
+
+
+def expected(names, text, regex=False):
+    """
+    Brute force: the rows matching "text", searched one name at a time.
+    """
+    if text.startswith("re:"):
+        text = text[3:]
+        regex = True
+    if not text:
+        return None
+
+    rows = []
+    for row, name in enumerate(names):
+        if text == text.lower():
+            name = name.lower()
+        found = re.search(text, name) if regex else text in name
+        if found:
+            rows.append(row)
+    return rows
+
+
+def counting_imap(monkeypatch):
+    """
+    Count the names searched, as a list holding the number.
+    """
+    searched = [0]
+    imap = camera_filter.imap
+
+    def counted(func, names, *iterables):
+        names = list(names)
+        searched[0] += len(names)
+        return imap(func, names, *iterables)
+
+    monkeypatch.setattr(camera_filter, "imap", counted)
+    return searched
+
+
+def test_typing_narrows_previous_matches(monkeypatch):
+    index = CameraNameIndex(NAMES)
+    searched = counting_imap(monkeypatch)
+
+    assert index.match("s") == expected(NAMES, "s")
+    assert searched[0] == len(NAMES)
+
+    for text in ("sh", "sho", "shot", "shotc"):
+        searched[0] = 0
+        previous = index.match(text[:-1])
+        searched[0] = 0
+        assert index.match(text) == expected(NAMES, text)
+        assert searched[0] == len(previous)
+
+
+def test_longer_text_not_extending_previous():
+    index = CameraNameIndex(NAMES)
+
+    # "am" is in "cam", so the matches of "am" are narrowed
+    assert index.match("am") == expected(NAMES, "am")
+    assert index.match("cam") == expected(NAMES, "cam")
+    # "top" does not contain "cam", every name is searched again
+    assert index.match("top") == expected(NAMES, "top")
+
+
+def test_deleting_text_searches_every_name():
+    index = CameraNameIndex(NAMES)
+
+    assert index.match("shotcam") == expected(NAMES, "shotcam")
+    assert index.match("shot") == expected(NAMES, "shot")
+    assert index.match("sh") == expected(NAMES, "sh")
+
+
+def test_case_change_searches_every_name():
+    index = CameraNameIndex(NAMES)
+
+    # Lower case matches any case, upper case only the same case
+    assert index.match("cam") == expected(NAMES, "cam")
+    assert index.match("CAM") == expected(NAMES, "CAM") == [5]
+    assert index.match("CAMS") == expected(NAMES, "CAMS") == [5]
+    assert index.match("cams") == expected(NAMES, "cams") == [0, 1, 2, 5, 6]
+    assert index.match("camshape") == expected(NAMES, "camshape")
+
+
+def test_regex_and_empty_text_reset_narrowing():
+    index = CameraNameIndex(NAMES)
+
+    assert index.match("shot") == expected(NAMES, "shot")
+    assert index.match("re:^\\|top") == expected(NAMES, "re:^\\|top") == [4]
+    assert index.match("shotcam") == expected(NAMES, "shotcam")
+    assert index.match("") is None
+    assert index.match("persp") == expected(NAMES, "persp") == [3]
+    assert index.match("persp", regex=True) == [3]
+
+
+def test_random_typing_matches_brute_force():
+    rng = random.Random(1)
+    alphabet = "abcmpSsCAhot_:|0"
+    names = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))) for _ in range(300)]
+    index = CameraNameIndex(names)
+
+    text = ""
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.6:
+            text += rng.choice(alphabet)
+        elif action < 0.9:
+            text = text[:-1]
+        else:
+            text = text[1:]
+        assert index.match(text) == expected(names, text), text
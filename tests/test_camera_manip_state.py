@@ -0,0 +1,46 @@
+# coding=utf-8
+
+from maya import _stub
+
+from maya_cameras import CameraManipState
+
+
+def camera_shapes(count):
+    return [transform + "|" + transform.rsplit("|", 1)[-1] + "Shape" for transform in _stub.build_camera_scene(count)]
+
+
+def test_only_changed_cameras_edited():
+    cameras = camera_shapes(4)
+    state = CameraManipState()
+
+    assert state.set_clipping(cameras[:2], True) == 2
+    assert state.set_clipping(cameras, True) == 2
+    assert state.set_clipping(cameras, True) == 0
+    assert state.set_clipping(cameras[1:2], False) == 1
+    assert state.set_clipping(cameras, True) == 1
+    assert _stub.scene.calls["renderManip"] == 6
+
+
+def test_duplicate_cameras():
+    # The same shape twice, and once by its full path then by its name
+    cameras = camera_shapes(3)
+    duplicated = [cameras[1], cameras[0], cameras[1], cameras[2], cameras[2].rsplit("|", 1)[-1]]
+    state = CameraManipState()
+
+    assert state.set_clipping(duplicated, True) == 3
+    assert len(state) == 3
+
+    # Each camera keeps its own state
+    assert state.set_clipping(cameras[:1], False) == 1
+    assert state.set_clipping(duplicated, True) == 1
+    assert _stub.scene.calls["renderManip"] == 5
+
+
+def test_forget_edits_every_camera():
+    cameras = camera_shapes(3)
+    state = CameraManipState()
+    state.set_clipping(cameras, True)
+
+    state.forget()
+
+    assert state.set_clipping(cameras, True) == 3
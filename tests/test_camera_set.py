@@ -0,0 +1,95 @@
+# coding=utf-8
+
+import math
+
+from maya import _stub
+
+from camera_set import CameraSet
+from clip_planes import ClipPair
+
+
+def test_duplicates_keep_first():
+    cameras = CameraSet(["|a|aShape", "|b|bShape", "|a|aShape"], [1.0, 2.0, 3.0], [10.0, 20.0, 30.0])
+
+    assert cameras.paths == ("|a|aShape", "|b|bShape")
+    assert cameras.clip_values() == [(1.0, 10.0), (2.0, 20.0)]
+
+
+def test_membership_and_index():
+    cameras = CameraSet(["|b|bShape", "|a|aShape"])
+
+    assert "|a|aShape" in cameras
+    assert "|c|cShape" not in cameras
+    assert cameras.index == {"|b|bShape": 0, "|a|aShape": 1}
+    assert list(cameras) == ["|b|bShape", "|a|aShape"]
+    assert cameras[1] == "|a|aShape"
+    assert len(cameras) == 2
+
+
+def test_union_keeps_order_and_values():
+    first = CameraSet(["|c|cShape", "|a|aShape"], [3.0, 1.0], [30.0, 10.0])
+    second = CameraSet(["|a|aShape", "|b|bShape", "|c|cShape"], [9.0, 2.0, 9.0], [90.0, 20.0, 90.0])
+
+    union = first | second
+
+    assert union.paths == ("|c|cShape", "|a|aShape", "|b|bShape")
+    assert union.clip_values() == [(3.0, 30.0), (1.0, 10.0), (2.0, 20.0)]
+
+
+def test_union_with_paths():
+    union = CameraSet(["|a|aShape"]).union(["|b|bShape", "|a|aShape", "|b|bShape"])
+
+    assert union.paths == ("|a|aShape", "|b|bShape")
+
+
+def test_difference_keeps_order():
+    cameras = CameraSet(["|c|cShape", "|a|aShape", "|b|bShape"], [3.0, 1.0, 2.0], [30.0, 10.0, 20.0])
+
+    difference = cameras - ["|a|aShape", "|d|dShape"]
+
+    assert difference.paths == ("|c|cShape", "|b|bShape")
+    assert difference.clip_values() == [(3.0, 30.0), (2.0, 20.0)]
+    assert (cameras - cameras).paths == ()
+
+
+def test_intersection_keeps_order():
+    cameras = CameraSet(["|c|cShape", "|a|aShape", "|b|bShape"])
+
+    assert (cameras & CameraSet(["|b|bShape", "|c|cShape"])).paths == ("|c|cShape", "|b|bShape")
+
+
+def test_compress_and_take():
+    cameras = CameraSet(["|a|aShape", "|b|bShape", "|c|cShape"], [1.0, 2.0, 3.0], [10.0, 20.0, 30.0])
+
+    assert cameras.compress([True, False, True]).paths == ("|a|aShape", "|c|cShape")
+    taken = cameras.take([2, 0])
+    assert taken.paths == ("|c|cShape", "|a|aShape")
+    assert taken.clip_values() == [(3.0, 30.0), (1.0, 10.0)]
+
+
+def test_changed():
+    cameras = CameraSet(["|a|aShape", "|b|bShape"], [1.0, 1.0 + 1e-9], [50000.0, 100.0])
+
+    assert cameras.changed(ClipPair(1.0, 50000.0)) == [False, True]
+    assert cameras.changed([ClipPair(2.0, 50000.0), ClipPair(1.0, 100.0)]) == [True, False]
+
+
+def test_unread_values_changed():
+    cameras = CameraSet(["|a|aShape"])
+
+    assert not cameras.clip_values_read
+    assert math.isnan(cameras.near[0])
+    assert cameras.changed(ClipPair(1.0, 50000.0)) == [True]
+    assert CameraSet().clip_values_read
+
+
+def test_read_and_write_clip_values():
+    _stub.build_camera_scene(3)
+    cameras = CameraSet.all()
+
+    assert len(cameras) == 3
+    assert cameras.read_clip_values().clip_values() == [(0.1, 10000.0)] * 3
+
+    assert cameras.take([1]).write_clip_values(ClipPair(1.0, 50000.0)) == 1
+    assert CameraSet.all().read_clip_values().clip_values() == [
+        (0.1, 10000.0), (1.0, 50000.0), (0.1, 10000.0)]
@@ -0,0 +1,129 @@
+# coding=utf-8
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from clip_audit import AuditCamera  # noqa: E402
+from clip_audit import DEFAULT_DISTANCES  # noqa: E402
+from clip_audit import audit_cameras  # noqa: E402
+from clip_audit import depth_resolution  # noqa: E402
+from clip_audit import report_fields  # noqa: E402
+from clip_audit import suggest_near  # noqa: E402
+
+
+def camera(name, near, far, orthographic=False):
+    return AuditCamera("", name, near, far, orthographic, None)
+
+
+def relative_error(near, far, distance, orthographic=False, depth_format="d24"):
+    """
+    Depth resolution at "distance", relative to it, of a single camera.
+    """
+    resolution = depth_resolution([near], [far], [orthographic], [distance], depth_format)
+    return resolution[0, 0] / distance
+
+
+@pytest.mark.parametrize("far, distance, max_relative_error", [
+    (10000.0, 10000.0, 0.01),
+    (10000.0, 100.0, 0.001),
+    (1.0e6, 5.0e5, 0.01),
+    (100.0, 50.0, 0.0001),
+])
+def test_suggested_near_resolves_distance(far, distance, max_relative_error):
+    near = suggest_near(far, distance, max_relative_error)
+
+    # Rounded up to one significant digit
+    magnitude = 10 ** math.floor(math.log10(near))
+    assert near / magnitude == pytest.approx(round(near / magnitude))
+
+    assert relative_error(near, far, distance) <= max_relative_error
+    # Not rounded up more than the digit: a near half as far misses
+    assert relative_error(near / 2.0, far, distance) > max_relative_error
+
+
+def test_suggested_near_of_floating_depth_is_smaller():
+    assert suggest_near(10000.0, 10000.0, depth_format="d32f") < suggest_near(10000.0, 10000.0)
+
+
+def test_perspective_resolution_grows_with_distance():
+    resolution = depth_resolution([0.1], [10000.0], [False], DEFAULT_DISTANCES)[0]
+    assert (np.diff(resolution) > 0).all()
+
+    # Quadratic in the distance, as the module documents
+    np.testing.assert_allclose(
+        resolution, np.square(DEFAULT_DISTANCES) * (10000.0 - 0.1) / (10000.0 * 0.1 * 2 ** 24))
+
+
+def test_orthographic_resolution_is_constant():
+    resolution = depth_resolution([0.1], [10000.0], [True], DEFAULT_DISTANCES)[0]
+    np.testing.assert_allclose(resolution, (10000.0 - 0.1) / 2 ** 24)
+
+
+def test_distances_outside_clip_planes_not_resolved():
+    resolution = depth_resolution([5.0, 20.0], [500.0, 10.0], [False, False], [1.0, 10.0, 1000.0])
+    assert np.isnan(resolution[0]).tolist() == [True, False, True]
+    # Far in front of near, nothing is resolved
+    assert np.isnan(resolution[1]).all()
+
+
+def test_tiny_near_flagged():
+    tiny, sane = audit_cameras([camera("tiny", 0.001, 10000.0), camera("sane", 1.0, 10000.0)])
+
+    assert list(tiny) == report_fields()
+    assert tiny["flagged"] and not sane["flagged"]
+    assert tiny["worst_relative_error"] > 0.01 >= sane["worst_relative_error"]
+    assert sane["suggested_near"] is None
+
+    # The suggestion is no longer flagged
+    assert tiny["suggested_near"] == suggest_near(10000.0, 10000.0)
+    suggested, = audit_cameras([camera("tiny", tiny["suggested_near"], 10000.0)])
+    assert not suggested["flagged"]
+
+
+def test_suggestion_for_farthest_distance_within_clip_planes():
+    row, = audit_cameras([camera("short", 0.0001, 500.0)])
+
+    assert row["flagged"]
+    assert row["d24@1000"] is None and row["d24@10000"] is None
+    assert row["suggested_near"] == suggest_near(500.0, 100.0)
+
+
+def test_suggestion_never_below_near():
+    # Flagged at a smaller error than the suggestion resolves at its near
+    row, = audit_cameras([camera("cam", 0.05, 10000.0)], max_relative_error=0.001)
+    assert row["flagged"]
+    assert row["suggested_near"] >= 0.05
+
+
+def test_orthographic_flagged_without_suggestion():
+    deep, shallow = audit_cameras([
+        camera("deep", 0.0, 1.0e9, orthographic=True),
+        camera("shallow", 0.001, 10000.0, orthographic=True),
+    ])
+
+    assert deep["orthographic"] and deep["flagged"]
+    assert deep["suggested_near"] is None
+    assert deep["far_near_ratio"] is None
+    assert not shallow["flagged"]
+
+
+def test_flagged_against_depth_format():
+    cameras = [camera("cam", 1.0, 10000.0)]
+
+    row, = audit_cameras(cameras)
+    floating, = audit_cameras(cameras, depth_format="d32f")
+
+    # Both formats are reported, whichever one is flagged against
+    columns = [field for field in report_fields() if "@" in field]
+    assert [row[field] for field in columns] == [floating[field] for field in columns]
+
+    # Floating point depth is finer only close to the near clip plane
+    assert row["d32f@1"] < row["d24@1"]
+    assert row["d32f@10000"] >= row["d24@10000"]
+
+
+def test_no_cameras():
+    assert list(audit_cameras([])) == []
@@ -0,0 +1,245 @@
+# coding=utf-8
+"""
+"clip_fit" against a brute force evaluation of every box corner in camera space.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from clip_fit import BoxClusters  # noqa: E402
+from clip_fit import clip_masks  # noqa: E402
+from clip_fit import count_clipped  # noqa: E402
+from clip_fit import fit_clip_planes  # noqa: E402
+
+
+def look_at_inverse(position, target):
+    """
+    Return the world inverse matrix of a camera at "position" looking at "target".
+    """
+    position = np.asarray(position, dtype=np.float64)
+    z_axis = position - np.asarray(target, dtype=np.float64)
+    z_axis /= np.linalg.norm(z_axis)
+    x_axis = np.cross([0.0, 1.0, 0.0], z_axis)
+    x_axis /= np.linalg.norm(x_axis)
+    y_axis = np.cross(z_axis, x_axis)
+
+    matrix = np.eye(4)
+    matrix[0, :3] = x_axis
+    matrix[1, :3] = y_axis
+    matrix[2, :3] = z_axis
+    matrix[3, :3] = position
+    return np.linalg.inv(matrix)
+
+
+def random_scene(rng, camera_count, box_count, box_size=20.0):
+    """
+    :return: Dict of the "fit_clip_planes" arguments, boxes around the
+        origin and cameras around them, some orthographic.
+    """
+    centers = rng.uniform(-500.0, 500.0, (box_count, 3))
+    half_sizes = rng.uniform(0.0, box_size, (box_count, 3))
+
+    positions = rng.uniform(-800.0, 800.0, (camera_count, 3))
+    targets = rng.uniform(-200.0, 200.0, (camera_count, 3))
+    orthographic = rng.uniform(size=camera_count) < 0.25
+    # Orthographic views are sized in scene units, perspective ones in tangents
+    scale = np.where(orthographic, 200.0, 1.0)
+    return dict(
+        world_inverse=np.array([look_at_inverse(p, t) for p, t in zip(positions, targets)]),
+        orthographic=orthographic,
+        half_width=rng.uniform(0.2, 1.5, camera_count) * scale,
+        half_height=rng.uniform(0.2, 1.5, camera_count) * scale,
+        bounds_min=centers - half_sizes,
+        bounds_max=centers + half_sizes,
+    )
+
+
+def depth_ranges(world_inverse, orthographic, half_width, half_height, bounds_min, bounds_max):
+    """
+    Brute force: per camera and box, if the box is visible and its depth range.
+
+    Every corner of every box is moved to camera space, where the frustum
+    tests are written out directly. The tests are linear, so a box is
+    outside a plane when all its corners are.
+
+    :return: Visible (C, N) bools, lowest (C, N) and highest (C, N) depths.
+
+    """
+    bounds_min = np.asarray(bounds_min, dtype=np.float64).reshape(-1, 3)
+    bounds_max = np.asarray(bounds_max, dtype=np.float64).reshape(-1, 3)
+    shape = (len(world_inverse), len(bounds_min))
+    visible = np.zeros(shape, dtype=bool)
+    low = np.zeros(shape)
+    high = np.zeros(shape)
+
+    for cc, matrix in enumerate(world_inverse):
+        for bb, (box_min, box_max) in enumerate(zip(bounds_min, bounds_max)):
+            corners = np.array([
+                (x, y, z, 1.0)
+                for x in (box_min[0], box_max[0])
+                for y in (box_min[1], box_max[1])
+                for z in (box_min[2], box_max[2])
+            ])
+            x, y, z = np.dot(corners, matrix)[:, :3].T
+            depth = -z
+            if orthographic[cc]:
+                sides = (half_width[cc] - x, half_width[cc] + x, half_height[cc] - y, half_height[cc] + y)
+            else:
+                sides = (
+                    half_width[cc] * depth - x, half_width[cc] * depth + x,
+                    half_height[cc] * depth - y, half_height[cc] * depth + y,
+                )
+            visible[cc, bb] = all(values.max() >= 0.0 for values in (depth,) + sides)
+            low[cc, bb] = depth.min()
+            high[cc, bb] = depth.max()
+
+    return visible, low, high
+
+
+def brute_force_fit(scene, min_near=0.01, padding=0.05):
+    visible, low, high = depth_ranges(**scene)
+    near = np.where(visible, low, np.inf).min(axis=1, initial=np.inf)
+    far = np.where(visible, high, -np.inf).max(axis=1, initial=-np.inf)
+
+    seen = np.isfinite(near)
+    near = np.maximum(np.where(seen, near, np.nan) * (1.0 - padding), min_near)
+    far = np.where(seen, far, np.nan)
+    far = np.maximum(far * (1.0 + padding), near * (1.0 + padding))
+    return near, far
+
+
+def brute_force_masks(scene, near, far):
+    visible, low, high = depth_ranges(**scene)
+    near = np.broadcast_to(near, (len(visible),))[:, None]
+    far = np.broadcast_to(far, (len(visible),))[:, None]
+
+    clipped = visible & ((high < near) | (low > far))
+    partial = visible & ~clipped & ((low < near) | (high > far))
+    return clipped, partial
+
+
+def assert_matches_brute_force(scene, near, far):
+    clipped, partial = brute_force_masks(scene, near, far)
+
+    masks = clip_masks(near=near, far=far, **scene)
+    np.testing.assert_array_equal(masks[0], clipped)
+    np.testing.assert_array_equal(masks[1], partial)
+
+    counts = count_clipped(near=near, far=far, **scene)
+    np.testing.assert_array_equal(counts[0], clipped.sum(axis=1))
+    np.testing.assert_array_equal(counts[1], partial.sum(axis=1))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fit_matches_brute_force(seed):
+    scene = random_scene(np.random.RandomState(seed), 12, 300)
+
+    near, far = fit_clip_planes(**scene)
+    expected_near, expected_far = brute_force_fit(scene)
+
+    np.testing.assert_allclose(near, expected_near, rtol=1e-9)
+    np.testing.assert_allclose(far, expected_far, rtol=1e-9)
+
+
+def test_fit_with_reused_small_clusters():
+    scene = random_scene(np.random.RandomState(10), 8, 203)
+    expected = brute_force_fit(scene)
+
+    clusters = BoxClusters(scene["bounds_min"], scene["bounds_max"], size=8)
+    scene.update(bounds_min=clusters, bounds_max=None)
+
+    for _ in range(2):
+        near, far = fit_clip_planes(**scene)
+        np.testing.assert_allclose(near, expected[0], rtol=1e-9)
+        np.testing.assert_allclose(far, expected[1], rtol=1e-9)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_clipped_match_brute_force(seed):
+    rng = np.random.RandomState(seed)
+    scene = random_scene(rng, 12, 300)
+    near = rng.uniform(1.0, 600.0, 12)
+    far = near + rng.uniform(10.0, 800.0, 12)
+
+    assert_matches_brute_force(scene, near, far)
+
+
+def test_clipped_with_small_clusters():
+    rng = np.random.RandomState(20)
+    scene = random_scene(rng, 10, 203)
+    near = rng.uniform(1.0, 600.0, 10)
+    far = near + rng.uniform(10.0, 800.0, 10)
+    expected = brute_force_masks(scene, near, far)
+
+    clusters = BoxClusters(scene["bounds_min"], scene["bounds_max"], size=8)
+    scene.update(bounds_min=clusters, bounds_max=None)
+
+    clipped, partial = count_clipped(near=near, far=far, **scene)
+    np.testing.assert_array_equal(clipped, expected[0].sum(axis=1))
+    np.testing.assert_array_equal(partial, expected[1].sum(axis=1))
+
+    masks = clip_masks(near=near, far=far, **scene)
+    np.testing.assert_array_equal(masks[0], expected[0])
+    np.testing.assert_array_equal(masks[1], expected[1])
+
+
+def test_points():
+    # Boxes of no size, the usual case for locators and particles
+    scene = random_scene(np.random.RandomState(30), 6, 150, box_size=0.0)
+
+    near, far = fit_clip_planes(**scene)
+    expected_near, expected_far = brute_force_fit(scene)
+    np.testing.assert_allclose(near, expected_near, rtol=1e-9)
+    np.testing.assert_allclose(far, expected_far, rtol=1e-9)
+
+    assert_matches_brute_force(scene, 300.0, 900.0)
+
+
+def test_no_boxes():
+    scene = random_scene(np.random.RandomState(40), 3, 0)
+
+    near, far = fit_clip_planes(**scene)
+    assert np.isnan(near).all() and np.isnan(far).all()
+
+    clipped, partial = count_clipped(near=1.0, far=100.0, **scene)
+    assert clipped.tolist() == [0, 0, 0] and partial.tolist() == [0, 0, 0]
+
+    masks = clip_masks(near=1.0, far=100.0, **scene)
+    assert masks[0].shape == (3, 0) and masks[1].shape == (3, 0)
+
+
+def test_boxes_behind_camera():
+    # Camera at the origin looking down -Z, every box behind it
+    rng = np.random.RandomState(50)
+    centers = rng.uniform(-50.0, 50.0, (100, 3))
+    centers[:, 2] = rng.uniform(10.0, 500.0, 100)
+    scene = dict(
+        world_inverse=np.eye(4)[None], orthographic=[False], half_width=[1.0], half_height=[1.0],
+        bounds_min=centers - 1.0, bounds_max=centers + 1.0,
+    )
+
+    near, far = fit_clip_planes(**scene)
+    assert np.isnan(near).all() and np.isnan(far).all()
+    assert_matches_brute_force(scene, 1.0, 100.0)
+    assert count_clipped(near=1.0, far=100.0, **scene)[0].tolist() == [0]
+
+
+def test_single_cluster():
+    # A tight group of boxes, all in one cluster, straddling the clip planes
+    rng = np.random.RandomState(60)
+    centers = rng.uniform(-5.0, 5.0, (40, 3))
+    centers[:, 2] -= 100.0
+    scene = dict(
+        world_inverse=np.array([np.eye(4), look_at_inverse((0.0, 0.0, -300.0), (0.0, 0.0, -100.0))]),
+        orthographic=[False, True], half_width=[0.5, 20.0], half_height=[0.5, 20.0],
+        bounds_min=centers - 0.5, bounds_max=centers + 0.5,
+    )
+    assert len(BoxClusters(scene["bounds_min"], scene["bounds_max"]).members) == 1
+
+    near, far = fit_clip_planes(**scene)
+    expected_near, expected_far = brute_force_fit(scene)
+    np.testing.assert_allclose(near, expected_near, rtol=1e-9)
+    np.testing.assert_allclose(far, expected_far, rtol=1e-9)
+
+    assert_matches_brute_force(scene, np.array([98.0, 199.0]), np.array([101.0, 202.0]))
@@ -0,0 +1,66 @@
+# coding=utf-8
+
+import json
+
+from clip_planes_batch import BatchTask
+from clip_planes_batch import load_journal
+from clip_planes_batch import run_batch
+from clip_planes_batch import STATUS_FAILED
+from clip_planes_batch import STATUS_OK
+
+
+SCENE = (
+    b'//Maya ASCII 2020 scene\n'
+    b'createNode camera -n "camShape" -p "cam";\n'
+    b'\tsetAttr ".ncp" 0.5;\n'
+    b'\tsetAttr ".fcp" 2000;\n'
+)
+
+
+def batch(tmpdir, paths, near=1.0, far=50000.0):
+    options = {"near": near, "far": far, "maya": False}
+    tasks = [BatchTask(str(path), str(path)) for path in paths]
+    return run_batch(tasks, options, workers=1, timeout=60.0, journal_path=str(tmpdir.join("batch.journal")))
+
+
+def test_non_maya_file_fails(tmpdir):
+    path = tmpdir.join("bad.ma")
+    path.write_binary(b"notmaya\n")
+
+    results = batch(tmpdir, [path])
+
+    assert [result.status for result in results] == [STATUS_FAILED]
+    assert "Not a Maya ASCII file" in results[0].detail
+    assert path.read_binary() == b"notmaya\n"
+    assert load_journal(str(tmpdir.join("batch.journal"))) == {}
+
+
+def test_journal_skips_scenes_done_with_same_options(tmpdir):
+    path = tmpdir.join("scene.ma")
+    path.write_binary(SCENE)
+
+    results = batch(tmpdir, [path])
+    assert [(result.status, result.detail["written"]) for result in results] == [(STATUS_OK, 1)]
+
+    assert batch(tmpdir, [path]) == []
+
+
+def test_journal_redoes_scenes_done_with_other_options(tmpdir):
+    path = tmpdir.join("scene.ma")
+    path.write_binary(SCENE)
+    batch(tmpdir, [path])
+
+    results = batch(tmpdir, [path], near=2.0)
+
+    assert [result.status for result in results] == [STATUS_OK]
+    assert b'\tsetAttr ".ncp" 2;\n' in path.read_binary()
+
+
+def test_journal_entries_without_options_redone(tmpdir):
+    path = tmpdir.join("scene.ma")
+    path.write_binary(SCENE)
+    entry = {"path": str(path), "status": STATUS_OK, "seconds": 0.1, "detail": {}}
+    tmpdir.join("batch.journal").write(json.dumps(entry) + "\n")
+
+    assert load_journal(str(tmpdir.join("batch.journal"))) == {str(path): None}
+    assert [result.status for result in batch(tmpdir, [path])] == [STATUS_OK]
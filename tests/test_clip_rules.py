@@ -0,0 +1,158 @@
+# coding=utf-8
+
+import pytest
+
+from clip_planes import ClipPair
+from clip_rules import camera_key
+from clip_rules import clip_rule
+from clip_rules import ClipRuleSet
+from clip_rules import ClipRulesError
+
+
+SHOT = ClipPair(1.0, 50000.0)
+PREVIS = ClipPair(0.1, 100000.0)
+
+
+def labels(rule_set, paths, attributes=None):
+    return [rule.label if rule else None for rule in rule_set.resolve(paths, attributes)]
+
+
+def test_camera_key():
+    assert camera_key("|grp|previs:shot1|previs:shot1Shape", ["isGameCamera"]) == (
+        "shot1\nprevis\n|grp|previs:shot1|previs:shot1Shape\n isGameCamera ")
+
+
+def test_name_pattern_does_not_leak_into_other_fields():
+    # "[^x]*" would match across the end of the name line, up to "previs" in the path
+    rule_set = ClipRuleSet([clip_rule("Previs shots", name="^shot[^x]*previs", clip_values=PREVIS)])
+
+    assert labels(rule_set, ["|grp_previs|shot1|shot1Shape", "|grp|shot_previs|shot_previsShape"]) == [
+        None, "Previs shots"]
+
+
+def test_whitespace_class_does_not_leak_into_attributes():
+    rule_set = ClipRuleSet([clip_rule("Spaced", path=r"Shape\s", clip_values=SHOT)])
+
+    assert labels(rule_set, ["|cam|camShape"], [["isGameCamera"]]) == [None]
+
+
+def test_namespace_pattern_anchored_to_its_field():
+    rule_set = ClipRuleSet([clip_rule("Previs", namespace="^previs$", clip_values=PREVIS)])
+
+    assert labels(rule_set, ["|previs:cam|previs:camShape", "|cam|camShape", "|previs_cam|previs_camShape"]) == [
+        "Previs", None, None]
+
+
+def test_first_matching_rule_wins():
+    rule_set = ClipRuleSet([
+        clip_rule("Startup", name="^(persp|top)$"),
+        clip_rule("Game", attribute="isGameCamera"),
+        clip_rule("Previs", namespace="^previs", clip_values=PREVIS),
+        clip_rule("Shots", name="^shot", clip_values=SHOT),
+    ])
+    paths = ["|persp|perspShape", "|previs:shot1|previs:shot1Shape", "|shot2|shot2Shape", "|shot3|shot3Shape",
+             "|other|otherShape"]
+    attributes = [["isGameCamera"], [], [], ["isGameCamera"], []]
+
+    assert labels(rule_set, paths, attributes) == ["Startup", "Previs", "Shots", "Game", None]
+
+
+def test_rule_needs_every_condition():
+    rule_set = ClipRuleSet([
+        clip_rule("Previs shots", name="^shot", namespace="^previs", clip_values=PREVIS),
+        clip_rule("Shots", name="^shot", clip_values=SHOT),
+    ])
+
+    assert labels(rule_set, ["|previs:shot1|previs:shot1Shape", "|layout:shot1|layout:shot1Shape"]) == [
+        "Previs shots", "Shots"]
+
+
+def test_shared_patterns_and_cached_values():
+    rule_set = ClipRuleSet([
+        clip_rule("A", namespace="^a$", name="1$", clip_values=SHOT),
+        clip_rule("B", namespace="^a$", clip_values=PREVIS),
+        clip_rule("C", namespace="^b$", name="1$", clip_values=SHOT),
+    ])
+    paths = ["|a:cam1|a:cam1Shape", "|a:cam2|a:cam2Shape", "|b:cam1|b:cam1Shape", "|b:cam2|b:cam2Shape"]
+
+    assert labels(rule_set, paths) == ["A", "B", "C", None]
+
+
+def test_backreferences_and_group_names():
+    rule_set = ClipRuleSet([
+        clip_rule("Doubled", name=r"^(\w)\1", clip_values=SHOT),
+        clip_rule("Named", name=r"(?P<take>\d+)$", path=r"(?P<take>grp)", clip_values=PREVIS),
+    ])
+
+    assert labels(rule_set, ["|aacam|aacamShape", "|grp|cam2|cam2Shape", "|cam|camShape"]) == [
+        "Doubled", "Named", None]
+
+
+def test_inline_flags():
+    rule_set = ClipRuleSet([
+        clip_rule("Shots", name="(?i)^shot", clip_values=SHOT),
+        clip_rule("Previs", namespace="(?i)^previs", clip_values=PREVIS),
+    ])
+
+    assert labels(rule_set, ["|SHOT1|SHOT1Shape", "|PREVIS:cam|PREVIS:camShape"]) == ["Shots", "Previs"]
+
+
+def test_combined_patterns_all_found():
+    # Overlapping, anchored and unanchored patterns of one field
+    rule_set = ClipRuleSet([
+        clip_rule("Seq", path="seq05", name="^x", clip_values=SHOT),
+        clip_rule("Eq", path="eq0", name="^y", clip_values=SHOT),
+        clip_rule("Start", path="^\\|seq", name="^z", clip_values=SHOT),
+        clip_rule("Behind", path="(?<=grp)1", clip_values=PREVIS),
+    ])
+    paths = ["|seq05|x|xShape", "|seq05|y|yShape", "|seq05|z|zShape", "|grp1|w|wShape", "|seq05|w|wShape"]
+
+    assert labels(rule_set, paths) == ["Seq", "Eq", "Start", "Behind", None]
+
+
+def test_anchored_alternation_not_anchored():
+    # Only the first branch of "^a|b" is anchored
+    rule_set = ClipRuleSet([clip_rule("AB", name="^cam|shot", clip_values=SHOT)])
+
+    assert labels(rule_set, ["|cam1|cam1Shape", "|my_shot|my_shotShape", "|my_cam|my_camShape"]) == [
+        "AB", "AB", None]
+
+
+def test_combined_and_separate_patterns_in_one_field():
+    rule_set = ClipRuleSet([
+        clip_rule("Grouped", name="^(a|b)cam$", clip_values=SHOT),
+        clip_rule("Plain", name="cam$", clip_values=PREVIS),
+        clip_rule("Flagged", name="(?i)^CAM", clip_values=PREVIS),
+    ])
+
+    assert labels(rule_set, ["|acam|acamShape", "|ccam|ccamShape", "|cam2|cam2Shape", "|x|xShape"]) == [
+        "Grouped", "Plain", "Flagged", None]
+
+
+def test_no_rules():
+    assert labels(ClipRuleSet([]), ["|cam|camShape"]) == [None]
+
+
+def test_more_rules_than_int_bits():
+    rules = [clip_rule(str(ii), name="^cam{}$".format(ii), clip_values=SHOT) for ii in range(100)]
+    rules += [clip_rule("path" + str(ii), path="seq{}_".format(ii), clip_values=SHOT) for ii in range(200)]
+    rule_set = ClipRuleSet(rules)
+
+    assert labels(rule_set, ["|cam99|cam99Shape", "|cam70|cam70Shape", "|seq150_|c|cShape", "|seq1|c|cShape"]) == [
+        "99", "70", "path150", None]
+
+
+def test_invalid_pattern():
+    with pytest.raises(ClipRulesError):
+        ClipRuleSet([clip_rule("Bad", name="^shot(")])
+
+
+def test_preset_round_trip(tmpdir):
+    rule_set = ClipRuleSet.from_dict({"rules": [
+        {"label": "Game cameras", "attribute": "isGameCamera", "exclude": True},
+        {"label": "Shots", "name": "^shot\\d+_cam$", "near": 1, "far": 50000},
+    ]})
+    path = str(tmpdir.join("rules.json"))
+    rule_set.save(path)
+
+    assert ClipRuleSet.load(path).rules == rule_set.rules
@@ -0,0 +1,105 @@
+# coding=utf-8
+
+import base64
+import json
+import zlib
+
+import pytest
+
+from clip_snapshots import ClipSnapshot
+from clip_snapshots import ClipSnapshotError
+from clip_snapshots import ClipSnapshotHistory
+
+
+def snapshot(count, label="reset_cameras"):
+    paths = ["|grp|cam{0}|cam{0}Shape".format(ii) for ii in range(count)]
+    return ClipSnapshot(paths, [0.1 * ii for ii in range(count)], [1000.0 + ii for ii in range(count)], label)
+
+
+def test_encode_decode_round_trip():
+    original = snapshot(100)
+
+    decoded = ClipSnapshot.decode(original.encode())
+
+    assert decoded.id == original.id
+    assert decoded.label == original.label
+    assert decoded.time == original.time
+    assert decoded.paths == original.paths
+    assert decoded.near == original.near
+    assert decoded.far == original.far
+
+
+def test_encode_decode_round_trip_special_values():
+    original = ClipSnapshot(
+        [u"|grün|cam|camShape", u"|ns:cam|ns:camShape"], [1e-300, 0.1], [float("inf"), 1e300], u"réset")
+
+    decoded = ClipSnapshot.decode(original.encode())
+
+    assert decoded.paths == original.paths
+    assert decoded.label == original.label
+    assert list(decoded.near) == [1e-300, 0.1]
+    assert list(decoded.far) == [float("inf"), 1e300]
+
+
+def test_encode_decode_empty():
+    decoded = ClipSnapshot.decode(ClipSnapshot([], [], []).encode())
+
+    assert len(decoded) == 0
+
+
+def test_encoded_is_ascii():
+    text = snapshot(10).encode()
+
+    assert text.encode("ascii").decode("ascii") == text
+
+
+@pytest.mark.parametrize("text", ["", "not a snapshot", base64.b64encode(b"plain").decode("ascii")])
+def test_decode_invalid(text):
+    with pytest.raises(ClipSnapshotError):
+        ClipSnapshot.decode(text)
+
+
+def test_decode_unsupported_version():
+    header = json.dumps({"version": 999, "id": "a", "label": "", "time": 0.0, "paths": []})
+    text = base64.b64encode(zlib.compress(header.encode("utf-8") + b"\0")).decode("ascii")
+
+    with pytest.raises(ClipSnapshotError):
+        ClipSnapshot.decode(text)
+
+
+def test_mismatched_values():
+    with pytest.raises(ClipSnapshotError):
+        ClipSnapshot(["|cam|camShape"], [0.1, 0.2], [1000.0])
+
+
+def test_history_evicts_oldest_past_max_snapshots():
+    history = ClipSnapshotHistory(max_snapshots=2)
+    snapshots = [snapshot(1) for _ in range(3)]
+
+    assert history.add(snapshots[0]) == []
+    assert history.add(snapshots[1]) == []
+    assert history.add(snapshots[2]) == [snapshots[0]]
+    assert list(history) == snapshots[1:]
+    assert history.latest() is snapshots[2]
+
+
+def test_history_evicts_oldest_past_max_cameras_keeps_latest():
+    history = ClipSnapshotHistory(max_cameras=10)
+    small = snapshot(4)
+    large = snapshot(20)
+
+    history.add(small)
+    assert history.add(large) == [small]
+    assert list(history) == [large]
+    assert history.camera_count == 20
+
+
+def test_history_remove():
+    history = ClipSnapshotHistory()
+    first, second = snapshot(2), snapshot(3)
+    history.add(first)
+    history.add(second)
+
+    assert history.remove(first)
+    assert not history.remove(first)
+    assert history.camera_count == 3
@@ -0,0 +1,125 @@
+# coding=utf-8
+
+import pytest
+
+from maya import _stub
+import maya.api.OpenMaya as om
+import maya.utils
+
+from maya_cameras import IncomingCameras
+
+
+@pytest.fixture
+def shapes():
+    """
+    Camera shape paths of a new scene of 6 cameras.
+    """
+    maya.utils.processIdleEvents()
+    return [transform + "|" + transform.rsplit("|", 1)[-1] + "Shape" for transform in _stub.build_camera_scene(6)]
+
+
+@pytest.fixture
+def incoming(shapes):
+    batches = []
+    incoming = IncomingCameras(on_cameras=lambda cameras: batches.append(list(cameras)))
+    incoming.batches = batches
+    incoming.start()
+    yield incoming
+    incoming.stop()
+
+
+def add(*shapes):
+    """
+    Send the "nodeAdded" message of each camera shape, like Maya on creation.
+    """
+    for shape in shapes:
+        _stub.scene.send_event("nodeAdded", om.MObject(_stub.scene.index[shape]))
+
+
+def test_burst_handed_over_once(shapes, incoming):
+    add(shapes[2], shapes[0], shapes[2], shapes[1])
+    assert incoming.batches == []
+
+    maya.utils.processIdleEvents()
+
+    # In arrival order, each camera once
+    assert incoming.batches == [[shapes[2], shapes[0], shapes[1]]]
+
+    add(shapes[3])
+    maya.utils.processIdleEvents()
+    assert incoming.batches[1:] == [[shapes[3]]]
+
+
+def test_import_handed_over_when_it_ends(shapes, incoming):
+    _stub.scene.send_event("kBeforeImport")
+    add(*shapes[:3])
+    maya.utils.processIdleEvents()
+    add(*shapes[3:])
+    maya.utils.processIdleEvents()
+    assert incoming.batches == []
+
+    _stub.scene.send_event("kAfterImport")
+    maya.utils.processIdleEvents()
+
+    assert incoming.batches == [shapes]
+
+
+def test_nested_file_operations_one_batch(shapes, incoming):
+    _stub.scene.send_event("kBeforeCreateReference")
+    add(shapes[0])
+    _stub.scene.send_event("kBeforeLoadReference")
+    add(shapes[1])
+    _stub.scene.send_event("kAfterLoadReference")
+    maya.utils.processIdleEvents()
+    assert incoming.batches == []
+
+    add(shapes[2])
+    _stub.scene.send_event("kAfterCreateReference")
+    maya.utils.processIdleEvents()
+
+    assert incoming.batches == [shapes[:3]]
+
+
+def test_opened_scene_cameras_ignored(shapes, incoming):
+    # Cameras waiting for the idle event are dropped with the scene
+    add(shapes[0])
+    _stub.scene.send_event("kBeforeOpen")
+    add(*shapes[1:])
+    _stub.scene.send_event("kAfterOpen")
+    maya.utils.processIdleEvents()
+
+    assert incoming.batches == []
+
+    _stub.scene.send_event("kBeforeNew")
+    add(shapes[0])
+    _stub.scene.send_event("kAfterNew")
+    add(shapes[1])
+    maya.utils.processIdleEvents()
+
+    assert incoming.batches == [[shapes[1]]]
+
+
+def test_flush_hands_over_nothing_on_idle(shapes, incoming):
+    add(*shapes[:2])
+
+    assert incoming.flush() == shapes[:2]
+    maya.utils.processIdleEvents()
+    assert incoming.batches == []
+
+
+def test_stop_drops_pending_batch(shapes, incoming):
+    add(*shapes[:2])
+    _stub.scene.send_event("kBeforeImport")
+    add(shapes[2])
+    incoming.stop()
+    _stub.scene.send_event("kAfterImport")
+    maya.utils.processIdleEvents()
+
+    assert incoming.batches == []
+    assert not incoming.active
+
+    # Started again, only new arrivals are handed over
+    incoming.start()
+    add(shapes[3])
+    maya.utils.processIdleEvents()
+    assert incoming.batches == [[shapes[3]]]
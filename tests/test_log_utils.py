@@ -0,0 +1,45 @@
+# coding=utf-8
+
+import glob
+import io
+import logging
+import os
+
+from log_utils import CameraSample
+from log_utils import LOGGER_NAMES
+from log_utils import RingBufferHandler
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_every_module_logger_listed():
+    modules = []
+    for path in glob.glob(os.path.join(REPO_ROOT, "*.py")):
+        with io.open(path, encoding="utf-8") as f:
+            if "logging.getLogger(__name__)" in f.read():
+                modules.append(os.path.splitext(os.path.basename(path))[0])
+
+    assert sorted(set(modules) - set(LOGGER_NAMES)) == []
+
+
+def test_camera_sample():
+    assert str(CameraSample([])) == "0 camera(s)"
+    assert str(CameraSample(["a", "b"])) == "2 camera(s): a, b"
+    assert str(CameraSample(["a", "b", "c"], limit=1)) == "3 camera(s): a, ... (+2)"
+
+
+def test_ring_buffer_formats_on_emit():
+    logger = logging.getLogger("test_log_utils")
+    logger.setLevel(logging.DEBUG)
+    handler = RingBufferHandler(capacity=2)
+    logger.addHandler(handler)
+    try:
+        cameras = ["a"]
+        logger.info("First")
+        logger.info("Cameras %s", CameraSample(cameras))
+        cameras.append("b")
+        logger.info("Last")
+    finally:
+        logger.removeHandler(handler)
+
+    assert handler.lines() == ["[test_log_utils] INFO: Cameras 1 camera(s): a", "[test_log_utils] INFO: Last"]
@@ -0,0 +1,220 @@
+# coding=utf-8
+
+import io
+import os
+import stat
+
+import pytest
+
+from clip_planes import ClipPair
+from ma_clip_planes import read_ma_cameras
+from ma_clip_planes import rewrite_ma_file
+from ma_clip_planes import rewrite_ma_stream
+
+
+def rewrite(text, clip_values=ClipPair(1.0, 50000.0), camera_filter=None):
+    src = io.BytesIO(text)
+    dst = io.BytesIO()
+    result = rewrite_ma_stream(src, dst, clip_values, camera_filter)
+    return dst.getvalue(), result
+
+
+CAMERA_SCENE = (
+    b'//Maya ASCII 2020 scene\n'
+    b'createNode transform -n "shotCam";\n'
+    b'createNode camera -n "shotCamShape" -p "shotCam";\n'
+    b'\trename -uid "A";\n'
+    b'\tsetAttr -k off ".v";\n'
+    b'\tsetAttr ".ncp" 0.5;\n'
+    b'\tsetAttr ".fcp" 2000;\n'
+    b'createNode mesh -n "boxShape" -p "box";\n'
+    b'\tsetAttr ".ncp" 0.5;\n'
+)
+
+
+def test_rewrite_sets_existing_values():
+    output, result = rewrite(CAMERA_SCENE)
+
+    assert b'\tsetAttr ".ncp" 1;\n' in output
+    assert b'\tsetAttr ".fcp" 50000;\n' in output
+    assert result == (1, 1, 0)
+
+
+def test_non_camera_blocks_untouched():
+    output, _ = rewrite(CAMERA_SCENE)
+
+    assert output.endswith(b'createNode mesh -n "boxShape" -p "box";\n\tsetAttr ".ncp" 0.5;\n')
+
+
+def test_unchanged_values_not_written():
+    output, result = rewrite(CAMERA_SCENE, ClipPair(0.5, 2000.0))
+
+    assert output == CAMERA_SCENE
+    assert result == (1, 0, 0)
+
+
+def test_crlf_line_endings_kept():
+    scene = CAMERA_SCENE.replace(b"\n", b"\r\n")
+    output, result = rewrite(scene)
+
+    assert output == scene.replace(b'".ncp" 0.5;\r\n\tsetAttr ".fcp" 2000', b'".ncp" 1;\r\n\tsetAttr ".fcp" 50000')
+    assert result.written == 1
+
+
+def test_crlf_line_endings_on_inserted_values():
+    scene = (
+        b'createNode camera -n "camShape" -p "cam";\r\n'
+        b'\tsetAttr -k off ".v";\r\n'
+    )
+    output, _ = rewrite(scene)
+
+    assert output.split(b"\r\n")[1:4] == [
+        b'\tsetAttr ".ncp" 1;', b'\tsetAttr ".fcp" 50000;', b'\tsetAttr -k off ".v";']
+    assert output.count(b"\n") == output.count(b"\r\n")
+
+
+def test_locked_attributes_untouched():
+    scene = (
+        b'createNode camera -n "camShape" -p "cam";\n'
+        b'\tsetAttr -l on ".ncp" 0.5;\n'
+        b'\tsetAttr ".fcp" 2000;\n'
+    )
+    output, result = rewrite(scene)
+
+    assert output == (
+        b'createNode camera -n "camShape" -p "cam";\n'
+        b'\tsetAttr -l on ".ncp" 0.5;\n'
+        b'\tsetAttr ".fcp" 50000;\n'
+    )
+    assert result == (1, 1, 1)
+
+
+def test_locked_attributes_only():
+    scene = (
+        b'createNode camera -n "camShape" -p "cam";\n'
+        b'\tsetAttr -l on ".ncp" 0.5;\n'
+        b'\tsetAttr -l on ".fcp" 2000;\n'
+    )
+    output, result = rewrite(scene)
+
+    assert output == scene
+    assert result == (1, 0, 2)
+
+
+def test_missing_values_inserted_in_order():
+    scene = (
+        b'createNode camera -n "camShape" -p "cam";\n'
+        b'\trename -uid "A";\n'
+        b'\tsetAttr -k off ".v";\n'
+        b'\tsetAttr ".fl" 35;\n'
+    )
+    output, result = rewrite(scene)
+
+    assert output.splitlines() == [
+        b'createNode camera -n "camShape" -p "cam";',
+        b'\trename -uid "A";',
+        b'\tsetAttr ".ncp" 1;',
+        b'\tsetAttr ".fcp" 50000;',
+        b'\tsetAttr -k off ".v";',
+        b'\tsetAttr ".fl" 35;',
+    ]
+    assert result == (1, 1, 0)
+
+
+def test_missing_near_inserted_before_far():
+    scene = (
+        b'createNode camera -n "camShape" -p "cam";\n'
+        b'\tsetAttr -k off ".v";\n'
+        b'\tsetAttr ".fcp" 2000;\n'
+    )
+    output, _ = rewrite(scene)
+
+    assert output.splitlines()[2:] == [b'\tsetAttr ".ncp" 1;', b'\tsetAttr ".fcp" 50000;']
+
+
+def test_missing_far_inserted_after_near():
+    scene = (
+        b'createNode camera -n "camShape" -p "cam";\n'
+        b'\tsetAttr ".ncp" 0.5;\n'
+        b'\tsetAttr ".fl" 35;\n'
+    )
+    output, _ = rewrite(scene)
+
+    assert output.splitlines()[1:] == [b'\tsetAttr ".ncp" 1;', b'\tsetAttr ".fcp" 50000;', b'\tsetAttr ".fl" 35;']
+
+
+def test_missing_default_values_not_inserted():
+    scene = (
+        b'createNode camera -n "camShape" -p "cam";\n'
+        b'\tsetAttr -k off ".v";\n'
+    )
+    output, result = rewrite(scene, ClipPair(0.1, 10000.0))
+
+    assert output == scene
+    assert result == (1, 0, 0)
+
+
+def test_camera_block_at_end_of_file():
+    scene = b'createNode camera -n "camShape" -p "cam";\n\tsetAttr ".ncp" 0.5;'
+    output, result = rewrite(scene)
+
+    assert output.startswith(b'createNode camera -n "camShape" -p "cam";\n\tsetAttr ".ncp" 1;')
+    assert result.written == 1
+
+
+def test_camera_filter():
+    scene = CAMERA_SCENE + b'createNode camera -n "otherShape" -p "other";\n\tsetAttr ".ncp" 0.5;\n'
+    output, result = rewrite(scene, camera_filter=lambda name, parent: name == "otherShape")
+
+    assert output.startswith(CAMERA_SCENE)
+    assert output.endswith(b'\tsetAttr ".ncp" 1;\n\tsetAttr ".fcp" 50000;\n')
+    assert result == (2, 1, 0)
+
+
+def test_rewrite_file_round_trip(tmpdir):
+    path = tmpdir.join("scene.ma")
+    path.write_binary(CAMERA_SCENE)
+
+    result = rewrite_ma_file(str(path), ClipPair(2.0, 3000.0))
+    cameras = read_ma_cameras(str(path))
+
+    assert result.written == 1
+    assert [(camera.name, camera.parent, camera.near, camera.far) for camera in cameras] == [
+        ("shotCamShape", "shotCam", 2.0, 3000.0)]
+    assert tmpdir.listdir() == [path]
+
+
+def test_rewrite_file_unchanged_left_untouched(tmpdir):
+    path = tmpdir.join("scene.ma")
+    path.write_binary(CAMERA_SCENE)
+    mtime = path.mtime()
+
+    result = rewrite_ma_file(str(path), ClipPair(0.5, 2000.0))
+
+    assert result.written == 0
+    assert path.read_binary() == CAMERA_SCENE
+    assert path.mtime() == mtime
+    assert tmpdir.listdir() == [path]
+
+
+def test_rewrite_file_keeps_mode(tmpdir):
+    path = tmpdir.join("scene.ma")
+    path.write_binary(CAMERA_SCENE)
+    os.chmod(str(path), 0o644)
+
+    rewrite_ma_file(str(path), ClipPair(2.0, 3000.0))
+
+    assert stat.S_IMODE(os.stat(str(path)).st_mode) == 0o644
+
+
+def test_non_maya_file_rejected(tmpdir):
+    path = tmpdir.join("bad.ma")
+    path.write_binary(b"notmaya\n")
+
+    with pytest.raises(ValueError):
+        rewrite_ma_file(str(path), ClipPair(1.0, 50000.0))
+    with pytest.raises(ValueError):
+        read_ma_cameras(str(path))
+
+    assert path.read_binary() == b"notmaya\n"
+    assert tmpdir.listdir() == [path]
@@ -0,0 +1,170 @@
+# coding=utf-8
+
+from maya import _stub
+import maya.cmds as mc
+
+from maya_cameras import ChunkedClipValuesWriter
+from maya_cameras import get_cameras_attributes_on
+from maya_cameras import get_cameras_audit_data
+from maya_cameras import get_cameras_clip_values
+from maya_cameras import set_cameras_clip_keys
+from maya_cameras import set_cameras_clip_values_rows
+
+
+def camera_shapes(count):
+    return [transform + "|" + transform.rsplit("|", 1)[-1] + "Shape" for transform in _stub.build_camera_scene(count)]
+
+
+def clip_keys(cameras):
+    """
+    Keys of each camera's clip plane curves, None for a plane without a curve.
+    """
+    keys = []
+    for cam in cameras:
+        index = _stub.scene.index[cam]
+        curves = [_stub.scene.anim_curves.get((index, name)) for name in ("nearClipPlane", "farClipPlane")]
+        keys.append(tuple(None if curve is None else curve.keys for curve in curves))
+    return keys
+
+
+def step_all(writer):
+    steps = 0
+    while writer.step(max_seconds=0.0):
+        steps += 1
+    return steps + 1
+
+
+def test_read_duplicate_cameras():
+    cameras = camera_shapes(3)
+    set_cameras_clip_values_rows(cameras, [(1.0, 5000.0), (2.0, 6000.0), (3.0, 7000.0)])
+    _stub.scene.set_attr(_stub.scene.index[cameras[1]], "renderable", True)
+    # The same shape twice, and once by its full path then by its name
+    duplicated = [cameras[1], cameras[0], cameras[1], cameras[2], cameras[2].rsplit("|", 1)[-1]]
+
+    assert get_cameras_clip_values(duplicated) == [
+        (2.0, 6000.0), (1.0, 5000.0), (2.0, 6000.0), (3.0, 7000.0), (3.0, 7000.0)]
+    assert [data[:2] for data in get_cameras_audit_data(duplicated)] == get_cameras_clip_values(duplicated)
+    assert get_cameras_attributes_on(duplicated, ["renderable"]) == [("renderable",), (), ("renderable",), (), ()]
+
+
+def test_writer_duplicate_cameras():
+    cameras = camera_shapes(2)
+    writer = ChunkedClipValuesWriter([cameras[0], cameras[0], cameras[1]], [(1.0, 5000.0)] * 3)
+
+    writer.start()
+    step_all(writer)
+    writer.finish()
+
+    assert writer.originals == [(cameras[0], (0.1, 10000.0)), (cameras[0], (0.1, 10000.0)), (cameras[1], (0.1, 10000.0))]
+
+
+def test_set_clip_values_in_one_modifier():
+    cameras = camera_shapes(5)
+    mc.setAttr(cameras[1] + ".farClipPlane", lock=True)
+
+    rows = set_cameras_clip_values_rows(cameras, [(1.0, 5000.0)] * len(cameras))
+
+    assert rows == [0, 2, 3, 4]
+    assert _stub.scene.calls["MDGModifier.doIt"] == 1
+    assert _stub.scene.calls["setAttr"] == 1
+    assert get_cameras_clip_values(cameras) == [(1.0, 5000.0), (0.1, 10000.0)] + [(1.0, 5000.0)] * 3
+
+
+def test_set_clip_values_undo_redo():
+    cameras = camera_shapes(3)
+    set_cameras_clip_values_rows(cameras, [(1.0, 5000.0), (2.0, 6000.0), (3.0, 7000.0)])
+    assert len(_stub.scene.undo_queue) == 1
+
+    mc.undo()
+    assert set(get_cameras_clip_values(cameras)) == {(0.1, 10000.0)}
+
+    mc.redo()
+    assert get_cameras_clip_values(cameras) == [(1.0, 5000.0), (2.0, 6000.0), (3.0, 7000.0)]
+
+
+def test_writer_is_one_undo_step():
+    cameras = camera_shapes(ChunkedClipValuesWriter.BATCH_SIZE * 3)
+    writer = ChunkedClipValuesWriter(cameras, [(1.0, 5000.0)] * len(cameras))
+
+    writer.start()
+    while writer.step(max_seconds=0.0):
+        # Nothing is left open or recorded while Maya processes events
+        assert _stub.scene.undo_chunk is None
+        assert _stub.scene.undo_queue == []
+    writer.finish()
+
+    assert writer.written == len(cameras)
+    assert len(_stub.scene.undo_queue) == 1
+    assert set(get_cameras_clip_values(cameras)) == {(1.0, 5000.0)}
+
+    mc.undo()
+    assert set(get_cameras_clip_values(cameras)) == {(0.1, 10000.0)}
+
+    mc.redo()
+    assert set(get_cameras_clip_values(cameras)) == {(1.0, 5000.0)}
+
+
+def test_writer_cancel_restores_without_undo_step():
+    cameras = camera_shapes(ChunkedClipValuesWriter.BATCH_SIZE * 3)
+    writer = ChunkedClipValuesWriter(cameras, [(1.0, 5000.0)] * len(cameras))
+
+    writer.start()
+    writer.step(max_seconds=0.0)
+    writer.step(max_seconds=0.0)
+    writer.cancel()
+
+    assert _stub.scene.undo_queue == []
+    assert not writer.active
+    assert writer.written == 0
+    assert set(get_cameras_clip_values(cameras)) == {(0.1, 10000.0)}
+
+
+def test_writer_cancel_before_step():
+    cameras = camera_shapes(2)
+    writer = ChunkedClipValuesWriter(cameras, [(1.0, 5000.0)] * len(cameras))
+
+    writer.start()
+    writer.cancel()
+
+    assert _stub.scene.undo_queue == []
+    assert not writer.active
+
+
+def test_set_clip_keys_undo_redo():
+    cameras = camera_shapes(3)
+    mc.setAttr(cameras[2] + ".nearClipPlane", lock=True)
+    frames = [1.0, 2.0, 3.0]
+
+    keyed = set_cameras_clip_keys(cameras, frames, [[1.0, 2.0, 3.0]] * 3, [[100.0, 200.0, 300.0]] * 3)
+
+    expected = ([(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)], [(1.0, 100.0), (2.0, 200.0), (3.0, 300.0)])
+    assert keyed == 2
+    assert clip_keys(cameras) == [expected, expected, (None, None)]
+    assert _stub.scene.calls["MFnAnimCurve.addKeys"] == 4
+    assert len(_stub.scene.undo_queue) == 1
+
+    mc.undo()
+    assert clip_keys(cameras) == [(None, None)] * 3
+
+    mc.redo()
+    assert clip_keys(cameras) == [expected, expected, (None, None)]
+
+
+def test_set_clip_keys_replaces_keys():
+    cameras = camera_shapes(2)
+    set_cameras_clip_keys(cameras, [1.0, 10.0], [[1.0, 2.0]] * 2, [[100.0, 200.0]] * 2)
+    before = clip_keys(cameras)
+
+    # Keys on other frames are removed, the curves are reused
+    curve = _stub.scene.anim_curves[(_stub.scene.index[cameras[0]], "nearClipPlane")]
+    set_cameras_clip_keys(cameras, [5.0], [[5.0]] * 2, [[500.0]] * 2)
+
+    after = [([(5.0, 5.0)], [(5.0, 500.0)])] * 2
+    assert clip_keys(cameras) == after
+    assert _stub.scene.anim_curves[(_stub.scene.index[cameras[0]], "nearClipPlane")] is curve
+
+    mc.undo()
+    assert clip_keys(cameras) == before
+
+    mc.redo()
+    assert clip_keys(cameras) == after
@@ -0,0 +1,141 @@
+# coding=utf-8
+
+import os
+import shutil
+
+import pytest
+
+from clip_planes import ClipPair
+from mb_clip_planes import MayaBinaryFile
+from mb_clip_planes import patch_mb_file
+from mb_clip_planes import read_mb_clip_planes
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+FIXTURES = ("cameras_for4.mb", "cameras_for8.mb")
+
+
+@pytest.fixture(params=FIXTURES)
+def scene(request, tmpdir):
+    path = tmpdir.join(request.param)
+    shutil.copyfile(os.path.join(FIXTURES_DIR, request.param), str(path))
+    return path
+
+
+def clip_planes(path):
+    return [(camera.name, camera.parent, camera.near, camera.far) for camera in read_mb_clip_planes(str(path))]
+
+
+def test_read(scene):
+    assert clip_planes(scene) == [
+        ("shotCamShape", "shotCam", 0.5, 2000.0),
+        ("topShape", "top", 0.5, None),
+    ]
+
+
+def test_patch_round_trip(scene):
+    result = patch_mb_file(str(scene), ClipPair(1.0, 50000.0))
+
+    assert result == (2, 2, 1)
+    assert clip_planes(scene) == [
+        ("shotCamShape", "shotCam", 1.0, 50000.0),
+        ("topShape", "top", 1.0, None),
+    ]
+
+
+def test_patch_changes_only_the_values(scene):
+    original = scene.read_binary()
+    cameras = read_mb_clip_planes(str(scene))
+
+    patch_mb_file(str(scene), ClipPair(1.0, 50000.0))
+    patched = scene.read_binary()
+
+    assert len(patched) == len(original)
+    offsets = set()
+    for camera in cameras:
+        for offset in (camera.near_offset, camera.far_offset):
+            if offset is not None:
+                offsets.update(range(offset, offset + 8))
+    assert [ii for ii in range(len(original)) if original[ii] != patched[ii] and ii not in offsets] == []
+
+
+def test_patch_default_value_missing(scene):
+    result = patch_mb_file(str(scene), ClipPair(1.0, 10000.0))
+
+    assert result.missing == 0
+
+
+def test_patch_camera_filter(scene):
+    result = patch_mb_file(str(scene), ClipPair(1.0, 50000.0), camera_filter=lambda name, parent: parent == "top")
+
+    assert result == (2, 1, 1)
+    assert clip_planes(scene)[0] == ("shotCamShape", "shotCam", 0.5, 2000.0)
+
+
+def test_patch_to_other_path(scene, tmpdir):
+    original = scene.read_binary()
+    dst = tmpdir.join("out", "scene.mb")
+    dst.dirpath().ensure(dir=True)
+
+    patch_mb_file(str(scene), ClipPair(1.0, 50000.0), dst_path=str(dst))
+
+    assert scene.read_binary() == original
+    assert clip_planes(dst)[0] == ("shotCamShape", "shotCam", 1.0, 50000.0)
+
+
+def test_patch_unchanged_left_untouched(scene, tmpdir, monkeypatch):
+    def no_copy(*args):
+        raise AssertionError("Unchanged scenes are not copied")
+
+    monkeypatch.setattr(shutil, "copyfile", no_copy)
+    mtime = scene.mtime()
+    original = scene.read_binary()
+
+    result = patch_mb_file(str(scene), ClipPair(0.5, 2000.0), camera_filter=lambda name, parent: parent == "shotCam")
+
+    assert result.written == 0
+    assert scene.read_binary() == original
+    assert scene.mtime() == mtime
+    assert tmpdir.listdir() == [scene]
+
+
+def test_patch_unchanged_to_other_path(scene, tmpdir):
+    original = scene.read_binary()
+    dst = tmpdir.join("out", "scene.mb")
+    dst.dirpath().ensure(dir=True)
+
+    result = patch_mb_file(str(scene), ClipPair(0.5, 2000.0), dst_path=str(dst),
+                           camera_filter=lambda name, parent: parent == "shotCam")
+
+    assert result.written == 0
+    assert dst.read_binary() == original
+
+
+def test_patch_replaces_the_file(scene):
+    # The patched file is a new file moved over the original, not written through
+    with open(str(scene), "rb") as f:
+        original = f.read()
+        patch_mb_file(str(scene), ClipPair(1.0, 50000.0))
+        f.seek(0)
+        assert f.read() == original
+
+    assert scene.read_binary() != original
+
+
+def test_non_maya_file_rejected(tmpdir):
+    path = tmpdir.join("bad.mb")
+    path.write_binary(b"notmaya\n")
+
+    with pytest.raises(ValueError):
+        patch_mb_file(str(path), ClipPair(1.0, 50000.0))
+
+    assert path.read_binary() == b"notmaya\n"
+    assert tmpdir.listdir() == [path]
+
+
+def test_write_requires_writable(scene):
+    with MayaBinaryFile(str(scene)) as mb:
+        camera = next(mb.cameras())
+        with pytest.raises(IOError):
+            mb.write_double(camera.near_offset, 1.0)
@@ -0,0 +1,101 @@
+# coding=utf-8
+"""
+Snapshots taken by the resets of "MayaResetCameraClipPlanes", against the
+stand-in "maya" package.
+"""
+
+import pytest
+
+from maya import _stub
+import maya.cmds as mc
+
+from clip_planes import ClipPair
+from maya_cameras import get_cameras_clip_values
+from reset_camera_clip_planes_core import MayaResetCameraClipPlanes
+
+
+@pytest.fixture
+def cameras():
+    """
+    Camera shape paths of a new scene of 5 cameras, at Maya's default clip values.
+    """
+    transforms = _stub.build_camera_scene(5)
+    return [transform + "|" + transform.rsplit("|", 1)[-1] + "Shape" for transform in transforms]
+
+
+@pytest.fixture
+def actions():
+    actions = MayaResetCameraClipPlanes()
+    actions.mode = "all"
+    actions.clip_values = ClipPair(1.0, 5000.0)
+    return actions
+
+
+def lock(cameras):
+    """
+    Lock the near clip plane of "cameras", so their clip values can not be written.
+    """
+    for cam in cameras:
+        mc.setAttr(cam + ".nearClipPlane", lock=True)
+
+
+def test_reset_snapshots_previous_values(cameras, actions):
+    actions.reset_cameras()
+
+    snapshot = actions.snapshots.latest()
+    assert sorted(snapshot.paths) == sorted(cameras)
+    assert set(zip(snapshot.near, snapshot.far)) == {(0.1, 10000.0)}
+    assert set(get_cameras_clip_values(cameras)) == {(1.0, 5000.0)}
+
+
+def test_reset_snapshot_leaves_out_failed_writes(cameras, actions):
+    lock(cameras[1:3])
+
+    actions.reset_cameras()
+
+    assert sorted(actions.snapshots.latest().paths) == sorted(cameras[:1] + cameras[3:])
+
+
+def test_restore_snapshot(cameras, actions):
+    actions.reset_cameras()
+
+    assert actions.restore_snapshot() == len(cameras)
+    assert set(get_cameras_clip_values(cameras)) == {(0.1, 10000.0)}
+    assert len(actions.snapshots) == 0
+
+
+def test_enforce_takes_no_snapshot(cameras, actions):
+    actions.reset_cameras()
+    snapshot = actions.snapshots.latest()
+    file_info = dict(_stub.scene.file_info)
+
+    for _ in range(actions.snapshots.history.max_snapshots + 1):
+        assert actions.enforce_clip_values(cameras[:2]) >= 0
+
+    assert actions.snapshots.snapshots() == [snapshot]
+    assert _stub.scene.file_info == file_info
+
+
+def test_incremental_reset_snapshots_written_cameras(cameras, actions):
+    lock(cameras[:1])
+
+    job = actions.reset_cameras_incremental()
+    job.start()
+    while job.step(0.0):
+        pass
+    assert len(actions.snapshots) == 0
+    job.finish()
+
+    snapshot = actions.snapshots.latest()
+    assert sorted(snapshot.paths) == sorted(cameras[1:])
+    assert set(zip(snapshot.near, snapshot.far)) == {(0.1, 10000.0)}
+
+
+def test_cancelled_incremental_reset_takes_no_snapshot(cameras, actions):
+    job = actions.reset_cameras_incremental()
+    job.start()
+    job.step(0.0)
+    job.cancel()
+
+    assert len(actions.snapshots) == 0
+    assert set(get_cameras_clip_values(cameras)) == {(0.1, 10000.0)}
@@ -0,0 +1,134 @@
+# coding=utf-8
+
+import pytest
+
+from maya import _stub
+import maya.cmds as mc
+import maya.utils
+
+import maya_cameras
+from maya_cameras import SelectionWatcher
+
+
+@pytest.fixture
+def transforms():
+    """
+    Camera transform paths of a new scene of 5 cameras.
+    """
+    maya.utils.processIdleEvents()
+    return _stub.build_camera_scene(5)
+
+
+@pytest.fixture
+def resolved(monkeypatch):
+    """
+    Nodes given to "resolve_cameras_bulk", one list per call.
+    """
+    calls = []
+    resolve = maya_cameras.resolve_cameras_bulk
+
+    def recorded(nodes):
+        nodes = list(nodes)
+        calls.append(nodes)
+        return resolve(nodes)
+
+    monkeypatch.setattr(maya_cameras, "resolve_cameras_bulk", recorded)
+    return calls
+
+
+@pytest.fixture
+def watcher(transforms):
+    changes = []
+    watcher = SelectionWatcher(on_change=lambda cameras: changes.append(list(cameras)))
+    watcher.changes = changes
+    watcher.start()
+    yield watcher
+    watcher.stop()
+
+
+def shape(transform):
+    return transform + "|" + transform.rsplit("|", 1)[-1] + "Shape"
+
+
+def test_burst_of_selections_updates_once(transforms, watcher, resolved):
+    for count in range(1, 5):
+        mc.select(transforms[:count])
+    assert watcher.changes == []
+
+    maya.utils.processIdleEvents()
+
+    assert len(resolved) == 1
+    assert watcher.changes == [[shape(path) for path in transforms[:4]]]
+
+
+def test_only_added_nodes_resolve(transforms, watcher, resolved):
+    mc.select(transforms[:2])
+    maya.utils.processIdleEvents()
+    assert resolved == [transforms[:2]]
+
+    mc.select(transforms[:3])
+    maya.utils.processIdleEvents()
+    assert resolved[1:] == [transforms[2:3]]
+
+    # Removing a node resolves nothing
+    mc.select([transforms[0], transforms[2]])
+    maya.utils.processIdleEvents()
+    assert len(resolved) == 2
+
+    assert watcher.changes == [
+        [shape(path) for path in transforms[:2]],
+        [shape(path) for path in transforms[:3]],
+        [shape(transforms[0]), shape(transforms[2])],
+    ]
+
+
+def test_selection_order_and_duplicates(transforms, watcher):
+    # A transform and its own shape give one camera, in selection order
+    mc.select([transforms[3], shape(transforms[1]), transforms[1], "|group0"])
+    maya.utils.processIdleEvents()
+
+    assert watcher.cameras == [shape(transforms[3]), shape(transforms[1])]
+
+
+def test_unchanged_cameras_not_reported(transforms, watcher):
+    mc.select([transforms[0]])
+    maya.utils.processIdleEvents()
+
+    # Selecting its shape instead, or adding a group, keeps the same camera
+    mc.select([shape(transforms[0])])
+    maya.utils.processIdleEvents()
+    mc.select([shape(transforms[0]), "|group0"])
+    maya.utils.processIdleEvents()
+
+    assert watcher.changes == [[shape(transforms[0])]]
+
+
+def test_camera_created_resolves_again(transforms, watcher, resolved):
+    mc.select(transforms[:2])
+    maya.utils.processIdleEvents()
+
+    _stub.scene.send_event("nodeAdded")
+    maya.utils.processIdleEvents()
+
+    assert resolved == [transforms[:2], transforms[:2]]
+
+
+def test_stop_drops_pending_update(transforms, watcher):
+    mc.select(transforms[:2])
+    watcher.stop()
+    maya.utils.processIdleEvents()
+
+    assert watcher.changes == []
+    assert watcher.cameras == []
+    assert not watcher.active
+
+
+def test_start_resolves_current_selection(transforms):
+    mc.select(transforms[1:3])
+
+    watcher = SelectionWatcher()
+    watcher.start()
+    try:
+        assert watcher.cameras == [shape(path) for path in transforms[1:3]]
+    finally:
+        watcher.stop()